@@ -1,9 +1,37 @@
  # app.py
+import io
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
 from datetime import datetime
-from utils import *
+# pandas and plotly are imported only where results are drawn, which keeps
+# them off the cold start and off pages that never show a chart or table
+from utils import (
+    FIGURE_CACHE,
+    cached_figure,
+    calculator_graph,
+    create_educational_content,
+    create_tax_curve_chart,
+    create_tax_rate_chart,
+    get_tax_saving_tips,
+)
+from tax_engine import (
+    RULE_SETS,
+    default_assessment_year,
+    get_rule_set,
+    break_even_deduction,
+    optimize_deductions,
+    RESULT_CACHE,
+    calculate_tradebook_tax,
+    installment_windows,
+)
+from tax_engine.instrumentation import begin_run, end_run, phase
+from tax_engine.reactive import GraphState
+
+
+@st.cache_resource
+def shared_calculator_graph():
+    """The calculator's DependencyGraph, built once per process; it holds no session state"""
+    return calculator_graph()
+
 
 # Set page configuration
 st.set_page_config(
@@ -55,160 +83,17 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-def calculate_capital_gains_tax(ltcg_by_quarter, stcg_by_quarter):
-    """Calculate tax for capital gains quarter-wise"""
-    total_ltcg = sum(ltcg_by_quarter.values())
-    total_stcg = sum(stcg_by_quarter.values())
-    
-    # LTCG calculation (12.5% after 1.25L exemption)
-    ltcg_exemption = 125000
-    taxable_ltcg = max(0, total_ltcg - ltcg_exemption)
-    ltcg_tax = taxable_ltcg * 0.125
-    
-    # STCG calculation (20%)
-    stcg_tax = total_stcg * 0.20
-    
-    # Calculate quarter-wise breakdown
-    quarterly_tax = {}
-    for quarter in ltcg_by_quarter.keys():
-        quarter_ltcg = ltcg_by_quarter[quarter]
-        quarter_stcg = stcg_by_quarter[quarter]
-        
-        # Calculate LTCG tax for this quarter
-        if total_ltcg > ltcg_exemption:
-            quarter_ltcg_tax = (quarter_ltcg / total_ltcg) * ltcg_tax
-        else:
-            quarter_ltcg_tax = 0
-            
-        quarter_stcg_tax = quarter_stcg * 0.20
-        
-        quarterly_tax[quarter] = {
-            'ltcg_tax': quarter_ltcg_tax,
-            'stcg_tax': quarter_stcg_tax,
-            'total': quarter_ltcg_tax + quarter_stcg_tax
-        }
-    
-    return {
-        'ltcg_tax': ltcg_tax,
-        'stcg_tax': stcg_tax,
-        'total_cg_tax': ltcg_tax + stcg_tax,
-        'taxable_ltcg': taxable_ltcg,
-        'quarterly_tax': quarterly_tax
-    }
-
-def calculate_advance_tax_schedule(total_tax, cg_tax_by_quarter):
-    """Calculate quarterly advance tax requirements"""
-    quarters = {
-        "Q1": {"due": "June 15, 2024", "percentage": 15},
-        "Q2": {"due": "September 15, 2024", "percentage": 45},
-        "Q3": {"due": "December 15, 2024", "percentage": 75},
-        "Q4": {"due": "March 15, 2025", "percentage": 100}
-    }
-    
-    regular_tax = total_tax - sum(cg_tax_by_quarter.values())
-    cumulative_tax = 0
-    schedule = []
-    prev_percentage = 0
-    
-    for q, info in quarters.items():
-        # Calculate regular tax for this installment
-        regular_tax_due = (regular_tax * info['percentage'] / 100) - cumulative_tax
-        
-        # Add capital gains tax for this quarter
-        cg_tax_due = cg_tax_by_quarter.get(q, 0)
-        
-        total_due = regular_tax_due + cg_tax_due
-        cumulative_tax += regular_tax_due
-        
-        schedule.append({
-            'due_date': info['due'],
-            'percentage': info['percentage'],
-            'installment_percentage': info['percentage'] - prev_percentage,
-            'regular_tax': regular_tax_due,
-            'capital_gains_tax': cg_tax_due,
-            'total_amount': total_due
-        })
-        prev_percentage = info['percentage']
-    
-    return schedule
-
-# Your existing tax calculation functions remain the same
-def calculate_tax_new_regime(annual_income):
-    standard_deduction = 75000
-    taxable_income = annual_income - standard_deduction
-    
-    tax = 0
-    if taxable_income <= 300000:
-        tax = 0
-    elif taxable_income <= 600000:
-        tax = (taxable_income - 300000) * 0.05
-    elif taxable_income <= 900000:
-        tax = 15000 + (taxable_income - 600000) * 0.10
-    elif taxable_income <= 1200000:
-        tax = 45000 + (taxable_income - 900000) * 0.15
-    elif taxable_income <= 1500000:
-        tax = 90000 + (taxable_income - 1200000) * 0.20
-    else:
-        tax = 150000 + (taxable_income - 1500000) * 0.30
-        
-    surcharge = 0
-    if taxable_income > 50000000:
-        surcharge = tax * 0.25
-    elif taxable_income > 20000000:
-        surcharge = tax * 0.15
-    elif taxable_income > 10000000:
-        surcharge = tax * 0.10
-        
-    cess = (tax + surcharge) * 0.04
-    
-    return {
-        'base_tax': tax,
-        'surcharge': surcharge,
-        'cess': cess,
-        'total_tax': tax + surcharge + cess,
-        'taxable_income': taxable_income
-    }
-
-def calculate_tax_old_regime(annual_income, deductions):
-    taxable_income = annual_income - deductions
-    
-    tax = 0
-    if taxable_income <= 250000:
-        tax = 0
-    elif taxable_income <= 500000:
-        tax = (taxable_income - 250000) * 0.05
-    elif taxable_income <= 1000000:
-        tax = 12500 + (taxable_income - 500000) * 0.20
-    else:
-        tax = 112500 + (taxable_income - 1000000) * 0.30
-        
-    surcharge = 0
-    if taxable_income > 50000000:
-        surcharge = tax * 0.37
-    elif taxable_income > 20000000:
-        surcharge = tax * 0.25
-    elif taxable_income > 10000000:
-        surcharge = tax * 0.15
-        
-    cess = (tax + surcharge) * 0.04
-    
-    return {
-        'base_tax': tax,
-        'surcharge': surcharge,
-        'cess': cess,
-        'total_tax': tax + surcharge + cess,
-        'taxable_income': taxable_income
-    }
-
 # Sidebar for navigation
 st.sidebar.title("Navigation")
 page = st.sidebar.radio("Go to", 
-    ["Tax Calculator", "Educational Center", "Tax Planning", "Help & Support"])
+    ["Tax Calculator", "Tax Rate Explorer", "Educational Center", "Tax Planning", "Help & Support"])
+begin_run(page)
+recomputed_nodes = None
 
 if page == "Tax Calculator":
     st.title("🇮🇳 Income Tax Calculator 2024-25")
     st.markdown("**Developed by Rajesh Parikh**")  
-    income_tab, cg_tab = st.tabs(["Regular Income", "Capital Gains"])
+    income_tab, cg_tab, simulation_tab = st.tabs(["Regular Income", "Capital Gains", "Advance Tax Simulation"])
     
     with income_tab:
         col1, col2, col3 = st.columns([2,1,1])
@@ -225,9 +110,11 @@ if page == "Tax Calculator":
         with col3:
             assessment_year = st.selectbox(
                 "Assessment Year",
-                ["2024-25", "2025-26"],
-                index=0
+                list(RULE_SETS),
+                index=list(RULE_SETS).index(default_assessment_year())
             )
+        rules = get_rule_set(assessment_year)
+        limits = rules.deduction_limits
 
         with st.expander("📝 Deductions Calculator", expanded=True):
             col1, col2 = st.columns(2)
@@ -235,21 +122,22 @@ if page == "Tax Calculator":
                 d_80c = st.number_input(
                     "80C Investments",
                     min_value=0,
-                    max_value=150000,
+                    max_value=int(limits.section_80c),
                     value=0,
                     help="EPF, PPF, ELSS, etc."
                 )
                 d_80d = st.number_input(
                     "Health Insurance (80D)",
                     min_value=0,
-                    max_value=100000,
+                    # Self and parents, both senior citizens
+                    max_value=int(2 * limits.section_80d_senior),
                     value=0
                 )
             with col2:
                 d_80ccd = st.number_input(
                     "NPS Contribution (80CCD)",
                     min_value=0,
-                    max_value=50000,
+                    max_value=int(limits.section_80ccd),
                     value=0
                 )
                 d_others = st.number_input(
@@ -262,20 +150,58 @@ if page == "Tax Calculator":
             st.metric(
                 "Total Deductions",
                 f"₹{total_deductions:,}",
-                delta=f"₹{150000-d_80c:,} more possible in 80C",
+                delta=f"₹{int(limits.section_80c) - d_80c:,} more possible in 80C",
                 delta_color="normal"
             )
 
+            # Old regime wins once deductions reach the break-even amount for this income
+            with phase('calculate'):
+                break_even = break_even_deduction(annual_income, assessment_year)
+            if total_deductions >= break_even:
+                st.caption(f"⚖️ Old regime is cheaper: it breaks even at ₹{break_even:,.0f} of deductions")
+            else:
+                st.caption(f"⚖️ Old regime becomes cheaper with ₹{break_even - total_deductions:,.0f} more "
+                           f"deductions (break-even: ₹{break_even:,.0f})")
+
     with cg_tab:
         st.subheader("Capital Gains Details (Quarter-wise)")
         
+        # Gains are entered under the installment that pays them, by sale date
+        quarter_names = installment_windows(assessment_year)
         quarters = {
-            "Q1": {"name": "Q1 (Apr-Jun)", "due": "June 15, 2024"},
-            "Q2": {"name": "Q2 (Jul-Sep)", "due": "September 15, 2024"},
-            "Q3": {"name": "Q3 (Oct-Dec)", "due": "December 15, 2024"},
-            "Q4": {"name": "Q4 (Jan-Mar)", "due": "March 15, 2025"}
+            installment.quarter: {"name": quarter_names[installment.quarter], "due": installment.due_date}
+            for installment in rules.advance_tax
         }
         
+        tradebook = st.file_uploader(
+            "Import broker tradebook (CSV)",
+            type="csv",
+            help="Columns: symbol, trade_date, trade_type, quantity, price. Sells are matched to buys FIFO."
+        )
+        st.caption("Each sale's gain goes into the first installment due on or after the sale date, "
+                   "so a sale on 16 Jun counts towards the 15 Sep installment.")
+        # Match a newly uploaded tradebook once and prefill the quarterly inputs below
+        if tradebook is not None and st.session_state.get("tradebook_id") != (tradebook.file_id, assessment_year):
+            try:
+                with phase('tradebook'):
+                    gains, _ = calculate_tradebook_tax(
+                        io.TextIOWrapper(tradebook, encoding="utf-8-sig", newline=""), assessment_year
+                    )
+            except ValueError as e:
+                st.error(f"Could not read tradebook: {e}")
+            else:
+                for q in quarters:
+                    st.session_state[f"ltcg_{q}"] = round(gains['ltcg_by_quarter'][q])
+                    st.session_state[f"stcg_{q}"] = round(gains['stcg_by_quarter'][q])
+                st.session_state["tradebook_id"] = (tradebook.file_id, assessment_year)
+                st.session_state["tradebook_gains"] = gains
+        if tradebook is not None and "tradebook_gains" in st.session_state:
+            gains = st.session_state["tradebook_gains"]
+            st.caption(f"Matched {gains['trades']:,} trades; {gains['open_lots']:,} lots still open")
+            if gains['unmatched_sells']:
+                st.warning("Sells without matching buys were ignored: "
+                           + ", ".join(f"{symbol} ({quantity:g})" for symbol, quantity in gains['unmatched_sells'].items()))
+
         ltcg_by_quarter = {}
         stcg_by_quarter = {}
         
@@ -290,7 +216,7 @@ if page == "Tax Calculator":
                     key=f"ltcg_{q}"
                 )
                 if q == "Q1":
-                    st.caption("Note: First ₹1.25 Lakhs exempt for LTCG (annual)")
+                    st.caption(f"Note: First ₹{rules.ltcg_exemption:,} exempt for LTCG (annual)")
             
             with col2:
                 stcg_by_quarter[q] = st.number_input(
@@ -299,27 +225,98 @@ if page == "Tax Calculator":
                     value=0,
                     key=f"stcg_{q}"
                 )
-# Calculate and show results
-    if st.button("Calculate Tax 🧮", use_container_width=True):
-        # Calculate regular income tax
-        new_regime_tax = calculate_tax_new_regime(annual_income)
-        old_regime_tax = calculate_tax_old_regime(annual_income, total_deductions)
-        
-        # Calculate capital gains tax quarter-wise
-        cg_tax = calculate_capital_gains_tax(ltcg_by_quarter, stcg_by_quarter)
-        
-        # Add total capital gains tax to total tax
-        new_regime_tax['total_tax'] += cg_tax['total_cg_tax']
-        old_regime_tax['total_tax'] += cg_tax['total_cg_tax']
+
+    with simulation_tab:
+        st.subheader("🎲 Advance Tax Simulation")
+        st.markdown("Plan advance tax against uncertain bonus and market gains: the planned payments follow "
+                    "your point estimates, and each simulated year shows how much tax actually falls due.")
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            salary_sd = st.slider("Salary uncertainty (± % of Annual Income)", 0, 50, 5)
+            bonus_low = st.number_input("Bonus - lowest (₹)", min_value=0, value=0, step=10000)
+        with col2:
+            bonus_mode = st.number_input("Bonus - most likely (₹)", min_value=0, value=0, step=10000)
+            bonus_high = st.number_input("Bonus - highest (₹)", min_value=0, value=0, step=10000)
+        with col3:
+            gains_sd = st.slider("Capital gains uncertainty (± % of each quarter)", 0, 200, 50)
+            scenarios = st.select_slider("Scenarios", [10000, 100000, 1000000], value=1000000)
+        simulation_regime = st.radio("Regime", ["auto", "new", "old"], horizontal=True,
+                                     format_func={"auto": "Cheaper in each scenario", "new": "New", "old": "Old"}.get)
+        seed = st.number_input("Random seed", min_value=0, value=0, step=1)
+
+        if st.button("Run Simulation 🎲", use_container_width=True):
+            from tax_engine.montecarlo import cached_simulation
+
+            if not bonus_low <= bonus_mode <= bonus_high:
+                st.error("Bonus needs lowest ≤ most likely ≤ highest")
+            else:
+                def uncertain(value, sd_percentage):
+                    return {'kind': 'normal', 'mean': value, 'sd': value * sd_percentage / 100}
+
+                with phase('simulate'):
+                    simulation = cached_simulation(
+                        uncertain(annual_income, salary_sd),
+                        {'kind': 'triangular', 'low': bonus_low, 'mode': bonus_mode, 'high': bonus_high},
+                        [uncertain(ltcg_by_quarter[q], gains_sd) for q in quarters],
+                        [uncertain(stcg_by_quarter[q], gains_sd) for q in quarters],
+                        total_deductions,
+                        simulation_regime,
+                        scenarios=scenarios,
+                        seed=seed,
+                        assessment_year=assessment_year
+                    )
+
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Chance of 234C interest", f"{simulation['probability_234c']:.1%}",
+                            help="Paying the planned installments below")
+                col2.metric("Expected 234C interest", f"₹{simulation['interest_234c']['mean']:,.0f}")
+                col3.metric("Chance of 234B interest", f"{simulation['probability_234b']:.1%}")
+
+                import pandas as pd
+
+                labels = [f"P{round(q * 100)}" for q in simulation['quantiles']]
+                st.table(pd.DataFrame([
+                    dict(
+                        {'Installment': f"{info['name']} - {installment['due_date']}",
+                         'Planned (₹)': f"{installment['planned_payment']:,.0f}"},
+                        **{f"{label} (₹)": f"{value:,.0f}" for label, value in zip(labels, installment['quantiles'])},
+                        **{'Chance of 234C': f"{installment['probability_234c']:.1%}"}
+                    )
+                    for info, installment in zip(quarters.values(), simulation['installments'].values())
+                ]))
+                total = simulation['total_tax']
+                st.caption(f"Total tax: median ₹{total['quantiles'][len(labels) // 2]:,.0f}, "
+                           f"{labels[0]}–{labels[-1]} ₹{total['quantiles'][0]:,.0f}–₹{total['quantiles'][-1]:,.0f}. "
+                           f"{simulation['scenarios']:,} scenarios (seed {simulation['seed']}) "
+                           f"in {simulation['seconds']:.2f}s.")
+    # Results come from the page's dependency graph (utils.calculator_graph); each
+    # session's GraphState keeps the last values, so only what depends on an input
+    # changed since the last run is redone
+    live = st.toggle("Update results live", key="live_results",
+                     help="Recalculate as you edit; only the sections an edit affects are worked out again")
+    if live or st.button("Calculate Tax 🧮", use_container_width=True):
+        graph_state = st.session_state.setdefault("calculator_graph", GraphState())
+        results = shared_calculator_graph().update(graph_state, {
+            'annual_income': annual_income,
+            'deductions': total_deductions,
+            'ltcg': tuple(ltcg_by_quarter[q] for q in quarters),
+            'stcg': tuple(stcg_by_quarter[q] for q in quarters),
+            'assessment_year': assessment_year,
+            'rule_version': rules.version,
+        })
+        recomputed_nodes = list(graph_state.recomputed)
+        new_regime_tax = results['new_regime']
+        old_regime_tax = results['old_regime']
+        cg_tax = results['capital_gains']
+        totals = results['totals']
         
         # Display comparative visualizations
         st.subheader("📊 Tax Analysis")
         
         # Display tax comparison chart
-        st.plotly_chart(
-            create_tax_comparison_chart(new_regime_tax, old_regime_tax),
-            use_container_width=True
-        )
+        with phase('render'):
+            st.plotly_chart(results['comparison_chart'], use_container_width=True)
         
         # Display regime-wise breakdown
         col1, col2 = st.columns(2)
@@ -327,32 +324,32 @@ if page == "Tax Calculator":
         with col1:
             st.markdown("### New Tax Regime")
             st.markdown(f"""
-            - Taxable Income: ₹{new_regime_tax['taxable_income']:,.2f}
-            - Base Tax: ₹{new_regime_tax['base_tax']:,.2f}
-            - Surcharge: ₹{new_regime_tax['surcharge']:,.2f}
-            - Cess: ₹{new_regime_tax['cess']:,.2f}
-            - **Total Tax: ₹{new_regime_tax['total_tax']:,.2f}**
+            - Taxable Income: ₹{new_regime_tax.taxable_income:,.2f}
+            - Base Tax: ₹{new_regime_tax.base_tax:,.2f}
+            - Surcharge: ₹{new_regime_tax.surcharge:,.2f}
+            - Cess: ₹{new_regime_tax.cess:,.2f}
+            - Tax on Income: ₹{new_regime_tax.total_tax:,.2f}
+            - Capital Gains Tax: ₹{cg_tax.total_cg_tax:,.2f}
+            - **Total Tax: ₹{totals['new_regime']:,.2f}**
             """)
             
-            st.plotly_chart(
-                create_tax_breakdown_pie(new_regime_tax, 'New'),
-                use_container_width=True
-            )
+            with phase('render'):
+                st.plotly_chart(results['new_pie'], use_container_width=True)
         
         with col2:
             st.markdown("### Old Tax Regime")
             st.markdown(f"""
-            - Taxable Income: ₹{old_regime_tax['taxable_income']:,.2f}
-            - Base Tax: ₹{old_regime_tax['base_tax']:,.2f}
-            - Surcharge: ₹{old_regime_tax['surcharge']:,.2f}
-            - Cess: ₹{old_regime_tax['cess']:,.2f}
-            - **Total Tax: ₹{old_regime_tax['total_tax']:,.2f}**
+            - Taxable Income: ₹{old_regime_tax.taxable_income:,.2f}
+            - Base Tax: ₹{old_regime_tax.base_tax:,.2f}
+            - Surcharge: ₹{old_regime_tax.surcharge:,.2f}
+            - Cess: ₹{old_regime_tax.cess:,.2f}
+            - Tax on Income: ₹{old_regime_tax.total_tax:,.2f}
+            - Capital Gains Tax: ₹{cg_tax.total_cg_tax:,.2f}
+            - **Total Tax: ₹{totals['old_regime']:,.2f}**
             """)
             
-            st.plotly_chart(
-                create_tax_breakdown_pie(old_regime_tax, 'Old'),
-                use_container_width=True
-            )
+            with phase('render'):
+                st.plotly_chart(results['old_pie'], use_container_width=True)
 
         # Show capital gains breakdown if applicable
         total_ltcg = sum(ltcg_by_quarter.values())
@@ -368,16 +365,16 @@ if page == "Tax Calculator":
             with col1:
                 st.markdown("**Long Term Capital Gains**")
                 st.write(f"Total LTCG: ₹{total_ltcg:,.2f}")
-                st.write(f"Exemption: ₹{125000:,.2f}")
-                st.write(f"Taxable LTCG: ₹{cg_tax['taxable_ltcg']:,.2f}")
-                st.write(f"LTCG Tax (12.5%): ₹{cg_tax['ltcg_tax']:,.2f}")
+                st.write(f"Exemption: ₹{rules.ltcg_exemption:,.2f}")
+                st.write(f"Taxable LTCG: ₹{cg_tax.taxable_ltcg:,.2f}")
+                st.write(f"LTCG Tax ({rules.ltcg_rate * 100:g}%): ₹{cg_tax.ltcg_tax:,.2f}")
             
             with col2:
                 st.markdown("**Short Term Capital Gains**")
                 st.write(f"Total STCG: ₹{total_stcg:,.2f}")
-                st.write(f"STCG Tax (20%): ₹{cg_tax['stcg_tax']:,.2f}")
+                st.write(f"STCG Tax ({rules.stcg_rate * 100:g}%): ₹{cg_tax.stcg_tax:,.2f}")
             
-            st.markdown(f"**Total Capital Gains Tax: ₹{cg_tax['total_cg_tax']:,.2f}**")
+            st.markdown(f"**Total Capital Gains Tax: ₹{cg_tax.total_cg_tax:,.2f}**")
             
             # Quarter-wise breakdown
             st.markdown("### Quarterly Breakdown")
@@ -386,30 +383,16 @@ if page == "Tax Calculator":
             for i, (q, info) in enumerate(quarters.items()):
                 with quarter_cols[i]:
                     st.markdown(f"**{info['name']}**")
-                    qt = cg_tax['quarterly_tax'][q]
+                    qt = cg_tax.quarterly_tax[q]
                     st.write(f"LTCG: ₹{ltcg_by_quarter[q]:,.2f}")
                     st.write(f"STCG: ₹{stcg_by_quarter[q]:,.2f}")
-                    st.write(f"Tax: ₹{qt['total']:,.2f}")
+                    st.write(f"Tax: ₹{qt.total:,.2f}")
 
         # Display advance tax schedule
         st.subheader("📅 Advance Tax Schedule")
         
-        # Prepare quarterly capital gains tax
-        cg_tax_by_quarter = {q: tax['total'] for q, tax in cg_tax['quarterly_tax'].items()}
-        schedule = calculate_advance_tax_schedule(new_regime_tax['total_tax'], cg_tax_by_quarter)
-        
-        # Create advanced tax table
-        tax_table = []
-        for entry in schedule:
-            tax_table.append({
-                'Due Date': entry['due_date'],
-                'Regular Tax (₹)': f"{entry['regular_tax']:,.2f}",
-                'Capital Gains Tax (₹)': f"{entry['capital_gains_tax']:,.2f}",
-                'Total Amount (₹)': f"{entry['total_amount']:,.2f}",
-                'Cumulative %': f"{entry['percentage']}%"
-            })
-        
-        st.table(pd.DataFrame(tax_table))
+        with phase('render'):
+            st.table(results['advance_tax_table'])
             
         st.info("""
         💡 Advance Tax Payment Notes:
@@ -419,12 +402,59 @@ if page == "Tax Calculator":
         """)
             
         # Show tax saving recommendation
-        tax_diff = abs(new_regime_tax['total_tax'] - old_regime_tax['total_tax'])
-        if new_regime_tax['total_tax'] < old_regime_tax['total_tax']:
+        tax_diff = totals['tax_saving']
+        if totals['recommended_regime'] == 'new':
             st.success(f"💡 Recommendation: Choose **New Tax Regime**\nYou will save ₹{tax_diff:,.2f}")
         else:
             st.success(f"💡 Recommendation: Choose **Old Tax Regime**\nYou will save ₹{tax_diff:,.2f}")
 
+elif page == "Tax Rate Explorer":
+    from tax_engine.curves import MAX_SWEEP_POINTS, cached_tax_rate_curves, sweep_step, tax_rate_curves
+
+    st.title("📈 Tax Rate Explorer")
+    st.markdown("Total tax, effective rate and marginal rate for both regimes across a range of incomes.")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        max_income = st.number_input("Up to Income (₹)", min_value=100000, value=100000000, step=1000000, format="%d")
+        user_income = st.number_input("Your Income (₹)", min_value=0, value=1500000, step=10000, format="%d")
+    with col2:
+        step = st.number_input("Resolution (₹)", min_value=1, value=100, step=100, format="%d")
+        curve_deductions = st.number_input("Old Regime Deductions (₹)", min_value=0, value=150000, step=10000,
+                                           format="%d")
+    with col3:
+        curve_year = st.selectbox(
+            "Assessment Year",
+            list(RULE_SETS),
+            index=list(RULE_SETS).index(default_assessment_year()),
+            key="curve_assessment_year"
+        )
+
+    # The full sweep is evaluated vectorized and thinned server-side to a few
+    # thousand points, keeping every slab edge, before it goes to the browser
+    with phase('calculate'):
+        curve_key, curves, evaluated = cached_tax_rate_curves(max_income, step, curve_deductions, curve_year)
+        user_point = dict(tax_rate_curves([user_income], curve_deductions, curve_year), income=user_income)
+    st.caption(f"Evaluated {evaluated:,} incomes; drawing {len(curves['income']):,} points")
+    if sweep_step(max_income, step) > step:
+        st.caption(f"Resolution coarsened to ₹{sweep_step(max_income, step):,.0f} to stay within "
+                   f"{MAX_SWEEP_POINTS:,} incomes")
+
+    with phase('figures'):
+        curve_chart = cached_figure(('tax_curve', curve_key, user_income),
+                                    lambda: create_tax_curve_chart(curves, user_point))
+        rate_chart = cached_figure(('tax_rate', curve_key, user_income),
+                                   lambda: create_tax_rate_chart(curves, user_point))
+    with phase('render'):
+        st.plotly_chart(curve_chart, use_container_width=True)
+        st.plotly_chart(rate_chart, use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    for col, regime, name in ((col1, 'new_regime', 'New'), (col2, 'old_regime', 'Old')):
+        with col:
+            st.metric(f"{name} Regime Effective Rate", f"{user_point[regime]['effective_rate'][0]:.2%}")
+            st.metric(f"{name} Regime Marginal Rate", f"{user_point[regime]['marginal_rate'][0]:.2%}")
+
 elif page == "Educational Center":
     st.title("📚 Tax Education Center")
     
@@ -456,11 +486,13 @@ elif page == "Tax Planning":
     st.title("🎯 Tax Planning Assistant")
     
     income = st.number_input("Expected Annual Income", value=500000)
+    age = st.number_input("Age", min_value=18, max_value=100, value=35)
     current_investments = st.number_input("Current Tax Saving Investments", value=0)
+    budget = st.number_input("Budget for New Investments", min_value=0, value=100000, step=10000)
     
     tips = get_tax_saving_tips(
         income,
-        age=35,
+        age=age,
         current_deductions={'80C': current_investments}
     )
     
@@ -468,6 +500,21 @@ elif page == "Tax Planning":
     for tip in tips:
         st.info(tip)
 
+    st.subheader("📈 Best Use of Your Budget")
+    plan = optimize_deductions(income, age, budget, current_deductions={'80C': current_investments})
+    if plan.regime == 'new':
+        st.write(f"The new regime is cheapest at ₹{plan.total_tax:,.2f}, even after investing under the old regime "
+                 f"(₹{plan.old_regime_tax:,.2f}), so none of the budget is needed for tax.")
+    else:
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Section 80C", f"₹{plan.section_80c:,.0f}")
+        col2.metric("Section 80D", f"₹{plan.section_80d:,.0f}")
+        col3.metric("Section 80CCD(1B)", f"₹{plan.section_80ccd:,.0f}")
+        st.write(f"Investing ₹{plan.invested:,.0f} and choosing the old regime brings your tax to "
+                 f"₹{plan.total_tax:,.2f}, saving ₹{plan.tax_saving:,.2f}.")
+        if plan.invested < budget:
+            st.caption(f"Investing more than ₹{plan.invested:,.0f} would not lower your tax any further.")
+
 else:  # Help & Support
     st.title("❓ Help & Support Center")
     
@@ -503,3 +550,25 @@ st.markdown("""
         <p>Last updated: March 2024</p>
     </div>
 """, unsafe_allow_html=True)
+
+# Timing panel, only when TAX_CALC_PROFILE is set (see tax_engine.instrumentation)
+profile = end_run(result_cache=RESULT_CACHE.stats(), figure_cache=FIGURE_CACHE.stats(),
+                  recomputed_nodes=recomputed_nodes)
+if profile is not None:
+    import pandas as pd
+
+    with st.sidebar.expander("⏱️ Performance", expanded=True):
+        st.caption(f"{profile['page']} rerun took {profile['total_ms']:.1f} ms")
+        if profile['phases']:
+            st.table(pd.DataFrame([
+                {'Phase': name, 'ms': f"{entry['ms']:.2f}", 'Calls': entry['calls']}
+                for name, entry in profile['phases'].items()
+            ]))
+        for name, value in profile['counters'].items():
+            st.caption(f"{name}: {value:,}")
+        if profile['recomputed_nodes'] is not None:
+            st.caption(f"recomputed: {', '.join(profile['recomputed_nodes']) or 'nothing'}")
+        for name in ('result_cache', 'figure_cache'):
+            stats = profile[name]
+            st.caption(f"{name}: {stats['hits']:,} hits, {stats['misses']:,} misses, "
+                       f"{stats['size']}/{stats['maxsize']} entries")
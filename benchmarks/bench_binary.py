@@ -0,0 +1,98 @@
+# benchmarks/bench_binary.py
+"""Time batch runs over memory-mapped .taxbin files against CSV.
+
+Writes --rows random taxpayers straight into a .taxbin input file and runs
+the batch calculation over it --repeat times, as repeated what-if runs over
+one population would, reporting rows/sec and MB/sec of input and output.
+For comparison the first --csv-rows of the population go through the CSV
+path: written as CSV, converted to .taxbin, and batch-processed CSV to CSV.
+
+    python benchmarks/bench_binary.py --rows 5000000
+"""
+import argparse
+import csv
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from tax_engine.binary import INPUT_DTYPE, OUTPUT_DTYPE, convert_to_binary, create_records, process_binary
+from tax_engine.streaming import QUARTERS, process_file
+
+
+def write_population(path, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    records = create_records(path, 'input', rows)
+    for begin in range(0, rows, 1000000):
+        chunk = records[begin:begin + 1000000]
+        n = len(chunk)
+        chunk['annual_income'] = np.round(rng.lognormal(np.log(1500000), 1.0, n), 2)
+        chunk['deductions'] = np.round(rng.uniform(0, 400000, n), 2)
+        chunk['age'] = rng.integers(22, 80, n)
+        chunk['ltcg'] = np.round(rng.uniform(0, 200000, (n, len(QUARTERS))), 2)
+        chunk['stcg'] = np.round(rng.uniform(0, 100000, (n, len(QUARTERS))), 2)
+    records.flush()
+    return records
+
+
+def write_csv(path, records):
+    names = (['annual_income', 'deductions', 'age'] + [f'ltcg_{q}' for q in QUARTERS]
+             + [f'stcg_{q}' for q in QUARTERS])
+    columns = ([records['annual_income'], records['deductions'], records['age']]
+               + [records['ltcg'][:, i] for i in range(len(QUARTERS))]
+               + [records['stcg'][:, i] for i in range(len(QUARTERS))])
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(names)
+        writer.writerows(zip(*(column.tolist() for column in columns)))
+
+
+def report(name, stats, rows, bytes_per_row):
+    print(f"{name:<28}{rows:>12,}{stats['seconds']:>10.2f}{rows / stats['seconds']:>14,.0f}"
+          f"{rows * bytes_per_row / stats['seconds'] / 1024 ** 2:>10,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000000, help="Taxpayers in the .taxbin file (default: %(default)s)")
+    parser.add_argument('--csv-rows', type=int, default=500000,
+                        help="Taxpayers for the CSV comparison (default: %(default)s)")
+    parser.add_argument('--chunk-size', type=int, default=1000000,
+                        help="Rows per chunk of the .taxbin run (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs over the .taxbin file (default: %(default)s)")
+    parser.add_argument('--paise', action='store_true', help="Compute in exact integer paise")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        input_path = os.path.join(directory, 'population.taxbin')
+        output_path = os.path.join(directory, 'results.taxbin')
+        records = write_population(input_path, args.rows)
+        size = os.path.getsize(input_path)
+        print(f"{args.rows:,} records, {INPUT_DTYPE.itemsize} bytes each in and {OUTPUT_DTYPE.itemsize} out "
+              f"({size / 1024 ** 2:,.0f} MB input)")
+
+        bytes_per_row = INPUT_DTYPE.itemsize + OUTPUT_DTYPE.itemsize
+        print(f"{'case':<28}{'rows':>12}{'seconds':>10}{'rows/sec':>14}{'MB/sec':>10}")
+        for i in range(args.repeat):
+            stats = process_binary(input_path, output_path, chunk_size=args.chunk_size, exact=args.paise)
+            report(f'taxbin run {i + 1}', stats, args.rows, bytes_per_row)
+
+        csv_rows = min(args.csv_rows, args.rows)
+        csv_input = os.path.join(directory, 'population.csv')
+        write_csv(csv_input, records[:csv_rows])
+        csv_bytes = os.path.getsize(csv_input) / csv_rows
+        stats = convert_to_binary(csv_input, os.path.join(directory, 'converted.taxbin'))
+        report('convert csv -> taxbin', stats, csv_rows, csv_bytes)
+        stats = process_file(csv_input, os.path.join(directory, 'results.csv'), exact=args.paise)
+        report('batch csv -> csv', stats, csv_rows, csv_bytes)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
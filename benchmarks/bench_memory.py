@@ -0,0 +1,79 @@
+# benchmarks/bench_memory.py
+"""Measure the memory held by a million tax results in each representation.
+
+Builds --records results as the old per-call dicts, as the NamedTuple
+records from tax_engine.results, as a column bundle of NumPy arrays and as
+one structured array. Reports the bytes traced by tracemalloc per record
+and per million records, for both regime breakdowns and capital gains tax
+with its quarter-wise split.
+
+    python benchmarks/bench_memory.py --records 1000000    # slow: tracemalloc traces every allocation
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from tax_engine import calculate_capital_gains_tax, calculate_tax_new_regime
+from tax_engine.batch import as_structured_array, calculate_capital_gains_tax_batch, calculate_tax_new_regime_batch
+
+QUARTERS = ['Q1', 'Q2', 'Q3', 'Q4']
+
+
+def traced_size(build):
+    """Bytes still allocated by build() once its result is kept and garbage collected"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=200000,
+                        help="Results built per representation; sizes are scaled to a million (default: %(default)s)")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    incomes = [float(rng.randrange(0, 30000000)) for _ in range(args.records)]
+    gains = [({q: float(rng.randrange(0, 200000)) for q in QUARTERS},
+              {q: float(rng.randrange(0, 200000)) for q in QUARTERS}) for _ in range(args.records)]
+    income_array = np.array(incomes)
+    ltcg_array = np.array([[ltcg[q] for q in QUARTERS] for ltcg, _ in gains])
+    stcg_array = np.array([[stcg[q] for q in QUARTERS] for _, stcg in gains])
+
+    cases = [
+        ('regime: dict per call', lambda: [calculate_tax_new_regime(x).as_dict() for x in incomes]),
+        ('regime: TaxBreakdown', lambda: [calculate_tax_new_regime(x) for x in incomes]),
+        ('regime: column bundle', lambda: calculate_tax_new_regime_batch(income_array)),
+        ('regime: structured array', lambda: as_structured_array(calculate_tax_new_regime_batch(income_array))),
+        ('capital gains: nested dicts', lambda: [calculate_capital_gains_tax(l, s).as_dict() for l, s in gains]),
+        ('capital gains: CapitalGainsTax', lambda: [calculate_capital_gains_tax(l, s) for l, s in gains]),
+        ('capital gains: column bundle', lambda: calculate_capital_gains_tax_batch(ltcg_array, stcg_array)),
+    ]
+
+    print(f"{'representation':<34}{'bytes/record':>14}{'MB per million':>16}")
+    sizes = {}
+    for name, build in cases:
+        sizes[name] = traced_size(build) / args.records
+        print(f"{name:<34}{sizes[name]:>14,.0f}{sizes[name]:>16,.1f}")
+
+    for kind, baseline in (('regime', 'regime: dict per call'), ('capital gains', 'capital gains: nested dicts')):
+        for name, size in sizes.items():
+            if name.startswith(kind) and name != baseline:
+                print(f"{name}: saves {(sizes[baseline] - size):,.1f} MB per million records "
+                      f"({1 - size / sizes[baseline]:.0%})")
+
+
+if __name__ == '__main__':
+    main()
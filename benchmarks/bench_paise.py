@@ -0,0 +1,113 @@
+# benchmarks/bench_paise.py
+"""Time the integer paise calculators against the float ones.
+
+Runs both regimes and capital gains tax over --rows random taxpayers with the
+float batch functions and with their int64 paise equivalents, plus a sample
+of scalar calls each way. Also reports how often the float path's new
+regime total, rounded to ten rupees afterwards, misses the exact Section
+288A/288B figure.
+
+    python benchmarks/bench_paise.py --rows 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from tax_engine import calculate_capital_gains_tax, calculate_tax_new_regime, calculate_tax_old_regime
+from tax_engine.batch import (
+    calculate_capital_gains_tax_batch,
+    calculate_tax_new_regime_batch,
+    calculate_tax_old_regime_batch,
+)
+from tax_engine.paise import (
+    calculate_capital_gains_tax_paise,
+    calculate_capital_gains_tax_paise_batch,
+    calculate_tax_new_regime_paise,
+    calculate_tax_new_regime_paise_batch,
+    calculate_tax_old_regime_paise,
+    calculate_tax_old_regime_paise_batch,
+    to_paise_batch,
+)
+
+QUARTERS = ['Q1', 'Q2', 'Q3', 'Q4']
+
+
+def best_of(repeat, run):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000, help="Taxpayers per batch run (default: %(default)s)")
+    parser.add_argument('--scalar-rows', type=int, default=20000,
+                        help="Taxpayers for the scalar comparison (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per case, best kept (default: %(default)s)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    # Whole rupees and paise, as payroll exports have them
+    income = np.round(rng.lognormal(np.log(1500000), 1.0, args.rows), 2)
+    deductions = np.round(rng.uniform(0, 400000, args.rows), 2)
+    ltcg = np.round(rng.uniform(0, 200000, (args.rows, 4)), 2)
+    stcg = np.round(rng.uniform(0, 100000, (args.rows, 4)), 2)
+    income_paise, deductions_paise = to_paise_batch(income), to_paise_batch(deductions)
+    ltcg_paise, stcg_paise = to_paise_batch(ltcg), to_paise_batch(stcg)
+
+    def float_batch():
+        calculate_tax_new_regime_batch(income)
+        calculate_tax_old_regime_batch(income, deductions)
+        calculate_capital_gains_tax_batch(ltcg, stcg)
+
+    def paise_batch():
+        calculate_tax_new_regime_paise_batch(income_paise)
+        calculate_tax_old_regime_paise_batch(income_paise, deductions_paise)
+        calculate_capital_gains_tax_paise_batch(ltcg_paise, stcg_paise)
+
+    n = min(args.scalar_rows, args.rows)
+    scalar = [(float(income[i]), float(deductions[i]), dict(zip(QUARTERS, ltcg[i].tolist())),
+               dict(zip(QUARTERS, stcg[i].tolist()))) for i in range(n)]
+    scalar_paise = [(int(income_paise[i]), int(deductions_paise[i]), dict(zip(QUARTERS, ltcg_paise[i].tolist())),
+                     dict(zip(QUARTERS, stcg_paise[i].tolist()))) for i in range(n)]
+
+    def float_scalar():
+        for x, d, l, s in scalar:
+            calculate_tax_new_regime(x)
+            calculate_tax_old_regime(x, d)
+            calculate_capital_gains_tax(l, s)
+
+    def paise_scalar():
+        for x, d, l, s in scalar_paise:
+            calculate_tax_new_regime_paise(x)
+            calculate_tax_old_regime_paise(x, d)
+            calculate_capital_gains_tax_paise(l, s)
+
+    cases = [
+        (f'batch, {args.rows:,} rows', float_batch, paise_batch, args.rows),
+        (f'scalar, {n:,} rows', float_scalar, paise_scalar, n),
+    ]
+    print(f"{'case':<24}{'float ms':>12}{'paise ms':>12}{'paise/float':>14}{'paise rows/sec':>18}")
+    for name, float_run, paise_run, rows in cases:
+        float_time = best_of(args.repeat, float_run)
+        paise_time = best_of(args.repeat, paise_run)
+        print(f"{name:<24}{float_time * 1000:>12.1f}{paise_time * 1000:>12.1f}"
+              f"{paise_time / float_time:>14.2f}{rows / paise_time:>18,.0f}")
+
+    exact_total = calculate_tax_new_regime_paise_batch(income_paise)['total_tax']
+    float_total = to_paise_batch(np.floor(calculate_tax_new_regime_batch(income)['total_tax'] / 10 + 0.5) * 10)
+    drift = np.abs(float_total - exact_total)
+    print(f"new regime: float total rounded to ten rupees misses the exact figure in {(drift > 0).mean():.1%} "
+          f"of rows (by up to ₹{drift.max() / 100:,.0f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# benchmarks/bench_parallel.py
+"""Measure how the sharded batch run scales with the number of workers.
+
+Generates a synthetic payroll CSV, processes it with 1, 2, 4, ... workers up
+to the machine's core count, checks every run produced identical output and
+prints rows/sec and speedup over a single worker.
+
+    python benchmarks/bench_parallel.py --rows 1000000
+"""
+import argparse
+import csv
+import filecmp
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tax_engine.streaming import process_file
+
+
+def write_payroll(path, rows, seed=0):
+    rng = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['employee_id', 'annual_income', 'deductions']
+                        + [f'ltcg_q{q}' for q in range(1, 5)]
+                        + [f'stcg_q{q}' for q in range(1, 5)])
+        for i in range(rows):
+            writer.writerow([f'E{i:08d}', rng.randrange(0, 50000000), rng.randrange(0, 300000)]
+                            + [rng.randrange(0, 100000) for _ in range(8)])
+
+
+def worker_counts(max_workers):
+    count = 1
+    while count < max_workers:
+        yield count
+        count *= 2
+    yield max_workers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, 'payroll.csv')
+        write_payroll(input_path, args.rows)
+
+        baseline = None
+        reference = None
+        print(f"{'workers':>7}  {'seconds':>8}  {'rows/sec':>12}  {'speedup':>7}")
+        for workers in worker_counts(args.max_workers):
+            output_path = os.path.join(tmp, f'out_{workers}.csv')
+            stats = process_file(input_path, output_path, chunk_size=args.chunk_size, workers=workers)
+            if reference is None:
+                reference = output_path
+                baseline = stats['seconds']
+            elif not filecmp.cmp(reference, output_path, shallow=False):
+                raise SystemExit(f"Output with {workers} workers differs from the single-worker run")
+            print(f"{workers:>7}  {stats['seconds']:>8.2f}  {stats['rows_per_sec']:>12,.0f}  "
+                  f"{baseline / stats['seconds']:>6.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/bench_reactive.py
+"""Measure the recompute work saved by the Tax Calculator's dependency graph.
+
+Drives the page through a sequence of single-input edits with live results
+on, twice: once keeping the session's graph state, so only the nodes
+downstream of each edit are recomputed, and once resetting it (and the
+figure cache) before every edit, which is the full pass the Calculate
+button used to make. For each edit prints the nodes recomputed and the
+milliseconds spent in them (the node:* phases from tax_engine.instrumentation),
+plus the whole rerun.
+
+    python benchmarks/bench_reactive.py --rounds 5
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+LOG = os.path.join(tempfile.mkdtemp(), 'profile.jsonl')
+os.environ['TAX_CALC_PROFILE'] = '1'
+os.environ['TAX_CALC_PROFILE_LOG'] = LOG
+
+from streamlit.testing.v1 import AppTest
+
+import utils
+from tax_engine.reactive import GraphState
+
+# (edit, widget key or label, values to cycle through)
+EDITS = [
+    ('STCG Q3', 'stcg_Q3', [50000, 75000]),
+    ('LTCG Q1', 'ltcg_Q1', [200000, 250000]),
+    ('80C', '80C Investments', [50000, 150000]),
+    ('Annual income', 'Annual Income (₹)', [2500000, 3100000]),
+]
+
+
+def number_input(app, name):
+    return next(n for n in app.number_input if n.key == name or n.label == name)
+
+
+def last_record():
+    with open(LOG, encoding='utf-8') as f:
+        return json.loads(f.readlines()[-1])
+
+
+def run_edit(app, name, value, incremental):
+    if not incremental:
+        app.session_state['calculator_graph'] = GraphState()
+        utils.FIGURE_CACHE.clear()
+    number_input(app, name).set_value(value)
+    start = time.perf_counter()
+    app.run()
+    elapsed = (time.perf_counter() - start) * 1000
+    if app.exception:
+        raise RuntimeError(f"Tax Calculator page failed: {app.exception}")
+    record = last_record()
+    node_ms = sum(entry['ms'] for phase, entry in record['phases'].items() if phase.startswith('node:'))
+    return record['recomputed_nodes'], node_ms, record['phases']['render']['ms'], elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=5, help="Passes over the edits, median kept (default: %(default)s)")
+    args = parser.parse_args()
+
+    app = AppTest.from_file(os.path.join(ROOT, 'app.py'), default_timeout=60).run()
+    app.toggle(key='live_results').set_value(True).run()
+
+    results = {}
+    for round_ in range(args.rounds):
+        for incremental in (True, False):
+            for edit, name, values in EDITS:
+                nodes, node_ms, render_ms, rerun_ms = run_edit(app, name, values[round_ % len(values)], incremental)
+                entry = results.setdefault((edit, incremental),
+                                           {'nodes': nodes, 'node_ms': [], 'render_ms': [], 'rerun_ms': []})
+                entry['node_ms'].append(node_ms)
+                entry['render_ms'].append(render_ms)
+                entry['rerun_ms'].append(rerun_ms)
+
+    print(f"{'edit':<15}{'mode':<13}{'nodes':>6}{'node ms':>10}{'render ms':>11}{'rerun ms':>10}  recomputed")
+    for edit, _, _ in EDITS:
+        for incremental in (True, False):
+            entry = results[(edit, incremental)]
+            print(f"{edit:<15}{'incremental' if incremental else 'full pass':<13}{len(entry['nodes']):>6}"
+                  f"{statistics.median(entry['node_ms']):>10.2f}{statistics.median(entry['render_ms']):>11.2f}"
+                  f"{statistics.median(entry['rerun_ms']):>10.1f}  "
+                  f"{', '.join(entry['nodes'])}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# benchmarks/bench_reports.py
+"""Time bulk statement generation into a zip file.
+
+Writes --rows random employees to a CSV and renders a statement for each
+with tax_engine.reports, once per format and worker count, reporting
+statements/sec, the size of the statements and of the zip, and the peak
+resident memory of the run (children included), which should not grow with
+--rows.
+
+    python benchmarks/bench_reports.py --rows 20000 --workers 1 --workers 4
+"""
+import argparse
+import csv
+import os
+import resource
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from tax_engine.reports import DEFAULT_REPORT_CHUNK_SIZE, REPORT_FORMATS, write_reports
+from tax_engine.streaming import QUARTERS
+
+
+def write_population(path, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    columns = {
+        'employee_id': [f'EMP{i:07d}' for i in range(rows)],
+        'annual_income': np.round(rng.lognormal(np.log(1500000), 1.0, rows), 2).tolist(),
+        'deductions': np.round(rng.uniform(0, 400000, rows), 2).tolist(),
+    }
+    # Most employees have no capital gains, so most statements skip that section
+    has_gains = rng.random(rows) < 0.3
+    for q in QUARTERS:
+        columns[f'ltcg_{q}'] = np.round(np.where(has_gains, rng.uniform(0, 200000, rows), 0), 2).tolist()
+        columns[f'stcg_{q}'] = np.round(np.where(has_gains, rng.uniform(0, 100000, rows), 0), 2).tolist()
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows(zip(*columns.values()))
+
+
+def peak_mb():
+    usage = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return usage / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000, help="Employees (default: %(default)s)")
+    parser.add_argument('--format', action='append', choices=REPORT_FORMATS,
+                        help="Statement format; may be repeated (default: html)")
+    parser.add_argument('--workers', type=int, action='append',
+                        help="Worker processes; may be repeated (default: 1 and every core)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_REPORT_CHUNK_SIZE,
+                        help="Statements per chunk (default: %(default)s)")
+    args = parser.parse_args()
+    formats = args.format or ['html']
+    workers = args.workers or sorted({1, os.cpu_count()})
+
+    directory = tempfile.mkdtemp()
+    try:
+        input_path = os.path.join(directory, 'employees.csv')
+        write_population(input_path, args.rows)
+        print(f"{'format':<8}{'workers':>8}{'statements':>12}{'seconds':>10}{'stmts/sec':>12}"
+              f"{'content MB':>12}{'zip MB':>10}{'peak MB':>10}")
+        for report_format in formats:
+            for count in workers:
+                output_path = os.path.join(directory, f'statements-{report_format}-{count}.zip')
+                stats = write_reports(input_path, output_path, report_format, chunk_size=args.chunk_size,
+                                      workers=count)
+                print(f"{report_format:<8}{count:>8}{stats['statements']:>12,}{stats['seconds']:>10.2f}"
+                      f"{stats['statements_per_sec']:>12,.0f}{stats['bytes'] / 1024 ** 2:>12,.1f}"
+                      f"{os.path.getsize(output_path) / 1024 ** 2:>10,.1f}{peak_mb():>10,.0f}")
+                os.remove(output_path)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
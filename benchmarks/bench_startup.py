@@ -0,0 +1,145 @@
+# benchmarks/bench_startup.py
+"""Measure the Streamlit app's cold start and per-rerun time against a budget.
+
+Each trial runs in a fresh interpreter, so module imports are paid exactly
+as a newly spawned replica pays them. A trial times:
+
+- importing streamlit itself, which the app cannot avoid
+- importing the app's own modules (utils and tax_engine)
+- the first run of app.py (the Tax Calculator page before Calculate); this
+  includes streamlit's one-time component discovery, which a server pays
+  once at startup
+- the first visit and a repeat rerun of every other page
+- the first and a repeat click of Calculate
+
+and records which heavy libraries the app had imported by then, beyond
+those streamlit imports for itself (it loads plotly.graph_objects to
+register its theme). The median over --trials is compared with BUDGET_MS;
+the script exits with status 1 if any step is over budget, or if pandas or
+plotly.express were loaded by a page that never draws a chart or table.
+
+    python benchmarks/bench_startup.py --trials 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGES = ["Educational Center", "Tax Planning", "Help & Support", "Tax Rate Explorer"]
+CHART_FREE_PAGES = ["Educational Center", "Tax Planning", "Help & Support"]
+HEAVY_MODULES = ['pandas', 'plotly.graph_objects', 'plotly.express', 'numpy']
+
+# Milliseconds per step, median over trials; a full step name overrides its kind
+BUDGET_MS = {
+    'app_imports': 100,
+    'cold_start': 1000,
+    'first_visit': 200,
+    # Imports NumPy and evaluates a million-income sweep
+    'first_visit:Tax Rate Explorer': 600,
+    'rerun': 150,
+    'first_calculation': 1500,
+    'calculation_rerun': 250,
+}
+
+# Pages that must not import these; the calculator only loads them once results are shown
+NO_HEAVY_IMPORTS = ['app_imports', 'cold_start'] + [f'first_visit:{page}' for page in CHART_FREE_PAGES]
+
+
+def run_trial():
+    """Time one cold start in this (fresh) interpreter; returns {step: (ms, heavy modules loaded)}"""
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    elapsed = time.perf_counter() - start
+    preloaded = [name for name in HEAVY_MODULES if name in sys.modules]
+
+    def loaded():
+        return [name for name in HEAVY_MODULES if name in sys.modules and name not in preloaded]
+
+    steps = {'import_streamlit': (elapsed * 1000, preloaded)}
+
+    start = time.perf_counter()
+    import tax_engine
+    import tax_engine.instrumentation
+    import utils
+    steps['app_imports'] = ((time.perf_counter() - start) * 1000, loaded())
+
+    app = AppTest.from_file(os.path.join(ROOT, 'app.py'), default_timeout=60)
+    start = time.perf_counter()
+    app.run()
+    steps['cold_start'] = ((time.perf_counter() - start) * 1000, loaded())
+
+    for page in PAGES:
+        for step in ('first_visit', 'rerun'):
+            start = time.perf_counter()
+            app.sidebar.radio[0].set_value(page).run()
+            steps[f'{step}:{page}'] = ((time.perf_counter() - start) * 1000, loaded())
+
+    app.sidebar.radio[0].set_value("Tax Calculator").run()
+    app.number_input[0].set_value(2500000).run()
+    for step in ('first_calculation', 'calculation_rerun'):
+        start = time.perf_counter()
+        next(b for b in app.button if 'Calculate' in b.label).click().run()
+        steps[step] = ((time.perf_counter() - start) * 1000, loaded())
+
+    if app.exception:
+        raise RuntimeError(f"App raised: {app.exception}")
+    return steps
+
+
+def budget_for(step):
+    return BUDGET_MS.get(step, BUDGET_MS.get(step.split(':')[0]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--trials', type=int, default=5)
+    parser.add_argument('--json', help="Also write the medians and budgets to this JSON file")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, ROOT)
+        os.chdir(ROOT)
+        print(json.dumps(run_trial()))
+        return
+
+    trials = []
+    for _ in range(args.trials):
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child'],
+                                capture_output=True, text=True, check=True).stdout
+        trials.append(json.loads(output.strip().splitlines()[-1]))
+
+    failures = []
+    report = {}
+    print(f"{'step':<36}{'median ms':>10}{'budget':>8}  heavy modules loaded so far")
+    for step in trials[0]:
+        median = statistics.median(trial[step][0] for trial in trials)
+        modules = trials[0][step][1]
+        budget = budget_for(step)
+        report[step] = {'median_ms': median, 'budget_ms': budget, 'modules': modules}
+        flags = []
+        if budget is not None and median > budget:
+            flags.append('OVER BUDGET')
+        if step in NO_HEAVY_IMPORTS and set(modules) & {'pandas', 'plotly.express'}:
+            flags.append('UNEXPECTED IMPORTS')
+        if flags:
+            failures.append(step)
+        flag = ''.join(f'  {f}' for f in flags)
+        print(f"{step:<36}{median:>10.1f}{budget if budget is not None else '-':>8}  "
+              f"{', '.join(modules) or '-'}{flag}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'trials': args.trials, 'steps': report}, f, indent=2)
+    if failures:
+        print(f"{len(failures)} step(s) failed: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
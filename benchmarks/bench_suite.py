@@ -0,0 +1,275 @@
+# benchmarks/bench_suite.py
+"""Benchmark suite for the calculators, chart builders and the calculator page.
+
+Each case is timed with an automatically calibrated number of calls per
+round; the median over --repeat rounds is reported in microseconds per call.
+Results are compared against a baseline JSON file and any case slower than
+the baseline by more than --threshold is flagged as a regression, which also
+makes the script exit with status 1 so it can gate dependency upgrades.
+
+    python benchmarks/bench_suite.py --save            # record benchmarks/baseline.json
+    python benchmarks/bench_suite.py                   # compare against it
+    python benchmarks/bench_suite.py --only charts --json results.json
+
+Baselines are only comparable on the machine they were recorded on, so
+record one on the machine that runs the gate.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Callable, NamedTuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+DEFAULT_THRESHOLD = 0.25
+SAMPLE_SIZE = 200
+
+
+class Case(NamedTuple):
+    """A benchmark: setup() returns the function to time, which makes `calls` calls"""
+    name: str
+    setup: Callable
+    calls: int = 1
+    min_round: float = 0.2
+
+
+def _sample_inputs(seed=0):
+    rng = random.Random(seed)
+    quarters = ['Q1', 'Q2', 'Q3', 'Q4']
+    return [{
+        'annual_income': rng.randrange(0, 30000000),
+        'deductions': rng.randrange(0, 300000),
+        'ltcg': {q: rng.randrange(0, 200000) for q in quarters},
+        'stcg': {q: rng.randrange(0, 200000) for q in quarters},
+    } for _ in range(SAMPLE_SIZE)]
+
+
+def _regime_case(regime):
+    def setup():
+        from tax_engine import calculate_tax_new_regime, calculate_tax_old_regime
+
+        inputs = _sample_inputs()
+        if regime == 'new':
+            return lambda: [calculate_tax_new_regime(row['annual_income']) for row in inputs]
+        return lambda: [calculate_tax_old_regime(row['annual_income'], row['deductions']) for row in inputs]
+    return setup
+
+
+def _capital_gains_setup():
+    from tax_engine import calculate_capital_gains_tax
+
+    inputs = _sample_inputs()
+    return lambda: [calculate_capital_gains_tax(row['ltcg'], row['stcg']) for row in inputs]
+
+
+def _advance_tax_setup():
+    from tax_engine import calculate_advance_tax_schedule, calculate_capital_gains_tax
+
+    inputs = []
+    for row in _sample_inputs():
+        quarterly_tax = calculate_capital_gains_tax(row['ltcg'], row['stcg']).quarterly_tax
+        inputs.append((row['annual_income'] * 0.2, {q: tax.total for q, tax in quarterly_tax.items()}))
+    return lambda: [calculate_advance_tax_schedule(total_tax, cg_tax) for total_tax, cg_tax in inputs]
+
+
+def _chart_case(chart):
+    def setup():
+        import utils
+        from tax_engine import calculate_tax_new_regime, calculate_tax_old_regime
+
+        new_regime_tax = calculate_tax_new_regime(2500000).as_dict()
+        old_regime_tax = calculate_tax_old_regime(2500000, 250000).as_dict()
+        if chart == 'comparison':
+            return lambda: utils.create_tax_comparison_chart(new_regime_tax, old_regime_tax)
+        if chart == 'pie':
+            return lambda: utils.create_tax_breakdown_pie(new_regime_tax, 'New')
+        return lambda: utils.create_monthly_savings_chart(old_regime_tax['total_tax'] - new_regime_tax['total_tax'])
+    return setup
+
+
+def _page_case(warm):
+    def setup():
+        from streamlit.testing.v1 import AppTest
+
+        import utils
+        from tax_engine.reactive import GraphState
+
+        app = AppTest.from_file(os.path.join(ROOT, 'app.py'), default_timeout=60).run()
+        app.number_input[0].set_value(2500000).run()
+
+        def run():
+            if not warm:
+                app.session_state['calculator_graph'] = GraphState()
+                utils.FIGURE_CACHE.clear()
+            next(b for b in app.button if 'Calculate' in b.label).click().run()
+            if app.exception:
+                raise RuntimeError(f"Tax Calculator page failed: {app.exception}")
+        return run
+    return setup
+
+
+CASES = [
+    Case('regimes.new_regime', _regime_case('new'), calls=SAMPLE_SIZE),
+    Case('regimes.old_regime', _regime_case('old'), calls=SAMPLE_SIZE),
+    Case('capital_gains', _capital_gains_setup, calls=SAMPLE_SIZE),
+    Case('advance_tax', _advance_tax_setup, calls=SAMPLE_SIZE),
+    Case('charts.comparison', _chart_case('comparison')),
+    Case('charts.breakdown_pie', _chart_case('pie')),
+    Case('charts.monthly_savings', _chart_case('savings')),
+    Case('page.calculator_cold', _page_case(warm=False), min_round=0),
+    Case('page.calculator_warm', _page_case(warm=True), min_round=0),
+]
+
+
+def _time(func, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return time.perf_counter() - start
+
+
+def measure(case, repeat):
+    """Return (median, best) seconds per call over repeat calibrated rounds"""
+    func = case.setup()
+    func()
+
+    number = 1
+    while _time(func, number) < case.min_round:
+        number *= 2
+    rounds = [_time(func, number) / (number * case.calls) for _ in range(repeat)]
+    return statistics.median(rounds), min(rounds)
+
+
+def run_suite(cases, repeat, progress=None):
+    results = {}
+    for case in cases:
+        median, best = measure(case, repeat)
+        results[case.name] = {'seconds_per_call': median, 'best_seconds_per_call': best}
+        if progress is not None:
+            progress(case.name, results[case.name])
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return {name: (ratio, status)} against baseline seconds per call"""
+    comparison = {}
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            comparison[name] = (None, 'new')
+            continue
+        ratio = result['seconds_per_call'] / reference['seconds_per_call']
+        if ratio > 1 + threshold:
+            status = 'REGRESSION'
+        elif ratio < 1 / (1 + threshold):
+            status = 'faster'
+        else:
+            status = 'ok'
+        comparison[name] = (ratio, status)
+    return comparison
+
+
+def environment():
+    import numpy
+    import pandas
+    import plotly
+    import streamlit
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'numpy': numpy.__version__,
+        'pandas': pandas.__version__,
+        'plotly': plotly.__version__,
+        'streamlit': streamlit.__version__,
+    }
+
+
+def load_baseline(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _print_result(name, result):
+    print(f"  {name:<26}{result['seconds_per_call'] * 1e6:>14,.1f} µs/call", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON file (default: %(default)s)")
+    parser.add_argument('--save', action='store_true', help="Write the results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Flag cases this fraction slower than the baseline (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=7, help="Timed rounds per case (default: %(default)s)")
+    parser.add_argument('--only', action='append', default=[],
+                        help="Only run cases whose name contains this; may be repeated")
+    parser.add_argument('--json', help="Also write results and comparison to this JSON file")
+    args = parser.parse_args()
+
+    cases = [case for case in CASES if not args.only or any(part in case.name for part in args.only)]
+    if not cases:
+        parser.error(f"No cases match {args.only}; available: {', '.join(case.name for case in CASES)}")
+
+    print(f"Running {len(cases)} benchmarks", file=sys.stderr)
+    results = run_suite(cases, args.repeat, _print_result)
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment(),
+        'results': results,
+    }
+
+    exit_code = 0
+    baseline = None if args.save else load_baseline(args.baseline)
+    if baseline is not None:
+        comparison = compare(results, baseline['results'], args.threshold)
+        report['baseline'] = {'path': args.baseline, 'created': baseline['created'], 'threshold': args.threshold}
+        report['comparison'] = {name: {'ratio': ratio, 'status': status}
+                                for name, (ratio, status) in comparison.items()}
+        if baseline['environment'] != report['environment']:
+            print("Warning: baseline was recorded with a different environment:", file=sys.stderr)
+            for key, value in baseline['environment'].items():
+                if report['environment'].get(key) != value:
+                    print(f"  {key}: {value} -> {report['environment'].get(key)}", file=sys.stderr)
+
+        print(f"{'benchmark':<26}{'baseline µs':>14}{'current µs':>14}{'ratio':>8}  status")
+        for name, (ratio, status) in comparison.items():
+            reference = baseline['results'].get(name)
+            print(f"{name:<26}"
+                  f"{reference['seconds_per_call'] * 1e6 if reference else float('nan'):>14,.1f}"
+                  f"{results[name]['seconds_per_call'] * 1e6:>14,.1f}"
+                  f"{ratio if ratio is not None else float('nan'):>8.2f}  {status}")
+        regressions = [name for name, (_, status) in comparison.items() if status == 'REGRESSION']
+        if regressions:
+            print(f"{len(regressions)} regression(s) past {args.threshold:.0%}: {', '.join(regressions)}")
+            exit_code = 1
+    elif not args.save:
+        print(f"No baseline at {args.baseline}; run with --save to record one", file=sys.stderr)
+
+    if args.save:
+        previous = load_baseline(args.baseline)
+        if args.only and previous is not None:
+            # Re-recording a subset keeps the other cases' baselines
+            report['results'] = {**previous['results'], **results}
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline to {args.baseline}", file=sys.stderr)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
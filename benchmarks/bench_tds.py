@@ -0,0 +1,119 @@
+# benchmarks/bench_tds.py
+"""Time a year's payroll event replay through the incremental TDS engine.
+
+Generates a synthetic event log for --employees: an April salary for each,
+then mid-year joiners, salary revisions, bonuses and declarations with
+regime switches. Replays it with the per-event TdsEngine on a sample and
+with replay_tds_batch on everyone, checks the two agree on the sample, and
+times the full `tds` command path from CSV to CSV.
+
+    python benchmarks/bench_tds.py --employees 100000
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from tax_engine.streaming import replay_tds_file
+from tax_engine.tds import PayrollEvent, calendar_month, replay_events, replay_tds_batch
+
+FINANCIAL_YEAR = [calendar_month(i) for i in range(12)]
+
+
+def generate_events(employees, seed=0):
+    """A list of PayrollEvents in month order, a few per employee"""
+    rng = random.Random(seed)
+    by_month = [[] for _ in FINANCIAL_YEAR]
+    for i in range(employees):
+        employee_id = f'E{i:07d}'
+        joined = 0 if rng.random() < 0.9 else rng.randrange(1, 12)
+        salary = round(rng.lognormvariate(11.3, 0.7), -2)
+        by_month[joined].append(PayrollEvent(employee_id, FINANCIAL_YEAR[joined], 'salary', salary))
+        if rng.random() < 0.4:
+            by_month[joined].append(PayrollEvent(employee_id, FINANCIAL_YEAR[joined], 'declaration',
+                                                 rng.randrange(0, 400000, 1000), 'old'))
+        if rng.random() < 0.5:
+            month = rng.randrange(joined, 12)
+            by_month[month].append(PayrollEvent(employee_id, FINANCIAL_YEAR[month], 'salary',
+                                                round(salary * rng.uniform(1.05, 1.3), -2)))
+        for _ in range(rng.choice((0, 0, 1, 2))):
+            month = rng.randrange(joined, 12)
+            by_month[month].append(PayrollEvent(employee_id, FINANCIAL_YEAR[month], 'bonus',
+                                                round(salary * rng.uniform(0.5, 3), -2)))
+        if rng.random() < 0.2:
+            month = rng.randrange(joined, 12)
+            by_month[month].append(PayrollEvent(employee_id, FINANCIAL_YEAR[month], 'declaration',
+                                                rng.randrange(0, 400000, 1000), rng.choice(('old', 'new', None))))
+    return [event for month_events in by_month for event in month_events]
+
+
+def as_arrays(events):
+    codes = {}
+    employee = np.array([codes.setdefault(event.employee_id, len(codes)) for event in events])
+    return codes, {
+        'employee': employee,
+        'month': np.array([event.month for event in events]),
+        'kind': np.array([event.kind for event in events]),
+        'amount': np.array([event.amount for event in events]),
+        'regime': np.array([event.regime or '' for event in events]),
+        'employees': len(codes),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--employees', type=int, default=100000)
+    parser.add_argument('--sample', type=int, default=20000,
+                        help="Employees replayed event by event for the scalar comparison (default: %(default)s)")
+    args = parser.parse_args()
+
+    events = generate_events(args.employees)
+    codes, arrays = as_arrays(events)
+    print(f"{len(events):,} events for {args.employees:,} employees")
+
+    start = time.perf_counter()
+    result = replay_tds_batch(**arrays)
+    batch_seconds = time.perf_counter() - start
+
+    sample_ids = set(list(codes)[:args.sample])
+    sample = [event for event in events if event.employee_id in sample_ids]
+    start = time.perf_counter()
+    schedules = replay_events(sample)
+    scalar_seconds = time.perf_counter() - start
+    mismatches = sum(
+        [month.tds for month in schedule] != result['tds'][codes[employee_id]].tolist()
+        for employee_id, schedule in schedules.items()
+    )
+    if mismatches:
+        raise SystemExit(f"replay_tds_batch differs from TdsEngine for {mismatches:,} employees")
+    # A declaration that lowers tax late in the year can leave TDS above it, never below
+    shortfall = result['projected_tax'] - result['tds_to_date']
+    if shortfall.max() > 0.5:
+        raise SystemExit(f"TDS for the year falls short of the tax by up to ₹{shortfall.max():,.2f}")
+    print(f"over-deducted for {(shortfall < -0.5).mean():.1%} of employees, left for refund")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        events_path = os.path.join(tmp, 'events.csv')
+        with open(events_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['employee_id', 'month', 'kind', 'amount', 'regime'])
+            writer.writerows((event.employee_id, event.month, event.kind, event.amount, event.regime or '')
+                             for event in events)
+        stats = replay_tds_file(events_path, os.path.join(tmp, 'tds.csv'))
+
+    per_event = scalar_seconds / len(sample) * 1e6
+    print(f"TdsEngine, {len(schedules):,} employees: {scalar_seconds:.2f}s ({per_event:.1f} µs per event "
+          f"incl. monthly closes)")
+    print(f"replay_tds_batch, {args.employees:,} employees: {batch_seconds:.2f}s")
+    print(f"tds command, CSV to CSV: {stats['seconds']:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
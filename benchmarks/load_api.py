@@ -0,0 +1,126 @@
+# benchmarks/load_api.py
+"""Load generator for the JSON tax API (python -m tax_engine serve).
+
+Opens --concurrency keep-alive connections, each sending requests back to
+back across the three endpoints with random payloads, and reports the
+client-side throughput and p50/p99 latency next to the server's own /stats.
+Without --url a server is started in-process on a free port.
+
+    python benchmarks/load_api.py --requests 20000 --concurrency 64
+    python benchmarks/load_api.py --url http://127.0.0.1:8765 --endpoint /regimes
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tax_engine.server import DEFAULT_BATCH_WINDOW, TaxAPIServer
+
+QUARTERS = ['Q1', 'Q2', 'Q3', 'Q4']
+
+
+def random_payload(endpoint, rng):
+    gains = lambda: {q: rng.randrange(0, 200000) for q in QUARTERS}
+    if endpoint == '/regimes':
+        return {'annual_income': rng.randrange(0, 30000000), 'deductions': rng.randrange(0, 300000),
+                'ltcg_by_quarter': gains(), 'stcg_by_quarter': gains()}
+    if endpoint == '/capital-gains':
+        return {'ltcg_by_quarter': gains(), 'stcg_by_quarter': gains()}
+    return {'total_tax': rng.randrange(0, 5000000), 'cg_tax_by_quarter': gains(),
+            'payments_by_quarter': {q: rng.randrange(0, 500000) for q in QUARTERS}}
+
+
+async def request(reader, writer, host, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def client(host, port, endpoints, count, seed, latencies, failures):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(count):
+            endpoint = rng.choice(endpoints)
+            start = time.perf_counter()
+            status, _ = await request(reader, writer, host, 'POST', endpoint, random_payload(endpoint, rng))
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                failures.append(status)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run(args):
+    server = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        host = '127.0.0.1'
+        server = await TaxAPIServer(args.batch_window_ms / 1000).start(host, 0)
+        port = server.sockets[0].getsockname()[1]
+
+    endpoints = [args.endpoint] if args.endpoint else ['/regimes', '/capital-gains', '/advance-tax']
+    per_client = [args.requests // args.concurrency + (i < args.requests % args.concurrency)
+                  for i in range(args.concurrency)]
+    latencies, failures = [], []
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, endpoints, count, i, latencies, failures)
+                           for i, count in enumerate(per_client) if count))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    _, server_stats = await request(reader, writer, host, 'GET', '/stats')
+    writer.close()
+    await writer.wait_closed()
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+
+    latencies = np.array(latencies) * 1000
+    print(f"{len(latencies):,} requests over {args.concurrency} connections in {elapsed:.2f}s, "
+          f"{len(failures)} failed")
+    print(f"client: {len(latencies) / elapsed:,.0f} req/sec, "
+          f"p50 {np.percentile(latencies, 50):.2f} ms, p99 {np.percentile(latencies, 99):.2f} ms")
+    print(f"server: {server_stats['throughput_rps']:,.0f} req/sec since start, "
+          f"p50 {server_stats['latency_p50_ms']:.2f} ms, p99 {server_stats['latency_p99_ms']:.2f} ms, "
+          f"mean batch {server_stats['mean_batch_size']:.1f} requests")
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help="Server to load (default: start one in-process)")
+    parser.add_argument('--endpoint', choices=['/regimes', '/capital-gains', '/advance-tax'],
+                        help="Only hit this endpoint (default: a random mix)")
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--batch-window-ms', type=float, default=DEFAULT_BATCH_WINDOW * 1000,
+                        help="Batch window of the in-process server (default: %(default)s)")
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == '__main__':
+    main()
@@ -26,22 +26,30 @@ OLD_REGIME_SLABS = [
 ]
 
 # Surcharge Slabs
+# Marginal relief applies above each limit (see tax_engine.piecewise)
 SURCHARGE_SLABS = {
     "new_regime": [
-        {"limit": 50000000, "rate": 0.25},  # > 5 crore
-        {"limit": 20000000, "rate": 0.15},  # > 2 crore
-        {"limit": 10000000, "rate": 0.10},  # > 1 crore
+        {"limit": 20000000, "rate": 0.25},  # > 2 crore (capped at 25%)
+        {"limit": 10000000, "rate": 0.15},  # > 1 crore
+        {"limit": 5000000, "rate": 0.10},   # > 50 lakh
     ],
     "old_regime": [
         {"limit": 50000000, "rate": 0.37},  # > 5 crore
         {"limit": 20000000, "rate": 0.25},  # > 2 crore
         {"limit": 10000000, "rate": 0.15},  # > 1 crore
+        {"limit": 5000000, "rate": 0.10},   # > 50 lakh
     ]
 }
 
 # Cess Rate
 CESS_RATE = 0.04
 
+# Capital Gains
+LTCG_EXEMPTION = 125000  # Annual exemption on long term gains
+LTCG_RATE = 0.125
+STCG_RATE = 0.20
+LTCG_HOLDING_MONTHS = 12  # Listed equity held longer than this is long term
+
 # Deduction Limits
 DEDUCTION_LIMITS = {
     "80C": 150000,
@@ -62,4 +70,85 @@ TAX_DATES = {
     ],
     "filing_deadline": "31 Jul 2025",
     "audit_deadline": "30 Sep 2024"
+}
+
+# Interest on Advance Tax Shortfalls (Sections 234B and 234C)
+ADVANCE_TAX_INTEREST = {
+    "rate_per_month": 0.01,
+    "min_liability": 10000,               # No advance tax (or 234C interest) below this
+    "months_234c": [3, 3, 3, 1],          # Months charged per installment shortfall
+    "relief_percentage_234c": [12, 36, None, None],  # Paying this much avoids Q1/Q2 interest
+    "min_paid_percentage_234b": 90,
+    "rounding": 100                       # Shortfalls are rounded down to multiples of this
+}
+
+# Rules per Assessment Year
+# Each entry is validated and compiled by tax_engine.rules into immutable lookup
+# tables. Edits to this file are picked up by running apps and workers within
+# a few seconds, without a restart; an edit that fails validation is logged
+# and ignored.
+RULE_SETS = {
+    "2024-25": {
+        "financial_year": "2023-24",
+        "standard_deduction": 50000,
+        "new_regime_slabs": NEW_REGIME_SLABS,
+        "old_regime_slabs": OLD_REGIME_SLABS,
+        "surcharge_slabs": SURCHARGE_SLABS,
+        "cess_rate": CESS_RATE,
+        "ltcg_exemption": 100000,
+        "ltcg_rate": 0.10,
+        "stcg_rate": 0.15,
+        "ltcg_holding_months": LTCG_HOLDING_MONTHS,
+        "advance_tax": [
+            {"date": "15 Jun 2023", "percentage": 15},
+            {"date": "15 Sep 2023", "percentage": 45},
+            {"date": "15 Dec 2023", "percentage": 75},
+            {"date": "15 Mar 2024", "percentage": 100}
+        ],
+        "filing_deadline": "31 Jul 2024",
+        "deduction_limits": DEDUCTION_LIMITS
+    },
+    "2025-26": {
+        "financial_year": CURRENT_FY,
+        "standard_deduction": STANDARD_DEDUCTION,
+        "new_regime_slabs": NEW_REGIME_SLABS,
+        "old_regime_slabs": OLD_REGIME_SLABS,
+        "surcharge_slabs": SURCHARGE_SLABS,
+        "cess_rate": CESS_RATE,
+        "ltcg_exemption": LTCG_EXEMPTION,
+        "ltcg_rate": LTCG_RATE,
+        "stcg_rate": STCG_RATE,
+        "ltcg_holding_months": LTCG_HOLDING_MONTHS,
+        "advance_tax": TAX_DATES["advance_tax"],
+        "filing_deadline": TAX_DATES["filing_deadline"],
+        "deduction_limits": DEDUCTION_LIMITS
+    },
+    "2026-27": {
+        "financial_year": "2025-26",
+        "standard_deduction": 75000,
+        "new_regime_slabs": [
+            {"limit": 400000, "rate": 0},
+            {"limit": 800000, "rate": 0.05},
+            {"limit": 1200000, "rate": 0.10},
+            {"limit": 1600000, "rate": 0.15},
+            {"limit": 2000000, "rate": 0.20},
+            {"limit": 2400000, "rate": 0.25},
+            {"limit": float('inf'), "rate": 0.30}
+        ],
+        "old_regime_slabs": OLD_REGIME_SLABS,
+        "surcharge_slabs": SURCHARGE_SLABS,
+        "cess_rate": CESS_RATE,
+        "ltcg_exemption": LTCG_EXEMPTION,
+        "ltcg_rate": LTCG_RATE,
+        "stcg_rate": STCG_RATE,
+        "ltcg_holding_months": LTCG_HOLDING_MONTHS,
+        "advance_tax": [
+            {"date": "15 Jun 2025", "percentage": 15},
+            {"date": "15 Sep 2025", "percentage": 45},
+            {"date": "15 Dec 2025", "percentage": 75},
+            {"date": "15 Mar 2026", "percentage": 100}
+        ],
+        "filing_deadline": "31 Jul 2026",
+        "deduction_limits": DEDUCTION_LIMITS
+    }
 }
\ No newline at end of file
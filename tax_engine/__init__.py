@@ -0,0 +1,61 @@
+# tax_engine/__init__.py
+"""Headless tax calculation core.
+
+Depends only on the standard library, so it can be imported from services
+and worker processes without pulling in streamlit, pandas or plotly. The
+vectorized calculators need NumPy: the regime and capital gains ones live in
+tax_engine.batch, which you import explicitly when you need it, and the
+paise, planner, TDS and advance tax ones sit next to their scalar versions
+and import NumPy only when called.
+"""
+from tax_engine.rules import DEFAULT_ASSESSMENT_YEAR, RULE_SETS, default_assessment_year, get_rule_set, reload_rules
+from tax_engine.regimes import calculate_tax_new_regime, calculate_tax_old_regime
+from tax_engine.capital_gains import calculate_capital_gains_tax
+from tax_engine.advance_tax import calculate_advance_tax_schedule, installment_windows
+from tax_engine.breakeven import break_even_deduction
+from tax_engine.planner import optimize_deductions
+from tax_engine.tds import PayrollEvent, TdsEngine, replay_events
+from tax_engine.cache import LRUCache
+from tax_engine.store import ResultStore
+from tax_engine.results import (
+    CapitalGainsTax,
+    DeductionPlan,
+    InstallmentDue,
+    MonthlyTds,
+    QuarterlyCapitalGainsTax,
+    TaxBreakdown,
+)
+from tax_engine.tradebook import calculate_tradebook_tax, match_trades, read_tradebook
+from tax_engine.summary import RESULT_CACHE, calculate_tax_summary, cached_tax_summary
+
+__all__ = [
+    'DEFAULT_ASSESSMENT_YEAR',
+    'RULE_SETS',
+    'default_assessment_year',
+    'get_rule_set',
+    'reload_rules',
+    'calculate_tax_new_regime',
+    'calculate_tax_old_regime',
+    'calculate_capital_gains_tax',
+    'calculate_advance_tax_schedule',
+    'installment_windows',
+    'break_even_deduction',
+    'optimize_deductions',
+    'PayrollEvent',
+    'TdsEngine',
+    'replay_events',
+    'LRUCache',
+    'ResultStore',
+    'TaxBreakdown',
+    'CapitalGainsTax',
+    'QuarterlyCapitalGainsTax',
+    'InstallmentDue',
+    'DeductionPlan',
+    'MonthlyTds',
+    'RESULT_CACHE',
+    'calculate_tax_summary',
+    'cached_tax_summary',
+    'calculate_tradebook_tax',
+    'match_trades',
+    'read_tradebook',
+]
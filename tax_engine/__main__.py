@@ -0,0 +1,4 @@
+# tax_engine/__main__.py
+from tax_engine.cli import main
+
+main()
@@ -0,0 +1,130 @@
+# tax_engine/advance_tax.py
+# NumPy is imported inside calculate_advance_tax_schedule_batch, so importing
+# this module (and tax_engine) stays free of third-party packages
+from datetime import date, timedelta
+
+from tax_engine.results import InstallmentDue
+from tax_engine.rules import financial_year_start, get_rule_set
+
+
+def calculate_advance_tax_schedule(total_tax, cg_tax_by_quarter, assessment_year=None):
+    """Calculate quarterly advance tax requirements"""
+    quarters = get_rule_set(assessment_year).advance_tax
+    
+    regular_tax = total_tax - sum(cg_tax_by_quarter.values())
+    cumulative_tax = 0
+    schedule = []
+    prev_percentage = 0
+    
+    for q, due_date, percentage, _ in quarters:
+        # Calculate regular tax for this installment
+        regular_tax_due = (regular_tax * percentage / 100) - cumulative_tax
+        
+        # Add capital gains tax for this quarter
+        cg_tax_due = cg_tax_by_quarter.get(q, 0)
+        
+        total_due = regular_tax_due + cg_tax_due
+        cumulative_tax += regular_tax_due
+        
+        schedule.append(InstallmentDue(
+            due_date, percentage, percentage - prev_percentage, regular_tax_due, cg_tax_due, total_due
+        ))
+        prev_percentage = percentage
+    
+    return schedule
+
+
+def _day(day):
+    return f"{day.day} {day:%b}"
+
+
+def installment_windows(assessment_year=None):
+    """Label each installment by the sale dates whose gains it pays, e.g. {'Q2': 'Q2 (16 Jun - 15 Sep)'}
+
+    Capital gains go into the first installment due on or after the sale, as
+    the tradebook import buckets them; the last window runs to 31 March.
+    """
+    rules = get_rule_set(assessment_year)
+    year_end = date(financial_year_start(rules).year + 1, 3, 31)
+    labels, start = {}, None
+    for i, installment in enumerate(rules.advance_tax):
+        end = year_end if i == len(rules.advance_tax) - 1 else installment.due
+        window = f"up to {_day(end)}" if start is None else f"{_day(start)} - {_day(end)}"
+        labels[installment.quarter] = f"{installment.quarter} ({window})"
+        start = end + timedelta(days=1)
+    return labels
+
+
+def calculate_advance_tax_schedule_batch(total_tax, cg_tax_by_quarter, payments=None, assessment_year=None,
+                                         months_234b=None):
+    """Vectorized advance tax schedule with Section 234C and 234B interest
+
+    total_tax is an (n,) array, cg_tax_by_quarter and payments (n, 4) arrays of
+    capital gains tax arising and advance tax paid in each installment window.
+    Installments match calculate_advance_tax_schedule. Interest follows the
+    RuleSet's interest rules (tax_config.ADVANCE_TAX_INTEREST): 234C on each installment's
+    cumulative shortfall, 234B on the whole shortfall when less than 90% was
+    paid, for months_234b months (default: April to the filing deadline).
+    Returns a dict of columns rather than per-row dicts.
+    """
+    import numpy as np
+
+    rules = get_rule_set(assessment_year)
+    interest = rules.interest
+    total_tax = np.asarray(total_tax, dtype=np.float64)
+    cg_tax_by_quarter = np.asarray(cg_tax_by_quarter, dtype=np.float64)
+    n, quarters = cg_tax_by_quarter.shape
+    payments = np.zeros((n, quarters)) if payments is None else np.asarray(payments, dtype=np.float64)
+
+    # Same order of operations as the scalar schedule
+    cg_total = np.zeros(n)
+    for q in range(quarters):
+        cg_total = cg_total + cg_tax_by_quarter[:, q]
+    regular_tax = total_tax - cg_total
+
+    regular_due = np.empty((n, quarters))
+    cumulative_tax = np.zeros(n)
+    for q, installment in enumerate(rules.advance_tax):
+        regular_due[:, q] = (regular_tax * installment.percentage / 100) - cumulative_tax
+        cumulative_tax = cumulative_tax + regular_due[:, q]
+    installment_due = regular_due + cg_tax_by_quarter
+
+    cumulative_due = np.cumsum(installment_due, axis=1)
+    cumulative_paid = np.cumsum(payments, axis=1)
+    shortfall = np.maximum(0.0, cumulative_due - cumulative_paid)
+    liable = total_tax >= interest.min_liability
+
+    # 234C: no interest for an early installment if enough of it was paid
+    relief_fraction = np.array([
+        relief / installment.percentage if relief is not None else 1.0
+        for relief, installment in zip(interest.relief_percentage_234c, rules.advance_tax)
+    ])
+    relieved = cumulative_paid >= cumulative_due * relief_fraction
+    rounded_shortfall = np.floor(shortfall / interest.rounding) * interest.rounding
+    interest_234c = np.where(
+        relieved | ~liable[:, None],
+        0.0,
+        rounded_shortfall * interest.rate_per_month * np.array(interest.months_234c, dtype=np.float64)
+    )
+
+    # 234B: on the whole unpaid tax when less than 90% was paid in advance
+    if months_234b is None:
+        year_end = financial_year_start(rules).year + 1
+        months_234b = (rules.filing_deadline.year - year_end) * 12 + rules.filing_deadline.month - 3
+    paid = cumulative_paid[:, -1]
+    unpaid = np.floor(np.maximum(0.0, total_tax - paid) / interest.rounding) * interest.rounding
+    short_paid = paid < total_tax * interest.min_paid_percentage_234b / 100
+    interest_234b = np.where(liable & short_paid, unpaid * interest.rate_per_month * months_234b, 0.0)
+
+    return {
+        'regular_tax': regular_due,
+        'capital_gains_tax': cg_tax_by_quarter,
+        'total_amount': installment_due,
+        'cumulative_due': cumulative_due,
+        'cumulative_paid': cumulative_paid,
+        'shortfall': shortfall,
+        'interest_234c': interest_234c,
+        'interest_234c_total': interest_234c.sum(axis=1),
+        'interest_234b': interest_234b,
+        'total_interest': interest_234c.sum(axis=1) + interest_234b
+    }
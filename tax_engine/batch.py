@@ -0,0 +1,162 @@
+# tax_engine/batch.py
+import numpy as np
+
+from tax_engine.breakeven import get_break_even_curve
+from tax_engine.results import TaxBreakdown
+from tax_engine.rules import derived_table, get_rule_set
+
+
+def _as_arrays(table):
+    return table._replace(**{field: np.array(getattr(table, field), dtype=np.float64) for field in table._fields})
+
+
+def compile_batch_rules(rules):
+    """Return a copy of a RuleSet with its lookup tables as NumPy arrays"""
+    return rules._replace(
+        new_regime=_as_arrays(rules.new_regime),
+        old_regime=_as_arrays(rules.old_regime),
+        new_surcharge=_as_arrays(rules.new_surcharge),
+        old_surcharge=_as_arrays(rules.old_surcharge),
+        new_tax=rules.new_tax._make(_as_arrays(component) for component in rules.new_tax),
+        old_tax=rules.old_tax._make(_as_arrays(component) for component in rules.old_tax)
+    )
+
+
+_batch_rule_set = derived_table(compile_batch_rules)
+
+_batch_break_even_curve = derived_table(lambda rules: _as_arrays(get_break_even_curve(rules)))
+
+
+def get_batch_rule_set(assessment_year=None):
+    return _batch_rule_set(get_rule_set(assessment_year))
+
+
+def break_even_deduction_batch(annual_income, assessment_year=None):
+    """Vectorized equivalent of tax_engine.breakeven.break_even_deduction"""
+    curve = _batch_break_even_curve(get_rule_set(assessment_year))
+    annual_income = np.asarray(annual_income, dtype=np.float64)
+    i = np.searchsorted(curve.breakpoints, annual_income, side='left')
+    return np.maximum(0.0, curve.intercepts[i] + curve.slopes[i] * annual_income)
+
+
+def calculate_tax_batch(taxable_income, regime_function):
+    """Calculate base tax, surcharge and cess for an array of taxable incomes
+
+    Slabs, surcharge with marginal relief and cess are all folded into the
+    piecewise-linear regime_function, so this is one searchsorted and a
+    multiply-add per component.
+    """
+    taxable_income = np.asarray(taxable_income, dtype=np.float64)
+
+    # Intervals are upper-inclusive, so side='left' puts a breakpoint in the lower one
+    i = np.searchsorted(regime_function.total.breakpoints, taxable_income, side='left')
+    tax, surcharge, cess, total_tax = (
+        component.intercepts[i] + component.slopes[i] * taxable_income
+        for component in regime_function
+    )
+
+    return {
+        'base_tax': tax,
+        'surcharge': surcharge,
+        'cess': cess,
+        'total_tax': total_tax,
+        'taxable_income': taxable_income
+    }
+
+
+def as_structured_array(columns, fields=None):
+    """Pack a column bundle of (n,) arrays into one NumPy structured array
+
+    fields picks and orders the columns (default: all of them). The result is
+    a single contiguous buffer, e.g. 40 bytes per row for a TaxBreakdown.
+    """
+    fields = list(columns) if fields is None else list(fields)
+    packed = np.empty(len(columns[fields[0]]), dtype=[(name, np.asarray(columns[name]).dtype) for name in fields])
+    for name in fields:
+        packed[name] = columns[name]
+    return packed
+
+
+def record_at(columns, i, record_type=TaxBreakdown):
+    """Row i of a column bundle (or structured array) as a scalar result record"""
+    return record_type._make(columns[name][i].item() for name in record_type._fields)
+
+
+def calculate_tax_new_regime_batch(annual_income, assessment_year=None):
+    """Vectorized equivalent of calculate_tax_new_regime"""
+    rules = get_batch_rule_set(assessment_year)
+    taxable_income = np.asarray(annual_income, dtype=np.float64) - rules.standard_deduction
+    return calculate_tax_batch(taxable_income, rules.new_tax)
+
+
+def calculate_tax_old_regime_batch(annual_income, deductions, assessment_year=None):
+    """Vectorized equivalent of calculate_tax_old_regime"""
+    rules = get_batch_rule_set(assessment_year)
+    taxable_income = np.asarray(annual_income, dtype=np.float64) - np.asarray(deductions, dtype=np.float64)
+    return calculate_tax_batch(taxable_income, rules.old_tax)
+
+
+def calculate_capital_gains_tax_batch(ltcg_by_quarter, stcg_by_quarter, assessment_year=None):
+    """Vectorized equivalent of calculate_capital_gains_tax
+
+    Takes (n, 4) arrays of quarterly LTCG and STCG and returns annual totals
+    plus (n, 4) arrays of quarter-wise tax.
+    """
+    ltcg_by_quarter = np.asarray(ltcg_by_quarter, dtype=np.float64)
+    stcg_by_quarter = np.asarray(stcg_by_quarter, dtype=np.float64)
+    rules = get_rule_set(assessment_year)
+
+    # Sum quarter by quarter so the rounding matches the scalar sum()
+    total_ltcg = np.zeros(ltcg_by_quarter.shape[0])
+    total_stcg = np.zeros(stcg_by_quarter.shape[0])
+    for q in range(ltcg_by_quarter.shape[1]):
+        total_ltcg = total_ltcg + ltcg_by_quarter[:, q]
+        total_stcg = total_stcg + stcg_by_quarter[:, q]
+
+    # LTCG is taxed above the annual exemption, STCG in full
+    ltcg_exemption = rules.ltcg_exemption
+    taxable_ltcg = np.maximum(0, total_ltcg - ltcg_exemption)
+    ltcg_tax = taxable_ltcg * rules.ltcg_rate
+
+    stcg_tax = total_stcg * rules.stcg_rate
+
+    # Quarter-wise LTCG tax is pro-rated by each quarter's share of the gains
+    taxable = total_ltcg > ltcg_exemption
+    safe_total = np.where(taxable, total_ltcg, 1.0)
+    quarter_ltcg_tax = np.where(taxable[:, None], (ltcg_by_quarter / safe_total[:, None]) * ltcg_tax[:, None], 0.0)
+    quarter_stcg_tax = stcg_by_quarter * rules.stcg_rate
+
+    return {
+        'ltcg_tax': ltcg_tax,
+        'stcg_tax': stcg_tax,
+        'total_cg_tax': ltcg_tax + stcg_tax,
+        'taxable_ltcg': taxable_ltcg,
+        'quarterly_ltcg_tax': quarter_ltcg_tax,
+        'quarterly_stcg_tax': quarter_stcg_tax,
+        'quarterly_tax': quarter_ltcg_tax + quarter_stcg_tax
+    }
+
+
+def compare_regimes_batch(annual_income, deductions, ltcg_by_quarter, stcg_by_quarter, assessment_year=None):
+    """Calculate both regimes and capital gains tax and pick the cheaper regime
+
+    Mirrors the Tax Calculator page: capital gains tax is added to each
+    regime's total and the new regime is recommended only when it is strictly
+    cheaper.
+    """
+    new_regime_tax = calculate_tax_new_regime_batch(annual_income, assessment_year)
+    old_regime_tax = calculate_tax_old_regime_batch(annual_income, deductions, assessment_year)
+    cg_tax = calculate_capital_gains_tax_batch(ltcg_by_quarter, stcg_by_quarter, assessment_year)
+
+    new_regime_tax['total_tax'] = new_regime_tax['total_tax'] + cg_tax['total_cg_tax']
+    old_regime_tax['total_tax'] = old_regime_tax['total_tax'] + cg_tax['total_cg_tax']
+
+    new_is_cheaper = new_regime_tax['total_tax'] < old_regime_tax['total_tax']
+    return {
+        'new_regime': new_regime_tax,
+        'old_regime': old_regime_tax,
+        'capital_gains': cg_tax,
+        'recommended_regime': np.where(new_is_cheaper, 'new', 'old'),
+        'tax_saving': np.abs(new_regime_tax['total_tax'] - old_regime_tax['total_tax']),
+        'break_even_deduction': break_even_deduction_batch(annual_income, assessment_year)
+    }
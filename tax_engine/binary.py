@@ -0,0 +1,195 @@
+# tax_engine/binary.py
+"""Fixed-width binary record files for very large batch runs.
+
+A .taxbin file is a HEADER_SIZE-byte header followed by rows of one NumPy
+structured dtype, with no delimiters and no padding between them. The header
+is the magic bytes and a JSON object naming the kind of file ('input' or
+'output'), its fields and its row count, padded with spaces. Because the
+records start at a page boundary, the file can be memory-mapped as a
+structured array and each field used in place: the calculators read it
+through strided views and write their results straight into an output file
+mapped the same way. Nothing is parsed, so a rerun over the same population
+is bound by how fast the disk reads the file.
+
+Input rows are INPUT_DTYPE: income, deductions and age plus LTCG and STCG
+per quarter; age is carried for the planner and ignored by the batch run.
+Output rows are OUTPUT_DTYPE, one per input row in the same order: the batch
+RESULT_COLUMNS as float64, with recommended_regime 1.0 for new and 0.0 for
+old as in the result store. convert_to_binary builds an input file from CSV
+or Parquet, and read_records turns a file back into columns.
+"""
+import json
+import os
+import time
+
+import numpy as np
+
+from tax_engine.rules import get_rule_set
+from tax_engine.streaming import (
+    DEFAULT_CHUNK_SIZE,
+    QUARTERS,
+    STORED_COLUMNS,
+    compute_result_columns,
+    iter_payloads,
+    numeric_column,
+    parse_csv_records,
+)
+
+MAGIC = b'TAXBIN\x00\x01'
+HEADER_SIZE = 4096
+FORMAT_VERSION = 1
+EXTENSION = '.taxbin'
+
+INPUT_DTYPE = np.dtype([
+    ('annual_income', '<f8'),
+    ('deductions', '<f8'),
+    ('age', '<i8'),
+    ('ltcg', '<f8', (len(QUARTERS),)),
+    ('stcg', '<f8', (len(QUARTERS),)),
+])
+
+OUTPUT_DTYPE = np.dtype([(name, '<f8') for name in STORED_COLUMNS])
+
+_DTYPES = {'input': INPUT_DTYPE, 'output': OUTPUT_DTYPE}
+
+
+def is_binary(path):
+    return os.path.splitext(path)[1].lower() == EXTENSION
+
+
+def _header_bytes(header):
+    encoded = MAGIC + json.dumps(header, sort_keys=True).encode('utf-8')
+    if len(encoded) > HEADER_SIZE - 1:
+        raise ValueError("Binary file header is too long")
+    return encoded.ljust(HEADER_SIZE - 1, b' ') + b'\n'
+
+
+def _write_header(f, kind, rows, **extra):
+    f.seek(0)
+    f.write(_header_bytes(dict(extra, format_version=FORMAT_VERSION, kind=kind, rows=rows,
+                               fields=_DTYPES[kind].descr)))
+
+
+def read_header(path):
+    """The JSON header of a .taxbin file, checked against this version of the format"""
+    with open(path, 'rb') as f:
+        block = f.read(HEADER_SIZE)
+    if len(block) != HEADER_SIZE or not block.startswith(MAGIC):
+        raise ValueError(f"{path} is not a {EXTENSION} file")
+    header = json.loads(block[len(MAGIC):])
+    if header.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"{path} has format version {header.get('format_version')}; expected {FORMAT_VERSION}")
+    expected = json.loads(json.dumps(_DTYPES[header['kind']].descr))
+    if header['fields'] != expected:
+        raise ValueError(f"{path} has fields {header['fields']}; expected {expected}")
+    return header
+
+
+def open_records(path, kind, mode='r'):
+    """Memory-map a .taxbin file of the given kind as a structured array; returns (header, records)"""
+    header = read_header(path)
+    if header['kind'] != kind:
+        raise ValueError(f"{path} holds {header['kind']} records, not {kind}")
+    expected_size = HEADER_SIZE + header['rows'] * _DTYPES[kind].itemsize
+    if os.path.getsize(path) != expected_size:
+        raise ValueError(f"{path} is {os.path.getsize(path):,} bytes; its header implies {expected_size:,}")
+    if not header['rows']:
+        return header, np.empty(0, dtype=_DTYPES[kind])
+    return header, np.memmap(path, dtype=_DTYPES[kind], mode=mode, offset=HEADER_SIZE, shape=(header['rows'],))
+
+
+def create_records(path, kind, rows, **extra):
+    """Create a .taxbin file of rows zeroed records and memory-map it for writing"""
+    with open(path, 'wb') as f:
+        _write_header(f, kind, rows, **extra)
+        f.truncate(HEADER_SIZE + rows * _DTYPES[kind].itemsize)
+    if not rows:
+        return np.empty(0, dtype=_DTYPES[kind])
+    return np.memmap(path, dtype=_DTYPES[kind], mode='r+', offset=HEADER_SIZE, shape=(rows,))
+
+
+def convert_to_binary(input_path, output_path, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """Write a CSV or Parquet payroll file as a .taxbin input file
+
+    Reads the columns the batch command does, plus age; missing columns are
+    zero. Rows keep their order, so output row i of a batch run over the
+    file belongs to input row i.
+    """
+    start = time.perf_counter()
+    rows = 0
+    with open(output_path + '.tmp', 'wb') as f:
+        _write_header(f, 'input', 0)
+        for payload in iter_payloads(input_path, chunk_size, 0):
+            columns = parse_csv_records(*payload) if isinstance(payload, tuple) else payload
+            size = len(columns['annual_income'])
+            records = np.empty(size, dtype=INPUT_DTYPE)
+            records['annual_income'] = numeric_column(columns, 'annual_income', size)
+            records['deductions'] = numeric_column(columns, 'deductions', size)
+            records['age'] = numeric_column(columns, 'age', size)
+            for i, q in enumerate(QUARTERS):
+                records['ltcg'][:, i] = numeric_column(columns, f'ltcg_{q}', size)
+                records['stcg'][:, i] = numeric_column(columns, f'stcg_{q}', size)
+            f.write(records.tobytes())
+            rows += size
+            if progress is not None:
+                progress({'rows': rows, 'seconds': time.perf_counter() - start})
+        _write_header(f, 'input', rows, source=os.path.basename(input_path))
+    os.replace(output_path + '.tmp', output_path)
+    return {'rows': rows, 'seconds': time.perf_counter() - start}
+
+
+def process_binary(input_path, output_path, chunk_size=DEFAULT_CHUNK_SIZE, progress=None, assessment_year=None,
+                   exact=False):
+    """Compute the batch results for a .taxbin input file into a .taxbin output file
+
+    Both files are memory-mapped; each chunk of input rows is read in place
+    and its results are written straight into the output mapping. exact=True
+    computes in integer paise as process_file does.
+    """
+    rules = get_rule_set(assessment_year)
+    header, records = open_records(input_path, 'input')
+    rows = header['rows']
+    output = create_records(output_path, 'output', rows, assessment_year=rules.assessment_year,
+                            rule_version=rules.version, exact=exact)
+
+    start = time.perf_counter()
+    chunks = 0
+    for begin in range(0, rows, chunk_size):
+        chunk = records[begin:begin + chunk_size]
+        results = compute_result_columns(chunk['annual_income'], chunk['deductions'], chunk['ltcg'], chunk['stcg'],
+                                         rules.assessment_year, exact)
+        target = output[begin:begin + chunk_size]
+        for name in STORED_COLUMNS:
+            target[name] = results[name] == 'new' if name == 'recommended_regime' else results[name]
+        chunks += 1
+        if progress is not None:
+            elapsed = time.perf_counter() - start
+            done = min(begin + chunk_size, rows)
+            progress({'chunks': chunks, 'rows': done, 'seconds': elapsed,
+                      'rows_per_sec': done / elapsed if elapsed else 0.0})
+
+    if isinstance(output, np.memmap):
+        output.flush()
+    elapsed = time.perf_counter() - start
+    return {'chunks': chunks, 'rows': rows, 'seconds': elapsed, 'rows_per_sec': rows / elapsed if elapsed else 0.0}
+
+
+def read_records(path):
+    """A .taxbin file as a dict of column name -> array (quarterly fields split per quarter)
+
+    The arrays are views into the memory-mapped file; recommended_regime
+    comes back as 'new' or 'old'.
+    """
+    header = read_header(path)
+    _, records = open_records(path, header['kind'])
+    columns = {}
+    for name in records.dtype.names:
+        values = records[name]
+        if values.ndim == 2:
+            for i, q in enumerate(QUARTERS):
+                columns[f'{name}_{q}'] = values[:, i]
+        elif name == 'recommended_regime':
+            columns[name] = np.where(values == 1.0, 'new', 'old')
+        else:
+            columns[name] = values
+    return columns
@@ -0,0 +1,70 @@
+# tax_engine/breakeven.py
+"""Old vs new regime break-even deductions.
+
+For a gross income g the old regime wins (costs no more than the new one)
+once deductions reach g - t, where t is the largest old-regime taxable
+income taxed no more than the new regime charges on g. Both taxes are
+piecewise linear, so this break-even deduction is piecewise linear in g
+too. Its breakpoints are the new regime's own breakpoints plus every income
+at which the new regime's tax reaches an old-regime breakpoint value; the
+curve is built once per rule-set version and each lookup is a binary search.
+"""
+from bisect import bisect_left
+
+from tax_engine.piecewise import (
+    PiecewiseLinear,
+    breakpoint_values,
+    evaluate,
+    inverse,
+    locate_inverse,
+    right_limits,
+    shift,
+)
+from tax_engine.rules import derived_table, get_rule_set
+
+
+def build_break_even_curve(rules):
+    """Build the break-even deduction curve, as a PiecewiseLinear of gross income, for a RuleSet"""
+    # New regime tax as a function of gross income, old regime as a function of taxable income
+    new_tax = shift(rules.new_tax.total, rules.standard_deduction)
+    old_tax = rules.old_tax.total
+    new_values = breakpoint_values(new_tax)
+    old_values = breakpoint_values(old_tax)
+
+    # Incomes where the new regime tax crosses a value at which the old regime bends or jumps
+    crossings = set()
+    for y in old_values + right_limits(old_tax):
+        if y > 0:
+            crossings.add(inverse(new_tax, y, new_values))
+    breakpoints = tuple(sorted(set(new_tax.breakpoints) | crossings))
+
+    intercepts = []
+    slopes = []
+    for i in range(len(breakpoints) + 1):
+        # Inside each interval the new tax is linear and its inverse under the
+        # old regime stays on one linear piece (or pinned at one jump)
+        if i == 0:
+            g = breakpoints[0] - 1
+        elif i == len(breakpoints):
+            g = breakpoints[-1] + 1
+        else:
+            g = (breakpoints[i - 1] + breakpoints[i]) / 2
+        n = bisect_left(new_tax.breakpoints, g)
+        j, pinned = locate_inverse(old_tax, evaluate(new_tax, g), old_values)
+        if pinned:
+            slopes.append(1.0)
+            intercepts.append(-old_tax.breakpoints[j - 1])
+        else:
+            # g - (new_tax(g) - old_intercept) / old_slope, with new_tax(g) linear in g
+            slopes.append(1 - new_tax.slopes[n] / old_tax.slopes[j])
+            intercepts.append((old_tax.intercepts[j] - new_tax.intercepts[n]) / old_tax.slopes[j])
+    return PiecewiseLinear(breakpoints, tuple(intercepts), tuple(slopes))
+
+
+get_break_even_curve = derived_table(build_break_even_curve)
+
+
+def break_even_deduction(annual_income, assessment_year=None):
+    """Smallest deductions at which the old regime costs no more than the new regime"""
+    curve = get_break_even_curve(get_rule_set(assessment_year))
+    return max(0.0, evaluate(curve, annual_income))
@@ -0,0 +1,68 @@
+# tax_engine/cache.py
+"""Bounded in-process memoization for the Streamlit rerun loop.
+
+Streamlit re-executes app.py on every widget change, but imported modules
+stay loaded, so a module-level cache survives reruns and is shared by every
+session in the server process. Entries are evicted least recently used
+first once maxsize is reached.
+"""
+from collections import OrderedDict
+from threading import Lock
+
+
+class LRUCache:
+    """Thread-safe LRU cache with hit/miss counters"""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, calling compute() and storing it on a miss"""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,39 @@
+# tax_engine/capital_gains.py
+from tax_engine.results import CapitalGainsTax, QuarterlyCapitalGainsTax
+from tax_engine.rules import get_rule_set
+
+
+def calculate_capital_gains_tax(ltcg_by_quarter, stcg_by_quarter, assessment_year=None):
+    """Calculate tax for capital gains quarter-wise"""
+    rules = get_rule_set(assessment_year)
+    total_ltcg = sum(ltcg_by_quarter.values())
+    total_stcg = sum(stcg_by_quarter.values())
+    
+    # LTCG calculation (taxed above the annual exemption)
+    ltcg_exemption = rules.ltcg_exemption
+    taxable_ltcg = max(0, total_ltcg - ltcg_exemption)
+    ltcg_tax = taxable_ltcg * rules.ltcg_rate
+    
+    # STCG calculation
+    stcg_tax = total_stcg * rules.stcg_rate
+    
+    # Calculate quarter-wise breakdown
+    quarters = tuple(ltcg_by_quarter.keys())
+    quarterly_tax = []
+    for quarter in quarters:
+        quarter_ltcg = ltcg_by_quarter[quarter]
+        quarter_stcg = stcg_by_quarter[quarter]
+        
+        # Calculate LTCG tax for this quarter
+        if total_ltcg > ltcg_exemption:
+            quarter_ltcg_tax = (quarter_ltcg / total_ltcg) * ltcg_tax
+        else:
+            quarter_ltcg_tax = 0
+            
+        quarter_stcg_tax = quarter_stcg * rules.stcg_rate
+        
+        quarterly_tax.append(
+            QuarterlyCapitalGainsTax(quarter_ltcg_tax, quarter_stcg_tax, quarter_ltcg_tax + quarter_stcg_tax)
+        )
+    
+    return CapitalGainsTax(ltcg_tax, stcg_tax, ltcg_tax + stcg_tax, taxable_ltcg, quarters, tuple(quarterly_tax))
@@ -0,0 +1,28 @@
+# tax_engine/chart_styles.py
+"""Titles, sizes and colours of the Tax Calculator page's charts.
+
+utils.py builds its plotly figures from these and tax_engine.reports draws
+the same charts into statements, so a page and a statement always match.
+"""
+
+# Label and TaxBreakdown field of each component the charts break tax into
+COMPONENTS = (('Base Tax', 'base_tax'), ('Surcharge', 'surcharge'), ('Cess', 'cess'))
+
+COMPARISON_CHART = {
+    'title': 'Tax on Income Between Regimes (before capital gains)',
+    'height': 400,
+    'categories': [label for label, _ in COMPONENTS] + ['Tax on Income'],
+    'series': [('New Regime', '#0066cc'), ('Old Regime', '#006600')],
+}
+
+# Keyed by regime name, 'New' or 'Old'
+BREAKDOWN_PIES = {
+    regime: {
+        'title': f'{regime} Regime Tax on Income',
+        'height': 300,
+        'labels': [label for label, _ in COMPONENTS],
+        'colors': colors,
+        'hole': 0.3,
+    }
+    for regime, colors in (('New', ['#0066cc', '#4d94ff', '#99c2ff']), ('Old', ['#006600', '#00b300', '#00ff00']))
+}
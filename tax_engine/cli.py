@@ -0,0 +1,279 @@
+# tax_engine/cli.py
+"""Command-line entry point: python -m tax_engine <command> ..."""
+import argparse
+import os
+import sys
+import time
+
+from tax_engine.reports import DEFAULT_REPORT_CHUNK_SIZE, REPORT_FORMATS
+from tax_engine.rules import DEFAULT_ASSESSMENT_YEAR, RULE_SETS
+from tax_engine.server import DEFAULT_BATCH_WINDOW, DEFAULT_MAX_BATCH
+from tax_engine.store import DEFAULT_MAX_BYTES
+from tax_engine.streaming import DEFAULT_CHUNK_SIZE
+
+
+def _print_progress(stats):
+    print(f"chunk {stats['chunks']}: {stats['rows']:,} rows, "
+          f"{stats['rows_per_sec']:,.0f} rows/sec", file=sys.stderr)
+
+
+def run_batch(args):
+    from tax_engine.binary import EXTENSION, is_binary, process_binary
+    from tax_engine.streaming import process_file
+
+    if is_binary(args.input) or is_binary(args.output):
+        if not (is_binary(args.input) and is_binary(args.output)):
+            raise ValueError(f"A {EXTENSION} input needs a {EXTENSION} output and the other way round; "
+                             f"use the convert command to make one")
+        if args.resume or args.store or args.workers != 1:
+            raise ValueError(f"--resume, --store and --workers don't apply to {EXTENSION} files")
+        stats = process_binary(args.input, args.output, chunk_size=args.chunk_size,
+                               progress=None if args.quiet else _print_progress,
+                               assessment_year=args.assessment_year, exact=args.paise)
+        print(f"Processed {stats['rows']:,} rows in {stats['chunks']} chunks, "
+              f"{stats['seconds']:.2f}s ({stats['rows_per_sec']:,.0f} rows/sec)")
+        return
+
+    stats = process_file(
+        args.input,
+        args.output,
+        chunk_size=args.chunk_size,
+        resume=args.resume,
+        progress=None if args.quiet else _print_progress,
+        workers=args.workers or os.cpu_count(),
+        assessment_year=args.assessment_year,
+        store_path=args.store,
+        exact=args.paise
+    )
+    print(f"Processed {stats['rows']:,} rows in {stats['chunks']} chunks, "
+          f"{stats['seconds']:.2f}s ({stats['rows_per_sec']:,.0f} rows/sec)")
+
+
+def run_convert(args):
+    from tax_engine.binary import convert_to_binary, is_binary
+
+    if not is_binary(args.output):
+        raise ValueError("The output of convert must be a .taxbin file")
+    stats = convert_to_binary(args.input, args.output, chunk_size=args.chunk_size)
+    print(f"Converted {stats['rows']:,} rows in {stats['seconds']:.2f}s")
+
+
+def run_plan(args):
+    from tax_engine.streaming import plan_file
+
+    stats = plan_file(
+        args.input,
+        args.output,
+        budget=args.budget,
+        chunk_size=args.chunk_size,
+        progress=None if args.quiet else _print_progress,
+        assessment_year=args.assessment_year
+    )
+    print(f"Planned {stats['rows']:,} employees in {stats['chunks']} chunks, "
+          f"{stats['seconds']:.2f}s ({stats['rows_per_sec']:,.0f} rows/sec)")
+
+
+def run_tds(args):
+    from tax_engine.streaming import replay_tds_file
+
+    stats = replay_tds_file(args.events, args.output, chunk_size=args.chunk_size,
+                            assessment_year=args.assessment_year)
+    print(f"Replayed {stats['events']:,} payroll events for {stats['employees']:,} employees "
+          f"in {stats['seconds']:.2f}s")
+
+
+def _print_report_progress(stats):
+    print(f"chunk {stats['chunks']}: {stats['statements']:,} statements, "
+          f"{stats['rows_per_sec']:,.0f} statements/sec", file=sys.stderr)
+
+
+def run_reports(args):
+    from tax_engine.reports import write_reports
+
+    stats = write_reports(
+        args.input,
+        args.output,
+        report_format=args.format,
+        chunk_size=args.chunk_size,
+        workers=args.workers or os.cpu_count(),
+        progress=None if args.quiet else _print_report_progress,
+        assessment_year=args.assessment_year
+    )
+    print(f"Wrote {stats['statements']:,} {args.format} statements ({stats['bytes'] / 1024 ** 2:,.1f} MB before "
+          f"compression) to {args.output} in {stats['seconds']:.2f}s "
+          f"({stats['statements_per_sec']:,.0f} statements/sec)")
+
+
+def run_tradebook(args):
+    from tax_engine.tradebook import calculate_tradebook_tax
+
+    start = time.perf_counter()
+    gains, cg_tax = calculate_tradebook_tax(args.tradebook, args.assessment_year)
+    elapsed = time.perf_counter() - start
+
+    print(f"{'Quarter':<8}{'LTCG (₹)':>16}{'STCG (₹)':>16}{'Tax (₹)':>16}")
+    for quarter, tax in cg_tax.quarterly_tax.items():
+        print(f"{quarter:<8}{gains['ltcg_by_quarter'][quarter]:>16,.2f}"
+              f"{gains['stcg_by_quarter'][quarter]:>16,.2f}{tax.total:>16,.2f}")
+    print(f"Total capital gains tax: ₹{cg_tax.total_cg_tax:,.2f}")
+    if gains['ltcl_unabsorbed'] or gains['stcl_unabsorbed']:
+        print(f"Unabsorbed losses: LTCL ₹{gains['ltcl_unabsorbed']:,.2f}, STCL ₹{gains['stcl_unabsorbed']:,.2f}")
+    if gains['unmatched_sells']:
+        print(f"Sells without open lots: {', '.join(f'{s} ({q:g})' for s, q in gains['unmatched_sells'].items())}",
+              file=sys.stderr)
+    print(f"Matched {gains['trades']:,} trades in {elapsed:.2f}s "
+          f"({gains['trades'] / elapsed if elapsed else 0:,.0f} trades/sec), {gains['open_lots']:,} lots still open",
+          file=sys.stderr)
+
+
+def run_serve(args):
+    import asyncio
+
+    from tax_engine.server import serve
+
+    print(f"Serving the tax API on http://{args.host}:{args.port} "
+          f"(batch window {args.batch_window_ms:g} ms)", file=sys.stderr)
+    try:
+        asyncio.run(serve(args.host, args.port, args.batch_window_ms / 1000, args.max_batch))
+    except KeyboardInterrupt:
+        pass
+
+
+def run_store(args):
+    from tax_engine.store import ResultStore
+
+    store = ResultStore(args.path, int(args.max_mb * 1024 ** 2))
+    if args.invalidate:
+        print(f"Invalidated {store.invalidate():,} results from rule sets no longer in tax_config.py")
+    evicted = store.evict()
+    if evicted:
+        print(f"Evicted {evicted:,} least recently used results")
+    stats = store.stats()
+    print(f"{stats['entries']:,} results ({stats['bytes'] / 1024 ** 2:,.1f} MB) in {stats['path']}")
+    for group in stats['by_version']:
+        print(f"  {group['kind']:<12} rules {group['rule_version']}: {group['entries']:,} "
+              f"({group['bytes'] / 1024 ** 2:,.1f} MB)")
+    store.close()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m tax_engine', description="Indian income tax engine")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    batch = commands.add_parser(
+        'batch',
+        help="Compute both regimes, capital gains tax and the recommended regime for a CSV/Parquet file"
+    )
+    batch.add_argument('input', help="Input .csv, .parquet or .taxbin file")
+    batch.add_argument('output', help="Output .csv file, .parquet directory of part files, or .taxbin file "
+                                      "for a .taxbin input")
+    batch.add_argument('--assessment-year', choices=list(RULE_SETS), default=DEFAULT_ASSESSMENT_YEAR,
+                       help="Tax rules to apply (default: %(default)s)")
+    batch.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                       help="Rows read, computed and written per chunk (default: %(default)s)")
+    batch.add_argument('--resume', action='store_true',
+                       help="Continue an interrupted run from its last completed chunk")
+    batch.add_argument('--workers', type=int, default=1,
+                       help="Worker processes to spread chunks across; 0 uses every core (default: %(default)s)")
+    batch.add_argument('--quiet', action='store_true', help="Don't report progress after each chunk")
+    batch.add_argument('--paise', action='store_true',
+                       help="Compute in exact integer paise with Section 288A/288B rounding of income and tax")
+    batch.add_argument('--store', metavar='PATH',
+                       help="SQLite result store to reuse chunk results from and save new ones to")
+    batch.set_defaults(func=run_batch)
+
+    convert = commands.add_parser(
+        'convert',
+        help="Convert a CSV/Parquet payroll file to fixed-width .taxbin records for memory-mapped batch runs"
+    )
+    convert.add_argument('input', help="Input .csv or .parquet file")
+    convert.add_argument('output', help="Output .taxbin file")
+    convert.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                         help="Rows read and converted per chunk (default: %(default)s)")
+    convert.set_defaults(func=run_convert)
+
+    plan = commands.add_parser(
+        'plan',
+        help="Find each employee's tax-minimizing split of an investment budget across 80C, 80D and 80CCD"
+    )
+    plan.add_argument('input', help="Input .csv or .parquet file with annual_income and optionally age, budget, "
+                                    "current_80c, current_80d, current_80ccd and other_deductions")
+    plan.add_argument('output', help="Output .csv file, or .parquet directory of part files")
+    plan.add_argument('--budget', type=float,
+                      help="Investment budget for rows without a budget column")
+    plan.add_argument('--assessment-year', choices=list(RULE_SETS), default=DEFAULT_ASSESSMENT_YEAR,
+                      help="Tax rules to apply (default: %(default)s)")
+    plan.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                      help="Rows read, computed and written per chunk (default: %(default)s)")
+    plan.add_argument('--quiet', action='store_true', help="Don't report progress after each chunk")
+    plan.set_defaults(func=run_plan)
+
+    tds = commands.add_parser(
+        'tds',
+        help="Replay a year of payroll events into each employee's monthly TDS"
+    )
+    tds.add_argument('events', help="Input .csv or .parquet file with employee_id, month, kind "
+                                    "(salary, bonus or declaration), amount and optionally regime columns")
+    tds.add_argument('output', help="Output .csv file, or .parquet directory, with one row per employee")
+    tds.add_argument('--assessment-year', choices=list(RULE_SETS), default=DEFAULT_ASSESSMENT_YEAR,
+                     help="Tax rules to apply (default: %(default)s)")
+    tds.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                     help="Event rows read per chunk (default: %(default)s)")
+    tds.set_defaults(func=run_tds)
+
+    reports = commands.add_parser(
+        'reports',
+        help="Render a tax statement per employee of a CSV/Parquet file into one zip file"
+    )
+    reports.add_argument('input', help="Input .csv or .parquet file with the batch columns and optionally employee_id")
+    reports.add_argument('output', help="Output .zip file")
+    reports.add_argument('--format', choices=REPORT_FORMATS, default='html',
+                         help="Statement format; xlsx needs xlsxwriter (default: %(default)s)")
+    reports.add_argument('--assessment-year', choices=list(RULE_SETS), default=DEFAULT_ASSESSMENT_YEAR,
+                         help="Tax rules to apply (default: %(default)s)")
+    reports.add_argument('--chunk-size', type=int, default=DEFAULT_REPORT_CHUNK_SIZE,
+                         help="Statements rendered per chunk (default: %(default)s)")
+    reports.add_argument('--workers', type=int, default=1,
+                         help="Worker processes to spread chunks across; 0 uses every core (default: %(default)s)")
+    reports.add_argument('--quiet', action='store_true', help="Don't report progress after each chunk")
+    reports.set_defaults(func=run_reports)
+
+    tradebook = commands.add_parser(
+        'tradebook',
+        help="FIFO-match a broker tradebook CSV into quarterly capital gains and tax"
+    )
+    tradebook.add_argument('tradebook', help="CSV with symbol, trade_date, trade_type, quantity and price columns")
+    tradebook.add_argument('--assessment-year', choices=list(RULE_SETS), default=DEFAULT_ASSESSMENT_YEAR,
+                           help="Tax rules to apply (default: %(default)s)")
+    tradebook.set_defaults(func=run_tradebook)
+
+    serve = commands.add_parser(
+        'serve',
+        help="Run the JSON tax API, micro-batching concurrent requests into vectorized calls"
+    )
+    serve.add_argument('--host', default='127.0.0.1', help="Address to bind (default: %(default)s)")
+    serve.add_argument('--port', type=int, default=8765, help="Port to listen on (default: %(default)s)")
+    serve.add_argument('--batch-window-ms', type=float, default=DEFAULT_BATCH_WINDOW * 1000,
+                       help="How long to gather concurrent requests into one batch (default: %(default)s)")
+    serve.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH,
+                       help="Flush a batch early once it holds this many requests (default: %(default)s)")
+    serve.set_defaults(func=run_serve)
+
+    store = commands.add_parser('store', help="Show, invalidate or trim a SQLite result store")
+    store.add_argument('path', help="Result store file")
+    store.add_argument('--invalidate', action='store_true',
+                       help="Delete results computed under rule sets that have since changed")
+    store.add_argument('--max-mb', type=float, default=DEFAULT_MAX_BYTES / 1024 ** 2,
+                       help="Evict least recently used results beyond this many MB (default: %(default)s)")
+    store.set_defaults(func=run_store)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
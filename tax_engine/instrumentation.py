@@ -0,0 +1,127 @@
+# tax_engine/instrumentation.py
+"""Opt-in phase timers and counters for the Streamlit rerun loop.
+
+Set TAX_CALC_PROFILE=1 to turn them on. Each rerun is one run: begin_run()
+starts it, phase() and count() add to the run active on the current thread
+(Streamlit executes every session's reruns on that session's script
+thread), and end_run() closes it, writes it as one JSON line to
+TAX_CALC_PROFILE_LOG (stderr if unset) and returns it for display.
+
+When the variable is unset, phase() hands back one shared no-op context
+manager and count() returns immediately, so instrumented code pays a single
+function call per timer.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime
+
+ENV_VAR = 'TAX_CALC_PROFILE'
+LOG_ENV_VAR = 'TAX_CALC_PROFILE_LOG'
+
+ENABLED = os.environ.get(ENV_VAR, '').lower() not in ('', '0', 'false', 'no', 'off')
+
+_NO_OP = nullcontext()
+_local = threading.local()
+_log_lock = threading.Lock()
+
+
+class Run:
+    """Phase timings and counters collected during one rerun"""
+
+    def __init__(self, name):
+        self.name = name
+        self.started_at = datetime.now()
+        self.start = time.perf_counter()
+        self.phases = {}
+        self.counters = {}
+
+    def add_phase(self, name, seconds):
+        entry = self.phases.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+    def to_record(self):
+        return {
+            'ts': self.started_at.isoformat(timespec='milliseconds'),
+            'page': self.name,
+            'total_ms': (time.perf_counter() - self.start) * 1000,
+            'phases': {name: {'ms': seconds * 1000, 'calls': calls}
+                       for name, (seconds, calls) in self.phases.items()},
+            'counters': dict(self.counters),
+        }
+
+
+class _Phase:
+    __slots__ = ('run', 'name', 'start')
+
+    def __init__(self, run, name):
+        self.run = run
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.run.add_phase(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def begin_run(name):
+    """Start timing a rerun of page name on this thread"""
+    if not ENABLED:
+        return None
+    _local.run = Run(name)
+    return _local.run
+
+
+def phase(name):
+    """Context manager adding its wall time to phase name of the current run"""
+    if not ENABLED:
+        return _NO_OP
+    run = getattr(_local, 'run', None)
+    if run is None:
+        return _NO_OP
+    return _Phase(run, name)
+
+
+def count(name, n=1):
+    """Add n to counter name of the current run"""
+    if not ENABLED:
+        return
+    run = getattr(_local, 'run', None)
+    if run is not None:
+        run.counters[name] = run.counters.get(name, 0) + n
+
+
+def end_run(**extra):
+    """Finish the current run, log it as a JSON line and return the record
+
+    Keyword arguments are added to the record, e.g. cache statistics.
+    Returns None when instrumentation is off or no run was started.
+    """
+    if not ENABLED:
+        return None
+    run = getattr(_local, 'run', None)
+    if run is None:
+        return None
+    _local.run = None
+    record = run.to_record()
+    record.update(extra)
+    write_record(record)
+    return record
+
+
+def write_record(record):
+    line = json.dumps(record, separators=(',', ':'))
+    path = os.environ.get(LOG_ENV_VAR)
+    with _log_lock:
+        if path:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+        else:
+            print(line, file=sys.stderr)
@@ -0,0 +1,195 @@
+# tax_engine/montecarlo.py
+"""Monte Carlo advance tax planning under uncertain income and capital gains.
+
+Salary, bonus and each quarter's LTCG and STCG are given as distributions.
+simulate_advance_tax() draws seeded scenarios in chunks and runs each chunk
+through the vectorized regime and capital gains calculators in
+tax_engine.batch and the vectorized advance tax schedule. It then reports
+quantiles of every installment and the chance of Section 234C and 234B
+interest.
+
+Payments follow a plan, by default the schedule implied by the mean of each
+distribution. Interest probabilities therefore answer "how often does
+paying on the point estimates leave us short?".
+
+A distribution is a plain number (fixed) or a dict with a 'kind':
+
+    {'kind': 'fixed', 'value': v}
+    {'kind': 'normal', 'mean': m, 'sd': s}           clipped at zero
+    {'kind': 'lognormal', 'median': m, 'sigma': s}
+    {'kind': 'uniform', 'low': a, 'high': b}
+    {'kind': 'triangular', 'low': a, 'mode': c, 'high': b}
+"""
+import json
+import math
+import time
+
+import numpy as np
+
+from tax_engine.advance_tax import calculate_advance_tax_schedule_batch
+from tax_engine.batch import (
+    calculate_capital_gains_tax_batch,
+    calculate_tax_new_regime_batch,
+    calculate_tax_old_regime_batch,
+)
+from tax_engine.cache import LRUCache
+from tax_engine.rules import get_rule_set
+
+DEFAULT_SCENARIOS = 1000000
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+CHUNK_SIZE = 250000
+
+SIMULATION_CACHE = LRUCache(maxsize=16)
+
+
+def _spec(distribution):
+    if isinstance(distribution, (int, float)):
+        return {'kind': 'fixed', 'value': distribution}
+    return distribution
+
+
+def sample(distribution, rng, size):
+    """Draw size values from a distribution spec"""
+    spec = _spec(distribution)
+    kind = spec.get('kind')
+    if kind == 'fixed':
+        return np.full(size, float(spec['value']))
+    if kind == 'normal':
+        return np.maximum(0.0, rng.normal(spec['mean'], spec['sd'], size))
+    if kind == 'lognormal':
+        return rng.lognormal(math.log(spec['median']), spec['sigma'], size)
+    if kind == 'uniform':
+        return rng.uniform(spec['low'], spec['high'], size)
+    if kind == 'triangular':
+        if spec['low'] == spec['high']:
+            return np.full(size, float(spec['low']))
+        return rng.triangular(spec['low'], spec['mode'], spec['high'], size)
+    raise ValueError(f"Unknown distribution kind {kind!r}; use fixed, normal, lognormal, uniform or triangular")
+
+
+def mean(distribution):
+    """Expected value of a distribution spec (normal ignores the clip at zero)"""
+    spec = _spec(distribution)
+    kind = spec.get('kind')
+    if kind == 'fixed':
+        return float(spec['value'])
+    if kind == 'normal':
+        return float(spec['mean'])
+    if kind == 'lognormal':
+        return spec['median'] * math.exp(spec['sigma'] ** 2 / 2)
+    if kind == 'uniform':
+        return (spec['low'] + spec['high']) / 2
+    if kind == 'triangular':
+        return (spec['low'] + spec['mode'] + spec['high']) / 3
+    raise ValueError(f"Unknown distribution kind {kind!r}; use fixed, normal, lognormal, uniform or triangular")
+
+
+def _scenario_tax(salary, bonus, ltcg, stcg, deductions, regime, assessment_year):
+    """Total tax and quarter-wise capital gains tax for arrays of scenarios"""
+    annual_income = salary + bonus
+    cg_tax = calculate_capital_gains_tax_batch(ltcg, stcg, assessment_year)
+    new_total = calculate_tax_new_regime_batch(annual_income, assessment_year)['total_tax'] + cg_tax['total_cg_tax']
+    old_total = (calculate_tax_old_regime_batch(annual_income, np.full(len(annual_income), float(deductions)),
+                                                assessment_year)['total_tax']
+                 + cg_tax['total_cg_tax'])
+    if regime == 'new':
+        return new_total, cg_tax['quarterly_tax'], np.ones(len(new_total), dtype=bool)
+    if regime == 'old':
+        return old_total, cg_tax['quarterly_tax'], np.zeros(len(old_total), dtype=bool)
+    new_is_cheaper = new_total < old_total
+    return np.where(new_is_cheaper, new_total, old_total), cg_tax['quarterly_tax'], new_is_cheaper
+
+
+def plan_from_means(salary, bonus, ltcg_by_quarter, stcg_by_quarter, deductions=0, regime='auto',
+                    assessment_year=None):
+    """Per-installment payments for the scenario where every input is at its mean"""
+    def column(distributions):
+        return np.array([[mean(d) for d in distributions]])
+
+    total_tax, cg_tax, _ = _scenario_tax(
+        np.array([mean(salary)]), np.array([mean(bonus)]),
+        column(ltcg_by_quarter), column(stcg_by_quarter), deductions, regime, assessment_year
+    )
+    return calculate_advance_tax_schedule_batch(total_tax, cg_tax, assessment_year=assessment_year)['total_amount'][0]
+
+
+def simulate_advance_tax(salary, bonus, ltcg_by_quarter, stcg_by_quarter, deductions=0, regime='auto',
+                         payments=None, scenarios=DEFAULT_SCENARIOS, seed=0, quantiles=DEFAULT_QUANTILES,
+                         assessment_year=None):
+    """Simulate scenarios and summarize the advance tax installments and interest
+
+    ltcg_by_quarter and stcg_by_quarter are lists of four distributions.
+    regime is 'new', 'old' or 'auto' (the cheaper one in each scenario).
+    payments is the amount paid in each installment window and defaults to
+    plan_from_means(). The same seed always gives the same result.
+    """
+    if regime not in ('auto', 'new', 'old'):
+        raise ValueError(f"regime must be 'auto', 'new' or 'old', not {regime!r}")
+    rules = get_rule_set(assessment_year)
+    if payments is None:
+        payments = plan_from_means(salary, bonus, ltcg_by_quarter, stcg_by_quarter, deductions, regime,
+                                   assessment_year)
+    payments = np.asarray(payments, dtype=np.float64)
+
+    start = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    installments, totals, interest_234c, interest_234b, chose_new = [], [], [], [], []
+    for offset in range(0, scenarios, CHUNK_SIZE):
+        size = min(CHUNK_SIZE, scenarios - offset)
+        ltcg = np.column_stack([sample(d, rng, size) for d in ltcg_by_quarter])
+        stcg = np.column_stack([sample(d, rng, size) for d in stcg_by_quarter])
+        total_tax, cg_tax, new_regime = _scenario_tax(
+            sample(salary, rng, size), sample(bonus, rng, size), ltcg, stcg, deductions, regime, assessment_year
+        )
+        schedule = calculate_advance_tax_schedule_batch(
+            total_tax, cg_tax, np.broadcast_to(payments, cg_tax.shape), assessment_year
+        )
+        installments.append(schedule['total_amount'])
+        totals.append(total_tax)
+        interest_234c.append(schedule['interest_234c'])
+        interest_234b.append(schedule['interest_234b'])
+        chose_new.append(new_regime)
+
+    installments = np.concatenate(installments)
+    totals = np.concatenate(totals)
+    interest_234c = np.concatenate(interest_234c)
+    interest_234b = np.concatenate(interest_234b)
+    interest_234c_total = interest_234c.sum(axis=1)
+
+    def summarize(values):
+        return {'mean': float(values.mean()),
+                'quantiles': [float(v) for v in np.quantile(values, quantiles)]}
+
+    return {
+        'scenarios': scenarios,
+        'seed': seed,
+        'seconds': time.perf_counter() - start,
+        'quantiles': list(quantiles),
+        'installments': {
+            installment.quarter: dict(
+                summarize(installments[:, q]),
+                due_date=installment.due_date,
+                planned_payment=float(payments[q]),
+                probability_234c=float((interest_234c[:, q] > 0).mean())
+            )
+            for q, installment in enumerate(rules.advance_tax)
+        },
+        'total_tax': summarize(totals),
+        'probability_234c': float((interest_234c_total > 0).mean()),
+        'interest_234c': summarize(interest_234c_total),
+        'probability_234b': float((interest_234b > 0).mean()),
+        'interest_234b': summarize(interest_234b),
+        'new_regime_share': float(np.concatenate(chose_new).mean()),
+    }
+
+
+def cached_simulation(salary, bonus, ltcg_by_quarter, stcg_by_quarter, deductions=0, regime='auto',
+                      payments=None, scenarios=DEFAULT_SCENARIOS, seed=0, assessment_year=None):
+    """simulate_advance_tax() memoized on its inputs; the result must not be mutated"""
+    key = json.dumps([salary, bonus, ltcg_by_quarter, stcg_by_quarter, deductions, regime,
+                      None if payments is None else [float(p) for p in payments], scenarios, seed,
+                      get_rule_set(assessment_year).version], sort_keys=True)
+    return SIMULATION_CACHE.get_or_compute(key, lambda: simulate_advance_tax(
+        salary, bonus, ltcg_by_quarter, stcg_by_quarter, deductions, regime, payments, scenarios, seed,
+        assessment_year=assessment_year
+    ))
@@ -0,0 +1,414 @@
+# tax_engine/paise.py
+"""Exact tax in integer paise, with the statutory rounding.
+
+The regular calculators work in float rupees, so a total can drift from
+Form 16 by a paisa or two. Here every amount is a whole number of paise and
+every rate a whole number of parts per million (PPM). Each component is
+rounded half-up to the paisa once:
+
+    base tax    sum of slab widths x rates, rounded once
+    surcharge   base x rate, with marginal relief against the nearest threshold below
+    cess        (base + surcharge) x cess rate
+
+Total income (Section 288A) and tax payable (Section 288B) are rounded to
+the nearest ten rupees, counting five rupees or more as ten. Taxable income
+is rounded before tax is worked out, and total_tax is rounded after.
+
+The vectorized equivalents, the *_batch functions, follow the scalar ones.
+They import NumPy when called, so the scalar path needs only the standard
+library.
+"""
+import math
+from bisect import bisect_left
+from decimal import ROUND_HALF_UP, Decimal
+from typing import NamedTuple
+
+from tax_engine.results import CapitalGainsTax, QuarterlyCapitalGainsTax, TaxBreakdown
+from tax_engine.rules import derived_table, get_rule_set
+
+PPM = 1000000
+TEN_RUPEES = 1000
+
+
+class PaiseRegime(NamedTuple):
+    """One regime's slabs and surcharge in paise and PPM
+
+    cumulative[i] is the tax on income below lower[i], in paise x PPM, so it
+    carries no rounding. capped[j] is the tax plus surcharge on thresholds[j]
+    itself, which caps tax plus surcharge above it under marginal relief.
+    """
+    limits: tuple
+    lower: tuple
+    rates: tuple
+    cumulative: tuple
+    thresholds: tuple
+    surcharge_rates: tuple
+    capped: tuple
+    cess_rate: int
+
+
+class PaiseRuleSet(NamedTuple):
+    standard_deduction: int
+    new_regime: PaiseRegime
+    old_regime: PaiseRegime
+    ltcg_exemption: int
+    ltcg_rate: int
+    stcg_rate: int
+
+
+def to_paise(amount):
+    """Rupees (int, float, Decimal or numeric string) as whole paise, rounding half up"""
+    if isinstance(amount, int):
+        return amount * 100
+    if isinstance(amount, float):
+        return math.floor(amount * 100 + 0.5)
+    return int((Decimal(amount) * 100).to_integral_value(ROUND_HALF_UP))
+
+
+def to_ppm(rate):
+    """A rate as whole parts per million; rates finer than that are refused rather than rounded"""
+    ppm = round(rate * PPM)
+    if abs(ppm - rate * PPM) > 1e-6:
+        raise ValueError(f"Rate {rate!r} is not a whole number of parts per million")
+    return ppm
+
+
+def round_div(numerator, denominator):
+    """numerator / denominator rounded half up, for a positive denominator"""
+    quotient, remainder = divmod(numerator, denominator)
+    return quotient + (2 * remainder >= denominator)
+
+
+def round_to_ten_rupees(paise):
+    """Sections 288A and 288B: nearest multiple of ten rupees, five rupees or more rounding up"""
+    return (paise + TEN_RUPEES // 2) // TEN_RUPEES * TEN_RUPEES
+
+
+round_income = round_to_ten_rupees
+round_tax = round_to_ten_rupees
+
+
+def _base_tax(regime, taxable_income):
+    i = bisect_left(regime.limits, taxable_income)
+    return round_div(regime.cumulative[i] + (taxable_income - regime.lower[i]) * regime.rates[i], PPM)
+
+
+def _surcharge(regime, taxable_income, base_tax):
+    j = bisect_left(regime.thresholds, taxable_income)
+    surcharge = round_div(base_tax * regime.surcharge_rates[j], PPM)
+    if j:
+        cap = regime.capped[j - 1] + taxable_income - regime.thresholds[j - 1]
+        surcharge = min(surcharge, cap - base_tax)
+    return surcharge
+
+
+def compile_paise_regime(slabs, surcharge, cess_rate):
+    """Compile a SlabTable and SurchargeTable into a PaiseRegime"""
+    limits = tuple(to_paise(limit) for limit in slabs.limits)
+    lower = (0,) + limits
+    rates = tuple(to_ppm(rate) for rate in slabs.rates)
+    cumulative = [0]
+    for i in range(1, len(rates)):
+        cumulative.append(cumulative[-1] + (lower[i] - lower[i - 1]) * rates[i - 1])
+
+    regime = PaiseRegime(limits, lower, rates, tuple(cumulative), tuple(to_paise(t) for t in surcharge.thresholds),
+                         tuple(to_ppm(rate) for rate in surcharge.rates), (), to_ppm(cess_rate))
+    # Each threshold is charged at the rate below it, relieved against the threshold before
+    capped = []
+    for threshold in regime.thresholds:
+        base_tax = _base_tax(regime, threshold)
+        capped.append(base_tax + _surcharge(regime._replace(capped=tuple(capped)), threshold, base_tax))
+    return regime._replace(capped=tuple(capped))
+
+
+def compile_paise_rules(rules):
+    """Compile a RuleSet into a PaiseRuleSet"""
+    return PaiseRuleSet(
+        standard_deduction=to_paise(rules.standard_deduction),
+        new_regime=compile_paise_regime(rules.new_regime, rules.new_surcharge, rules.cess_rate),
+        old_regime=compile_paise_regime(rules.old_regime, rules.old_surcharge, rules.cess_rate),
+        ltcg_exemption=to_paise(rules.ltcg_exemption),
+        ltcg_rate=to_ppm(rules.ltcg_rate),
+        stcg_rate=to_ppm(rules.stcg_rate)
+    )
+
+
+get_paise_rules = derived_table(compile_paise_rules)
+
+
+def get_paise_rule_set(assessment_year=None):
+    return get_paise_rules(get_rule_set(assessment_year))
+
+
+def _tax_breakdown(taxable_income, regime):
+    taxable_income = round_income(taxable_income)
+    base_tax = _base_tax(regime, taxable_income)
+    surcharge = _surcharge(regime, taxable_income, base_tax)
+    cess = round_div((base_tax + surcharge) * regime.cess_rate, PPM)
+    return TaxBreakdown(base_tax, surcharge, cess, round_tax(base_tax + surcharge + cess), taxable_income)
+
+
+def calculate_tax_new_regime_paise(annual_income, assessment_year=None):
+    """New regime tax on an income in paise; every field of the TaxBreakdown is in paise"""
+    rules = get_paise_rule_set(assessment_year)
+    return _tax_breakdown(annual_income - rules.standard_deduction, rules.new_regime)
+
+
+def calculate_tax_old_regime_paise(annual_income, deductions, assessment_year=None):
+    """Old regime tax on an income and deductions in paise; every field of the TaxBreakdown is in paise"""
+    rules = get_paise_rule_set(assessment_year)
+    return _tax_breakdown(annual_income - deductions, rules.old_regime)
+
+
+def _allocate(amounts, total, tax):
+    """Split tax across amounts in proportion to their running share of total, summing exactly to tax"""
+    shares = []
+    running = allocated = 0
+    for amount in amounts:
+        running += amount
+        cumulative = round_div(running * tax, total)
+        shares.append(cumulative - allocated)
+        allocated = cumulative
+    return shares
+
+
+def calculate_capital_gains_tax_paise(ltcg_by_quarter, stcg_by_quarter, assessment_year=None):
+    """calculate_capital_gains_tax on gains in paise
+
+    Quarter-wise taxes are apportioned from the annual tax so that they add up
+    to it exactly. Capital gains tax is not rounded under Section 288B on its
+    own; see tax_payable_paise.
+    """
+    rules = get_paise_rule_set(assessment_year)
+    quarters = tuple(ltcg_by_quarter.keys())
+    ltcg = [ltcg_by_quarter[quarter] for quarter in quarters]
+    stcg = [stcg_by_quarter[quarter] for quarter in quarters]
+    total_ltcg = sum(ltcg)
+    total_stcg = sum(stcg)
+
+    taxable_ltcg = max(0, total_ltcg - rules.ltcg_exemption)
+    ltcg_tax = round_div(taxable_ltcg * rules.ltcg_rate, PPM)
+    stcg_tax = round_div(total_stcg * rules.stcg_rate, PPM)
+
+    ltcg_shares = _allocate(ltcg, total_ltcg, ltcg_tax) if taxable_ltcg else [0] * len(quarters)
+    # STCG is taxed at a flat rate, so each running total's tax apportions it
+    stcg_shares = _allocate(stcg, PPM, rules.stcg_rate)
+    quarterly = tuple(QuarterlyCapitalGainsTax(l, s, l + s) for l, s in zip(ltcg_shares, stcg_shares))
+    return CapitalGainsTax(ltcg_tax, stcg_tax, ltcg_tax + stcg_tax, taxable_ltcg, quarters, quarterly)
+
+
+def tax_payable_paise(regime_tax, cg_tax=None):
+    """Tax payable under Section 288B: regime tax before rounding plus any capital gains tax"""
+    total = regime_tax.base_tax + regime_tax.surcharge + regime_tax.cess
+    if cg_tax is not None:
+        total += cg_tax.total_cg_tax
+    return round_tax(total)
+
+
+def to_paise_batch(amounts):
+    """Vectorized to_paise for float rupee amounts"""
+    import numpy as np
+
+    return np.floor(np.asarray(amounts, dtype=np.float64) * 100 + 0.5).astype(np.int64)
+
+
+def _muldiv(a, b, c, d=0):
+    """Exact floor((a * b + d) / c) and its remainder for int64 arrays, c > 0
+
+    a * b may overflow int64. The quotient is estimated in float64 and then
+    corrected using the remainder, which is computed modulo 2**64 and is
+    exact because the true remainder is small. Quotients must stay below
+    2**50, about ₹11 lakh crore in paise.
+    """
+    import numpy as np
+
+    a, b, c, d = (np.asarray(v, dtype=np.int64) for v in (a, b, c, d))
+    quotient = np.floor((a.astype(np.float64) * b + d) / c).astype(np.int64)
+    with np.errstate(over='ignore'):
+        remainder = a * b + d - quotient * c
+    for _ in range(2):
+        low = remainder < 0
+        quotient = quotient - low
+        remainder = remainder + low * c
+        high = remainder >= c
+        quotient = quotient + high
+        remainder = remainder - high * c
+    return quotient, remainder
+
+
+def _fits_int64(a, b, d):
+    """Whether a * b + d cannot overflow int64, judged from the largest magnitudes"""
+    import numpy as np
+
+    def largest(values):
+        values = np.asarray(values)
+        if values.ndim == 0:
+            return abs(int(values))
+        return max(-int(values.min()), int(values.max())) if values.size else 0
+    return largest(a) * largest(b) + largest(d) < 2 ** 63
+
+
+def _round_muldiv(a, b, c, d=0):
+    """(a * b + d) / c rounded half up, exactly
+
+    Plain int64 arithmetic when the product cannot overflow, which covers
+    ordinary payroll amounts, and _muldiv otherwise.
+    """
+    import numpy as np
+
+    if not _fits_int64(a, b, d):
+        quotient, remainder = _muldiv(a, b, c, d)
+        return quotient + (2 * remainder >= c)
+    numerator = np.asarray(a, dtype=np.int64) * b + d
+    if np.ndim(c) == 0 and c % 2 == 0:
+        return (numerator + c // 2) // c
+    quotient, remainder = np.divmod(numerator, c)
+    return quotient + (2 * remainder >= c)
+
+
+def _regime_arrays(regime):
+    import numpy as np
+
+    return regime._replace(**{
+        field: np.array(value, dtype=np.int64)
+        for field, value in regime._asdict().items() if field != 'cess_rate'
+    })
+
+
+def compile_paise_batch_rules(rules):
+    """A RuleSet's PaiseRuleSet with its regime tables as int64 arrays"""
+    paise_rules = get_paise_rules(rules)
+    return paise_rules._replace(
+        new_regime=_regime_arrays(paise_rules.new_regime),
+        old_regime=_regime_arrays(paise_rules.old_regime)
+    )
+
+
+_paise_batch_rules = derived_table(compile_paise_batch_rules)
+
+
+def calculate_tax_paise_batch(taxable_income, regime):
+    """Vectorized paise tax for an array of taxable incomes in paise
+
+    regime is a PaiseRegime of arrays. Returns int64 columns in paise.
+    """
+    import numpy as np
+
+    taxable_income = round_income(np.asarray(taxable_income, dtype=np.int64))
+
+    i = np.searchsorted(regime.limits, taxable_income, side='left')
+    base_tax = _round_muldiv(taxable_income - regime.lower[i], regime.rates[i], PPM, regime.cumulative[i])
+
+    j = np.searchsorted(regime.thresholds, taxable_income, side='left')
+    surcharge = _round_muldiv(base_tax, regime.surcharge_rates[j], PPM)
+    if len(regime.thresholds):
+        # Marginal relief against the nearest threshold below
+        below = np.maximum(j - 1, 0)
+        cap = regime.capped[below] + taxable_income - regime.thresholds[below]
+        surcharge = np.where(j > 0, np.minimum(surcharge, cap - base_tax), surcharge)
+
+    cess = _round_muldiv(base_tax + surcharge, regime.cess_rate, PPM)
+    return {
+        'base_tax': base_tax,
+        'surcharge': surcharge,
+        'cess': cess,
+        'total_tax': round_tax(base_tax + surcharge + cess),
+        'taxable_income': taxable_income
+    }
+
+
+def calculate_tax_new_regime_paise_batch(annual_income, assessment_year=None):
+    """Vectorized equivalent of calculate_tax_new_regime_paise"""
+    import numpy as np
+
+    rules = _paise_batch_rules(get_rule_set(assessment_year))
+    taxable_income = np.asarray(annual_income, dtype=np.int64) - rules.standard_deduction
+    return calculate_tax_paise_batch(taxable_income, rules.new_regime)
+
+
+def calculate_tax_old_regime_paise_batch(annual_income, deductions, assessment_year=None):
+    """Vectorized equivalent of calculate_tax_old_regime_paise"""
+    import numpy as np
+
+    rules = _paise_batch_rules(get_rule_set(assessment_year))
+    taxable_income = np.asarray(annual_income, dtype=np.int64) - np.asarray(deductions, dtype=np.int64)
+    return calculate_tax_paise_batch(taxable_income, rules.old_regime)
+
+
+def calculate_capital_gains_tax_paise_batch(ltcg_by_quarter, stcg_by_quarter, assessment_year=None):
+    """Vectorized equivalent of calculate_capital_gains_tax_paise on (n, 4) arrays of paise"""
+    import numpy as np
+
+    rules = _paise_batch_rules(get_rule_set(assessment_year))
+
+    def running_totals(by_quarter):
+        # Quarter-major, so each quarter's running total is one contiguous row
+        by_quarter = np.asarray(by_quarter, dtype=np.int64)
+        running = np.empty((by_quarter.shape[1], by_quarter.shape[0]), dtype=np.int64)
+        running[0] = by_quarter[:, 0]
+        for q in range(1, len(running)):
+            np.add(running[q - 1], by_quarter[:, q], out=running[q])
+        return running
+
+    running_ltcg = running_totals(ltcg_by_quarter)
+    running_stcg = running_totals(stcg_by_quarter)
+
+    total_ltcg = running_ltcg[-1]
+    taxable_ltcg = np.maximum(0, total_ltcg - rules.ltcg_exemption)
+    ltcg_tax = _round_muldiv(taxable_ltcg, rules.ltcg_rate, PPM)
+    stcg_tax = _round_muldiv(running_stcg[-1], rules.stcg_rate, PPM)
+
+    # Apportion each annual tax by running totals so the quarters add up to it exactly
+    taxable = taxable_ltcg > 0
+    ltcg_allocated = np.where(taxable, _round_muldiv(running_ltcg, ltcg_tax, np.where(taxable, total_ltcg, 1)), 0)
+    stcg_allocated = _round_muldiv(running_stcg, rules.stcg_rate, PPM)
+
+    def quarterly(allocated):
+        tax = np.empty_like(allocated)
+        tax[0] = allocated[0]
+        np.subtract(allocated[1:], allocated[:-1], out=tax[1:])
+        return tax.T
+
+    quarter_ltcg_tax = quarterly(ltcg_allocated)
+    quarter_stcg_tax = quarterly(stcg_allocated)
+
+    return {
+        'ltcg_tax': ltcg_tax,
+        'stcg_tax': stcg_tax,
+        'total_cg_tax': ltcg_tax + stcg_tax,
+        'taxable_ltcg': taxable_ltcg,
+        'quarterly_ltcg_tax': quarter_ltcg_tax,
+        'quarterly_stcg_tax': quarter_stcg_tax,
+        'quarterly_tax': quarter_ltcg_tax + quarter_stcg_tax
+    }
+
+
+def compare_regimes_paise_batch(annual_income, deductions, ltcg_by_quarter, stcg_by_quarter, assessment_year=None):
+    """tax_engine.batch.compare_regimes_batch in exact int64 paise, from amounts in paise
+
+    Each regime's total_tax is the tax payable under Section 288B, capital
+    gains tax included, so tax_saving is a multiple of ten rupees.
+    """
+    import numpy as np
+
+    from tax_engine.batch import break_even_deduction_batch
+
+    annual_income = np.asarray(annual_income, dtype=np.int64)
+    new_regime_tax = calculate_tax_new_regime_paise_batch(annual_income, assessment_year)
+    old_regime_tax = calculate_tax_old_regime_paise_batch(annual_income, deductions, assessment_year)
+    cg_tax = calculate_capital_gains_tax_paise_batch(ltcg_by_quarter, stcg_by_quarter, assessment_year)
+
+    for regime_tax in (new_regime_tax, old_regime_tax):
+        regime_tax['total_tax'] = round_tax(
+            regime_tax['base_tax'] + regime_tax['surcharge'] + regime_tax['cess'] + cg_tax['total_cg_tax']
+        )
+
+    new_is_cheaper = new_regime_tax['total_tax'] < old_regime_tax['total_tax']
+    return {
+        'new_regime': new_regime_tax,
+        'old_regime': old_regime_tax,
+        'capital_gains': cg_tax,
+        'recommended_regime': np.where(new_is_cheaper, 'new', 'old'),
+        'tax_saving': np.abs(new_regime_tax['total_tax'] - old_regime_tax['total_tax']),
+        'break_even_deduction': to_paise_batch(break_even_deduction_batch(annual_income / 100, assessment_year))
+    }
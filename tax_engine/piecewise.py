@@ -0,0 +1,152 @@
+# tax_engine/piecewise.py
+"""Piecewise-linear functions over income.
+
+A PiecewiseLinear holds ascending breakpoints and, for each of the
+len(breakpoints) + 1 intervals, an intercept and slope. Intervals are
+upper-inclusive like the tax slabs: interval i covers
+(breakpoints[i - 1], breakpoints[i]], so it is found with bisect_left and
+evaluating the function is one binary search plus a multiply-add.
+"""
+from bisect import bisect_left, bisect_right
+from typing import NamedTuple
+
+
+class PiecewiseLinear(NamedTuple):
+    breakpoints: tuple
+    intercepts: tuple
+    slopes: tuple
+
+
+def evaluate(function, x):
+    i = bisect_left(function.breakpoints, x)
+    return function.intercepts[i] + function.slopes[i] * x
+
+
+def shift(function, offset):
+    """Return g(x) = function(x - offset)"""
+    return PiecewiseLinear(
+        tuple(b + offset for b in function.breakpoints),
+        tuple(c - s * offset for c, s in zip(function.intercepts, function.slopes)),
+        function.slopes
+    )
+
+
+def right_limits(function):
+    """Value just to the right of each breakpoint, i.e. at the start of the next interval"""
+    return tuple(function.intercepts[i + 1] + function.slopes[i + 1] * b
+                 for i, b in enumerate(function.breakpoints))
+
+
+def breakpoint_values(function):
+    """Value at each breakpoint, which belongs to the interval it closes"""
+    return tuple(evaluate(function, b) for b in function.breakpoints)
+
+
+def locate_inverse(function, y, values=None):
+    """Find the interval holding the largest x with function(x) <= y
+
+    For a non-decreasing function with upward jumps allowed. Returns (i,
+    pinned): pinned is True when y falls inside the jump at the start of
+    interval i, so the answer is breakpoints[i - 1] rather than a point on
+    interval i's line. values can pass in a precomputed breakpoint_values().
+    """
+    if values is None:
+        values = breakpoint_values(function)
+    i = bisect_right(values, y)
+    pinned = i > 0 and y < function.intercepts[i] + function.slopes[i] * function.breakpoints[i - 1]
+    if not pinned and function.slopes[i] == 0:
+        raise ValueError(f"No largest x with function(x) <= {y}")
+    return i, pinned
+
+
+def inverse(function, y, values=None):
+    """Largest x with function(x) <= y, for a non-decreasing function"""
+    i, pinned = locate_inverse(function, y, values)
+    if pinned:
+        return function.breakpoints[i - 1]
+    return (y - function.intercepts[i]) / function.slopes[i]
+
+
+class RegimeFunction(NamedTuple):
+    """One regime's tax as piecewise-linear functions of taxable income
+
+    All four components share the same breakpoints, so a single binary search
+    finds the interval for every one of them.
+    """
+    base: PiecewiseLinear
+    surcharge: PiecewiseLinear
+    cess: PiecewiseLinear
+    total: PiecewiseLinear
+
+
+def evaluate_regime(function, x):
+    """Return (base, surcharge, cess, total) at x"""
+    i = bisect_left(function.total.breakpoints, x)
+    return tuple(component.intercepts[i] + component.slopes[i] * x for component in function)
+
+
+def compile_regime(slabs, surcharge, cess_rate):
+    """Compile a SlabTable and SurchargeTable into a RegimeFunction
+
+    Marginal relief is applied above every surcharge threshold: tax plus
+    surcharge on income x above threshold T may not exceed the tax plus
+    surcharge on T itself by more than x - T. That cap has slope 1 and the
+    surcharged slab tax a smaller one, so the cap binds from T up to the
+    single point where the two lines cross, which becomes a breakpoint.
+    """
+    def slab_line(x):
+        slab = bisect_left(slabs.limits, x)
+        rate = slabs.rates[slab]
+        return slabs.cumulative[slab] - slabs.lower[slab] * rate, rate
+
+    def surcharge_rate(x):
+        return surcharge.rates[bisect_left(surcharge.thresholds, x)]
+
+    def charged(x):
+        intercept, slope = slab_line(x)
+        return (intercept + slope * x) * (1 + surcharge_rate(x))
+
+    points = sorted(set(slabs.limits) | set(surcharge.thresholds))
+
+    # (threshold, end of relief, intercept of the x - T cap line) per threshold
+    relief = []
+    for k, threshold in enumerate(surcharge.thresholds):
+        next_threshold = surcharge.thresholds[k + 1] if k + 1 < len(surcharge.thresholds) else float('inf')
+        cap_intercept = charged(threshold) - threshold
+        rate = surcharge.rates[k + 1]
+        end = next_threshold
+        bounds = [threshold] + [p for p in points if threshold < p < next_threshold] + [next_threshold]
+        for lower, upper in zip(bounds, bounds[1:]):
+            intercept, slope = slab_line(upper if upper != float('inf') else lower + 1)
+            crossing = (cap_intercept - intercept * (1 + rate)) / (slope * (1 + rate) - 1)
+            if lower < crossing <= upper:
+                end = crossing
+                break
+        relief.append((threshold, end, cap_intercept))
+
+    breakpoints = tuple(sorted(set(points) | {end for _, end, _ in relief if end != float('inf')}))
+    components = {'base': ([], []), 'surcharge': ([], []), 'cess': ([], []), 'total': ([], [])}
+    for i in range(len(breakpoints) + 1):
+        # Intervals are upper-inclusive, so the upper breakpoint identifies each one
+        x = breakpoints[i] if i < len(breakpoints) else breakpoints[-1] + 1
+        base = slab_line(x)
+        rate = surcharge_rate(x)
+        charged_line = (base[0] * (1 + rate), base[1] * (1 + rate))
+        for threshold, end, cap_intercept in relief:
+            if threshold < x <= end:
+                charged_line = (cap_intercept, 1.0)
+
+        lines = {
+            'base': base,
+            'surcharge': (charged_line[0] - base[0], charged_line[1] - base[1]),
+            'cess': (charged_line[0] * cess_rate, charged_line[1] * cess_rate),
+            'total': (charged_line[0] * (1 + cess_rate), charged_line[1] * (1 + cess_rate)),
+        }
+        for name, (intercept, slope) in lines.items():
+            components[name][0].append(intercept)
+            components[name][1].append(slope)
+
+    return RegimeFunction(**{
+        name: PiecewiseLinear(breakpoints, tuple(intercepts), tuple(slopes))
+        for name, (intercepts, slopes) in components.items()
+    })
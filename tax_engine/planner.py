@@ -0,0 +1,166 @@
+# tax_engine/planner.py
+"""Splitting an investment budget across Sections 80C, 80D and 80CCD(1B).
+
+Every rupee claimed under any of the three sections comes off the same
+old-regime taxable income, so the tax depends only on the total newly
+invested, d, between 0 and the smaller of the budget and the headroom left
+under the limits. Old-regime tax is piecewise linear in taxable income, so
+over that range it is smallest at an end or where taxable income lands on
+one of the regime's breakpoints. Those few corner points are all that is
+evaluated, and the smallest d reaching the lowest tax is kept: beyond it,
+for example once income falls into the zero-rate slab, more investment
+saves nothing. The result is then compared with the new regime, which
+allows none of these deductions.
+
+d is filled section by section in DeductionLimits order; any split of the
+same total costs the same tax. optimize_deductions_batch is the vectorized
+version; it imports NumPy when called.
+"""
+from tax_engine.piecewise import evaluate
+from tax_engine.results import DeductionPlan
+from tax_engine.rules import get_rule_set
+
+SENIOR_CITIZEN_AGE = 60
+
+# Filled in this order; the keys of current_deductions
+SECTIONS = ('80C', '80D', '80CCD')
+
+# Tax totals closer than half a paisa count as equal
+TIE_TOLERANCE = 0.005
+
+
+def section_limits(rules, age):
+    """Section name -> limit for a taxpayer of this age"""
+    limits = rules.deduction_limits
+    section_80d = limits.section_80d_senior if age >= SENIOR_CITIZEN_AGE else limits.section_80d
+    return {'80C': limits.section_80c, '80D': section_80d, '80CCD': limits.section_80ccd}
+
+
+def candidate_investments(taxable_income, cap, breakpoints):
+    """Amounts between 0 and cap at which old-regime tax can be lowest"""
+    candidates = {0.0, cap}
+    for breakpoint in breakpoints:
+        if 0 < taxable_income - breakpoint < cap:
+            candidates.add(taxable_income - breakpoint)
+    return sorted(candidates)
+
+
+def optimize_deductions(annual_income, age, budget, current_deductions=None, other_deductions=0.0,
+                        assessment_year=None):
+    """Tax-minimizing use of budget across 80C, 80D and 80CCD(1B), and the regime to pick
+
+    current_deductions maps '80C', '80D' and '80CCD' to amounts already
+    claimed; other_deductions is any other old-regime deduction (HRA, home
+    loan interest). Returns a DeductionPlan; under the new regime nothing is
+    invested, since it allows none of these deductions.
+    """
+    if budget < 0:
+        raise ValueError(f"Budget must not be negative, not {budget!r}")
+    rules = get_rule_set(assessment_year)
+    current_deductions = current_deductions or {}
+    limits = section_limits(rules, age)
+    claimed = {section: min(current_deductions.get(section, 0.0), limit) for section, limit in limits.items()}
+    headroom = {section: limit - claimed[section] for section, limit in limits.items()}
+
+    taxable_income = annual_income - other_deductions - sum(claimed.values())
+    cap = min(budget, sum(headroom.values()))
+    totals = [(evaluate(rules.old_tax.total, taxable_income - d), d)
+              for d in candidate_investments(taxable_income, cap, rules.old_tax.total.breakpoints)]
+    lowest = min(total for total, _ in totals)
+    old_regime_tax, invested = next((total, d) for total, d in totals if total <= lowest + TIE_TOLERANCE)
+    new_regime_tax = evaluate(rules.new_tax.total, annual_income - rules.standard_deduction)
+    tax_before = min(new_regime_tax, totals[0][0])
+
+    allocation = dict.fromkeys(SECTIONS, 0.0)
+    regime = 'new' if new_regime_tax <= old_regime_tax else 'old'
+    if regime == 'old':
+        remaining = invested
+        for section in SECTIONS:
+            allocation[section] = min(remaining, headroom[section])
+            remaining -= allocation[section]
+    else:
+        invested = 0.0
+    total_tax = min(new_regime_tax, old_regime_tax)
+
+    return DeductionPlan(
+        regime=regime,
+        section_80c=allocation['80C'],
+        section_80d=allocation['80D'],
+        section_80ccd=allocation['80CCD'],
+        invested=invested,
+        new_regime_tax=new_regime_tax,
+        old_regime_tax=old_regime_tax,
+        total_tax=total_tax,
+        tax_saving=tax_before - total_tax
+    )
+
+
+def optimize_deductions_batch(annual_income, age, budget, current_deductions=None, other_deductions=0.0,
+                              assessment_year=None):
+    """Vectorized equivalent of optimize_deductions
+
+    current_deductions maps '80C', '80D' and '80CCD' to arrays (or scalars)
+    of amounts already claimed. Returns a column bundle with the fields of a
+    DeductionPlan, so tax_engine.batch.record_at(plan, i, DeductionPlan)
+    gives row i.
+    """
+    import numpy as np
+
+    from tax_engine.batch import calculate_tax_new_regime_batch, get_batch_rule_set
+
+    rules = get_batch_rule_set(assessment_year)
+    annual_income = np.asarray(annual_income, dtype=np.float64)
+    budget = np.broadcast_to(np.asarray(budget, dtype=np.float64), annual_income.shape)
+    if (budget < 0).any():
+        raise ValueError("Budget must not be negative")
+    current_deductions = current_deductions or {}
+    limits = rules.deduction_limits
+    senior = np.asarray(age) >= SENIOR_CITIZEN_AGE
+    section_limits = {
+        '80C': limits.section_80c,
+        '80D': np.where(senior, limits.section_80d_senior, limits.section_80d),
+        '80CCD': limits.section_80ccd,
+    }
+    claimed = {section: np.minimum(np.asarray(current_deductions.get(section, 0.0), dtype=np.float64), limit)
+               for section, limit in section_limits.items()}
+    headroom = {section: np.broadcast_to(limit - claimed[section], annual_income.shape)
+                for section, limit in section_limits.items()}
+
+    taxable_income = annual_income - other_deductions - sum(claimed.values())
+    cap = np.minimum(budget, sum(headroom.values()))
+
+    # Corner points per row: no investment, the whole cap, and each breakpoint reached in between
+    old_total = rules.old_tax.total
+    candidates = np.column_stack([
+        np.zeros_like(cap), np.clip(taxable_income[:, None] - old_total.breakpoints, 0.0, cap[:, None]), cap
+    ])
+    remaining_income = taxable_income[:, None] - candidates
+    i = np.searchsorted(old_total.breakpoints, remaining_income, side='left')
+    totals = old_total.intercepts[i] + old_total.slopes[i] * remaining_income
+    lowest = totals.min(axis=1, keepdims=True)
+    best = np.where(totals <= lowest + TIE_TOLERANCE, candidates, np.inf).argmin(axis=1)
+    rows = np.arange(len(annual_income))
+    old_regime_tax = totals[rows, best]
+    new_regime_tax = calculate_tax_new_regime_batch(annual_income, assessment_year)['total_tax']
+    tax_before = np.minimum(new_regime_tax, totals[:, 0])
+
+    use_old = new_regime_tax > old_regime_tax
+    invested = np.where(use_old, candidates[rows, best], 0.0)
+    remaining = invested
+    allocation = {}
+    for section in SECTIONS:
+        allocation[section] = np.minimum(remaining, headroom[section])
+        remaining = remaining - allocation[section]
+    total_tax = np.minimum(new_regime_tax, old_regime_tax)
+
+    return {
+        'regime': np.where(use_old, 'old', 'new'),
+        'section_80c': allocation['80C'],
+        'section_80d': allocation['80D'],
+        'section_80ccd': allocation['80CCD'],
+        'invested': invested,
+        'new_regime_tax': new_regime_tax,
+        'old_regime_tax': old_regime_tax,
+        'total_tax': total_tax,
+        'tax_saving': tax_before - total_tax
+    }
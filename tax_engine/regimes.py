@@ -0,0 +1,21 @@
+# tax_engine/regimes.py
+from tax_engine.piecewise import evaluate_regime
+from tax_engine.results import TaxBreakdown
+from tax_engine.rules import get_rule_set
+
+
+def _tax_breakdown(taxable_income, regime_function):
+    # Slabs, surcharge with marginal relief and cess in one lookup
+    tax, surcharge, cess, total_tax = evaluate_regime(regime_function, taxable_income)
+    
+    return TaxBreakdown(tax, surcharge, cess, total_tax, taxable_income)
+
+def calculate_tax_new_regime(annual_income, assessment_year=None):
+    rules = get_rule_set(assessment_year)
+    taxable_income = annual_income - rules.standard_deduction
+    return _tax_breakdown(taxable_income, rules.new_tax)
+
+def calculate_tax_old_regime(annual_income, deductions, assessment_year=None):
+    rules = get_rule_set(assessment_year)
+    taxable_income = annual_income - deductions
+    return _tax_breakdown(taxable_income, rules.old_tax)
@@ -0,0 +1,464 @@
+# tax_engine/reports.py
+"""Bulk per-employee tax statements, written into one zip file.
+
+Each statement carries what the Tax Calculator page shows after Calculate:
+the regime comparison and breakdown charts, both regimes' figures, the
+quarter-wise capital gains tax and the advance tax schedule. It is rendered
+as a self-contained HTML page or as an Excel workbook (which needs
+xlsxwriter).
+
+The charts keep the titles, sizes and colours of the utils.py figures
+(tax_engine.chart_styles) as static images: inline SVG in HTML, native
+charts in Excel, since building a plotly figure per employee costs several
+times more than the rest of a statement. The figures themselves are worked
+out once per chunk by the batch calculators (chunk_statements), and each
+statement is rendered from its row of the results.
+
+Input is a batch payroll file (CSV or Parquet, the columns the batch
+command reads plus an optional employee_id) read in chunks. Chunks are
+rendered across a process pool and their statements written to the zip in
+input order as they finish, with a bounded window of chunks in flight, so
+memory depends on the chunk size and worker count and not on the
+workforce.
+"""
+import html
+import io
+import math
+import re
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from tax_engine.advance_tax import calculate_advance_tax_schedule_batch, installment_windows
+from tax_engine.chart_styles import BREAKDOWN_PIES, COMPARISON_CHART, COMPONENTS
+from tax_engine.results import CapitalGainsTax, InstallmentDue, QuarterlyCapitalGainsTax, TaxBreakdown
+from tax_engine.rules import get_rule_set
+from tax_engine.streaming import QUARTERS, compute_result_columns, iter_payloads, numeric_column, parse_csv_records
+
+REPORT_FORMATS = ('html', 'xlsx')
+
+# Statements per shard; each is tens of kilobytes, so shards stay small
+DEFAULT_REPORT_CHUNK_SIZE = 500
+
+
+def _require_xlsxwriter():
+    try:
+        import xlsxwriter
+    except ImportError:
+        raise RuntimeError("Excel statements need xlsxwriter: pip install xlsxwriter") from None
+    return xlsxwriter
+
+
+def chunk_statements(annual_income, deductions, ltcg, stcg, assessment_year=None):
+    """Statement figures for arrays of employees, from one pass of the batch calculators
+
+    ltcg and stcg are (n, 4) arrays in advance tax quarter order. Returns a
+    dict per employee holding the records the Tax Calculator page shows.
+    """
+    rules = get_rule_set(assessment_year)
+    quarters = tuple(installment.quarter for installment in rules.advance_tax)
+    quarter_names = installment_windows(rules.assessment_year)
+    results = compute_result_columns(annual_income, deductions, ltcg, stcg, rules.assessment_year, details=True)
+    cg_by_quarter = results['quarterly_ltcg_tax'] + results['quarterly_stcg_tax']
+    # The schedule follows the new regime as on the page
+    schedule = calculate_advance_tax_schedule_batch(results['new_total_tax'], cg_by_quarter,
+                                                    assessment_year=rules.assessment_year)
+    columns = {name: values.tolist() for name, values in results.items()}
+    columns['cg_by_quarter'] = cg_by_quarter.tolist()
+    for name, values in (('annual_income', annual_income), ('deductions', deductions), ('ltcg', ltcg), ('stcg', stcg)):
+        columns[name] = np.asarray(values).tolist()
+    for key in ('regular_tax', 'capital_gains_tax', 'total_amount'):
+        columns[f'advance_{key}'] = schedule[key].tolist()
+
+    statements = []
+    for i in range(len(columns['annual_income'])):
+        cg_total = columns['total_cg_tax'][i]
+        # The regime records hold the tax on income alone, as the page's do
+        regimes = {
+            prefix: TaxBreakdown(
+                columns[f'{prefix}_base_tax'][i], columns[f'{prefix}_surcharge'][i], columns[f'{prefix}_cess'][i],
+                columns[f'{prefix}_total_tax'][i] - cg_total, columns[f'{prefix}_taxable_income'][i]
+            )
+            for prefix in ('new', 'old')
+        }
+        quarterly = tuple(QuarterlyCapitalGainsTax(ltcg_tax, stcg_tax, total) for ltcg_tax, stcg_tax, total in zip(
+            columns['quarterly_ltcg_tax'][i], columns['quarterly_stcg_tax'][i], columns['cg_by_quarter'][i]))
+        advance_tax, previous = [], 0
+        for q, installment in enumerate(rules.advance_tax):
+            advance_tax.append(InstallmentDue(
+                installment.due_date, installment.percentage, installment.percentage - previous,
+                columns['advance_regular_tax'][i][q], columns['advance_capital_gains_tax'][i][q],
+                columns['advance_total_amount'][i][q]
+            ))
+            previous = installment.percentage
+        statements.append({
+            'rules': rules,
+            'annual_income': columns['annual_income'][i],
+            'deductions': columns['deductions'][i],
+            'ltcg': dict(zip(quarters, columns['ltcg'][i])),
+            'stcg': dict(zip(quarters, columns['stcg'][i])),
+            'quarter_names': quarter_names,
+            'new_regime': regimes['new'],
+            'old_regime': regimes['old'],
+            'capital_gains': CapitalGainsTax(columns['ltcg_tax'][i], columns['stcg_tax'][i], cg_total,
+                                             columns['taxable_ltcg'][i], quarters, quarterly),
+            'totals': {
+                'new_regime': columns['new_total_tax'][i],
+                'old_regime': columns['old_total_tax'][i],
+                'recommended_regime': columns['recommended_regime'][i],
+                'tax_saving': columns['tax_saving'][i],
+            },
+            'advance_tax': advance_tax,
+        })
+    return statements
+
+
+def _rupees(amount):
+    return f"₹{amount:,.2f}"
+
+
+def _nice_step(peak, ticks=5):
+    raw = peak / ticks
+    magnitude = 10 ** math.floor(math.log10(raw))
+    return magnitude * next(m for m in (1, 2, 5, 10) if m * magnitude >= raw)
+
+
+def _axis_label(value):
+    for size, suffix in ((1e9, 'B'), (1e6, 'M'), (1e3, 'k')):
+        if value >= size:
+            return f"{round(value / size, 6):g}{suffix}"
+    return f"{value:g}"
+
+
+def _svg(width, height, title, body):
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'viewBox="0 0 {width} {height}" font-family="Arial, sans-serif" font-size="12" fill="#444">'
+            f'<text x="20" y="30" font-size="17">{html.escape(title)}</text>{"".join(body)}</svg>')
+
+
+def bar_chart_svg(style, values, width=700):
+    """create_tax_comparison_chart as SVG; values holds one list per series in style"""
+    height = style['height']
+    left, right, top, bottom = 70, 20, 60, 70
+    plot_width, plot_height = width - left - right, height - top - bottom
+    peak = max(max(series) for series in values)
+    step = _nice_step(peak) if peak > 0 else 1
+    axis_top = step * max(math.ceil(peak / step), 1)
+
+    body = []
+    for i in range(int(round(axis_top / step)) + 1):
+        y = top + plot_height - i * step / axis_top * plot_height
+        body.append(f'<line x1="{left}" y1="{y:.1f}" x2="{width - right}" y2="{y:.1f}" stroke="#e5e5e5"/>'
+                    f'<text x="{left - 8}" y="{y + 4:.1f}" text-anchor="end">{_axis_label(i * step)}</text>')
+    group = plot_width / len(style['categories'])
+    bar = group * 0.8 / len(style['series'])
+    for i, category in enumerate(style['categories']):
+        for j, (_, color) in enumerate(style['series']):
+            bar_height = max(values[j][i], 0) / axis_top * plot_height
+            x = left + i * group + group * 0.1 + j * bar
+            body.append(f'<rect x="{x:.1f}" y="{top + plot_height - bar_height:.1f}" width="{bar:.1f}" '
+                        f'height="{bar_height:.1f}" fill="{color}"/>')
+        body.append(f'<text x="{left + (i + 0.5) * group:.1f}" y="{top + plot_height + 18}" '
+                    f'text-anchor="middle">{html.escape(category)}</text>')
+    x = left
+    for name, color in style['series']:
+        body.append(f'<rect x="{x}" y="{height - 28}" width="12" height="12" fill="{color}"/>'
+                    f'<text x="{x + 18}" y="{height - 18}">{html.escape(name)}</text>')
+        x += 30 + 8 * len(name)
+    return _svg(width, height, style['title'], body)
+
+
+def _point(cx, cy, radius, angle):
+    return cx + radius * math.sin(angle), cy - radius * math.cos(angle)
+
+
+def pie_chart_svg(style, values, width=350):
+    """create_tax_breakdown_pie as SVG: a donut clockwise from twelve o'clock, with percentages"""
+    height = style['height']
+    radius = min(width * 0.6, height - 60) / 2 - 10
+    inner = radius * style['hole']
+    cx, cy = 20 + radius, 50 + (height - 50) / 2
+    total = sum(value for value in values if value > 0)
+
+    body = []
+    if total <= 0:
+        body.append(f'<circle cx="{cx:.1f}" cy="{cy:.1f}" r="{radius:.1f}" fill="#eee"/>'
+                    f'<text x="{cx:.1f}" y="{cy + 4:.1f}" text-anchor="middle">No tax</text>')
+    angle = 0.0
+    for value, color in zip(values, style['colors']):
+        if total <= 0 or value <= 0:
+            continue
+        share = value / total
+        if share >= 1:
+            # A single slice is a full ring, which one arc can't draw
+            path = (f'M{cx - radius:.1f},{cy:.1f}a{radius:.1f},{radius:.1f} 0 1 0 {2 * radius:.1f},0'
+                    f'a{radius:.1f},{radius:.1f} 0 1 0 {-2 * radius:.1f},0Z'
+                    f'M{cx - inner:.1f},{cy:.1f}a{inner:.1f},{inner:.1f} 0 1 0 {2 * inner:.1f},0'
+                    f'a{inner:.1f},{inner:.1f} 0 1 0 {-2 * inner:.1f},0Z')
+        else:
+            end = angle + share * 2 * math.pi
+            large = 1 if share > 0.5 else 0
+            (x1, y1), (x2, y2) = _point(cx, cy, radius, angle), _point(cx, cy, radius, end)
+            (x3, y3), (x4, y4) = _point(cx, cy, inner, end), _point(cx, cy, inner, angle)
+            path = (f'M{x1:.1f},{y1:.1f}A{radius:.1f},{radius:.1f} 0 {large} 1 {x2:.1f},{y2:.1f}'
+                    f'L{x3:.1f},{y3:.1f}A{inner:.1f},{inner:.1f} 0 {large} 0 {x4:.1f},{y4:.1f}Z')
+        body.append(f'<path d="{path}" fill="{color}" fill-rule="evenodd" stroke="#fff"/>')
+        if share >= 0.04:
+            x, y = _point(cx, cy, (radius + inner) / 2, angle + share * math.pi)
+            body.append(f'<text x="{x:.1f}" y="{y + 4:.1f}" text-anchor="middle" fill="#fff">{share:.1%}</text>')
+        angle += share * 2 * math.pi
+    legend_x = cx + radius + 25
+    for i, (label, color) in enumerate(zip(style['labels'], style['colors'])):
+        y = 70 + i * 20
+        body.append(f'<rect x="{legend_x:.1f}" y="{y}" width="12" height="12" fill="{color}"/>'
+                    f'<text x="{legend_x + 18:.1f}" y="{y + 10}">{html.escape(label)}</text>')
+    return _svg(width, height, style['title'], body)
+
+
+_HTML_STYLE = (
+    "body{font-family:Arial,sans-serif;color:#222;max-width:760px;margin:24px auto;padding:0 16px}"
+    "h1{font-size:24px;margin-bottom:4px}h2{font-size:19px;margin-top:28px}"
+    ".columns{display:flex;gap:24px;flex-wrap:wrap}.columns>div{flex:1;min-width:320px}"
+    "table{border-collapse:collapse;width:100%}th,td{border-bottom:1px solid #ddd;padding:6px;text-align:right}"
+    "th:first-child,td:first-child{text-align:left}.note{background:#e8f4ea;padding:12px;border-radius:6px}"
+)
+
+
+def _regime_html(name, tax, cg_tax, total, chart):
+    return (f"<div><h3>{name}</h3><ul>"
+            f"<li>Taxable Income: {_rupees(tax.taxable_income)}</li>"
+            f"<li>Base Tax: {_rupees(tax.base_tax)}</li>"
+            f"<li>Surcharge: {_rupees(tax.surcharge)}</li>"
+            f"<li>Cess: {_rupees(tax.cess)}</li>"
+            f"<li>Tax on Income: {_rupees(tax.total_tax)}</li>"
+            f"<li>Capital Gains Tax: {_rupees(cg_tax.total_cg_tax)}</li>"
+            f"<li><b>Total Tax: {_rupees(total)}</b></li></ul>{chart}</div>")
+
+
+def render_html(employee_id, data):
+    """A statement as a standalone HTML page"""
+    rules, totals, cg_tax = data['rules'], data['totals'], data['capital_gains']
+    new_regime_tax, old_regime_tax = data['new_regime'], data['old_regime']
+    comparison = bar_chart_svg(COMPARISON_CHART, [
+        [getattr(tax, key) for _, key in COMPONENTS] + [tax.total_tax] for tax in (new_regime_tax, old_regime_tax)
+    ])
+    parts = [
+        f"<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+        f"<title>Tax statement {html.escape(employee_id)}</title><style>{_HTML_STYLE}</style></head><body>",
+        f"<h1>Income Tax Statement</h1><p>Employee {html.escape(employee_id)} &middot; "
+        f"Assessment Year {rules.assessment_year} &middot; Annual income {_rupees(data['annual_income'])} &middot; "
+        f"Old regime deductions {_rupees(data['deductions'])}</p>",
+        f"<h2>Tax Analysis</h2>{comparison}<div class=\"columns\">",
+        _regime_html('New Tax Regime', new_regime_tax, cg_tax, totals['new_regime'],
+                     pie_chart_svg(BREAKDOWN_PIES['New'], [getattr(new_regime_tax, key) for _, key in COMPONENTS])),
+        _regime_html('Old Tax Regime', old_regime_tax, cg_tax, totals['old_regime'],
+                     pie_chart_svg(BREAKDOWN_PIES['Old'], [getattr(old_regime_tax, key) for _, key in COMPONENTS])),
+        "</div>",
+    ]
+
+    total_ltcg, total_stcg = sum(data['ltcg'].values()), sum(data['stcg'].values())
+    if total_ltcg > 0 or total_stcg > 0:
+        parts.append(
+            f"<h2>Capital Gains Tax Breakdown (Quarter-wise)</h2><div class=\"columns\">"
+            f"<div><b>Long Term Capital Gains</b><ul><li>Total LTCG: {_rupees(total_ltcg)}</li>"
+            f"<li>Exemption: {_rupees(rules.ltcg_exemption)}</li>"
+            f"<li>Taxable LTCG: {_rupees(cg_tax.taxable_ltcg)}</li>"
+            f"<li>LTCG Tax ({rules.ltcg_rate * 100:g}%): {_rupees(cg_tax.ltcg_tax)}</li></ul></div>"
+            f"<div><b>Short Term Capital Gains</b><ul><li>Total STCG: {_rupees(total_stcg)}</li>"
+            f"<li>STCG Tax ({rules.stcg_rate * 100:g}%): {_rupees(cg_tax.stcg_tax)}</li></ul></div></div>"
+            f"<p><b>Total Capital Gains Tax: {_rupees(cg_tax.total_cg_tax)}</b></p>"
+            f"<table><tr><th>Quarter</th><th>LTCG</th><th>STCG</th><th>Tax</th></tr>"
+        )
+        for q, tax in cg_tax.quarterly_tax.items():
+            parts.append(f"<tr><td>{data['quarter_names'][q]}</td><td>{_rupees(data['ltcg'][q])}</td>"
+                         f"<td>{_rupees(data['stcg'][q])}</td><td>{_rupees(tax.total)}</td></tr>")
+        parts.append("</table>")
+
+    parts.append("<h2>Advance Tax Schedule</h2><table><tr><th>Due Date</th><th>Regular Tax</th>"
+                 "<th>Capital Gains Tax</th><th>Total Amount</th><th>Cumulative %</th></tr>")
+    for entry in data['advance_tax']:
+        parts.append(f"<tr><td>{entry.due_date}</td><td>{_rupees(entry.regular_tax)}</td>"
+                     f"<td>{_rupees(entry.capital_gains_tax)}</td><td>{_rupees(entry.total_amount)}</td>"
+                     f"<td>{entry.percentage}%</td></tr>")
+    regime = 'New' if totals['recommended_regime'] == 'new' else 'Old'
+    parts.append(f"</table><p class=\"note\">Recommendation: choose the <b>{regime} Tax Regime</b>. "
+                 f"You will save {_rupees(totals['tax_saving'])}.</p></body></html>")
+    return ''.join(parts).encode('utf-8')
+
+
+def render_xlsx(employee_id, data):
+    """A statement as an Excel workbook, with native charts in the utils.py styles"""
+    xlsxwriter = _require_xlsxwriter()
+    rules, totals, cg_tax = data['rules'], data['totals'], data['capital_gains']
+    new_regime_tax, old_regime_tax = data['new_regime'], data['old_regime']
+
+    buffer = io.BytesIO()
+    workbook = xlsxwriter.Workbook(buffer, {'in_memory': True})
+    sheet = workbook.add_worksheet('Statement')
+    bold = workbook.add_format({'bold': True})
+    title = workbook.add_format({'bold': True, 'font_size': 16})
+    money = workbook.add_format({'num_format': '₹#,##0.00'})
+    sheet.set_column(0, 0, 26)
+    sheet.set_column(1, 4, 18, money)
+
+    sheet.write(0, 0, 'Income Tax Statement', title)
+    sheet.write_row(1, 0, ['Employee', employee_id])
+    sheet.write_row(2, 0, ['Assessment Year', rules.assessment_year])
+    sheet.write_row(3, 0, ['Annual Income', data['annual_income']])
+    sheet.write_row(4, 0, ['Old Regime Deductions', data['deductions']])
+
+    # Rows 7-11: the regime comparison, which the charts below are drawn from
+    sheet.write_row(6, 0, ['', 'New Tax Regime', 'Old Tax Regime'], bold)
+    sheet.write_row(7, 0, ['Taxable Income', new_regime_tax.taxable_income, old_regime_tax.taxable_income])
+    for row, (label, key) in enumerate(COMPONENTS, start=8):
+        sheet.write_row(row, 0, [label, getattr(new_regime_tax, key), getattr(old_regime_tax, key)])
+    sheet.write_row(11, 0, [COMPARISON_CHART['categories'][-1], new_regime_tax.total_tax, old_regime_tax.total_tax])
+    sheet.write_row(12, 0, ['Total Tax with Capital Gains', totals['new_regime'], totals['old_regime']], bold)
+    regime = 'New' if totals['recommended_regime'] == 'new' else 'Old'
+    sheet.write(13, 0, f"Recommendation: choose the {regime} Tax Regime", bold)
+    sheet.write(13, 1, totals['tax_saving'], money)
+
+    row = 15
+    total_ltcg, total_stcg = sum(data['ltcg'].values()), sum(data['stcg'].values())
+    if total_ltcg > 0 or total_stcg > 0:
+        sheet.write(row, 0, 'Capital Gains Tax (Quarter-wise)', bold)
+        sheet.write_row(row + 1, 0, ['Quarter', 'LTCG', 'STCG', 'Tax'], bold)
+        row += 2
+        for q, tax in cg_tax.quarterly_tax.items():
+            sheet.write_row(row, 0, [data['quarter_names'][q], data['ltcg'][q], data['stcg'][q], tax.total])
+            row += 1
+        sheet.write_row(row, 0, [f"LTCG Tax ({rules.ltcg_rate * 100:g}%)", cg_tax.ltcg_tax])
+        sheet.write_row(row + 1, 0, [f"STCG Tax ({rules.stcg_rate * 100:g}%)", cg_tax.stcg_tax])
+        sheet.write_row(row + 2, 0, ['Total Capital Gains Tax', cg_tax.total_cg_tax], bold)
+        row += 4
+
+    sheet.write(row, 0, 'Advance Tax Schedule', bold)
+    sheet.write_row(row + 1, 0, ['Due Date', 'Regular Tax', 'Capital Gains Tax', 'Total Amount', 'Cumulative %'],
+                    bold)
+    for i, entry in enumerate(data['advance_tax'], start=row + 2):
+        sheet.write_row(i, 0, [entry.due_date, entry.regular_tax, entry.capital_gains_tax, entry.total_amount,
+                               f"{entry.percentage}%"])
+
+    comparison_style = COMPARISON_CHART
+    comparison = workbook.add_chart({'type': 'column'})
+    for column, (name, color) in enumerate(comparison_style['series'], start=1):
+        comparison.add_series({
+            'name': name,
+            'categories': ['Statement', 8, 0, 11, 0],
+            'values': ['Statement', 8, column, 11, column],
+            'fill': {'color': color},
+        })
+    comparison.set_title({'name': comparison_style['title']})
+    comparison.set_size({'width': 700, 'height': comparison_style['height']})
+    sheet.insert_chart('G2', comparison)
+    for column, regime in enumerate(('New', 'Old'), start=1):
+        style = BREAKDOWN_PIES[regime]
+        pie = workbook.add_chart({'type': 'doughnut'})
+        pie.add_series({
+            'categories': ['Statement', 8, 0, 10, 0],
+            'values': ['Statement', 8, column, 10, column],
+            'points': [{'fill': {'color': color}} for color in style['colors']],
+            'data_labels': {'percentage': True},
+        })
+        pie.set_hole_size(max(10, int(style['hole'] * 100)))
+        pie.set_title({'name': style['title']})
+        pie.set_size({'width': 350, 'height': style['height']})
+        sheet.insert_chart(22, 6 + (column - 1) * 6, pie)
+
+    workbook.close()
+    return buffer.getvalue()
+
+
+_RENDERERS = {'html': render_html, 'xlsx': render_xlsx}
+
+
+def _file_stem(employee_id):
+    return re.sub(r'[^\w.-]', '_', employee_id).strip('.') or 'employee'
+
+
+def render_chunk(payload, first_row, report_format='html', assessment_year=None):
+    """Render one shard's statements; runs in a worker process when parallel
+
+    payload is a (header, records) pair of raw CSV or a dict of columns.
+    Returns (file stem, statement bytes) per row; rows without an
+    employee_id are named by their row number in the input.
+    """
+    render = _RENDERERS[report_format]
+    columns = parse_csv_records(*payload) if isinstance(payload, tuple) else payload
+    size = len(columns['annual_income'])
+    statements = chunk_statements(
+        numeric_column(columns, 'annual_income', size), numeric_column(columns, 'deductions', size),
+        np.column_stack([numeric_column(columns, f'ltcg_{q}', size) for q in QUARTERS]),
+        np.column_stack([numeric_column(columns, f'stcg_{q}', size) for q in QUARTERS]),
+        assessment_year
+    )
+    ids = columns.get('employee_id')
+
+    rendered = []
+    for i, data in enumerate(statements):
+        employee_id = str(ids[i]) if ids is not None and str(ids[i]) != '' else f'row-{first_row + i + 1}'
+        rendered.append((_file_stem(employee_id), render(employee_id, data)))
+    return rendered
+
+
+def _iter_rendered(payloads, chunk_size, report_format, workers, assessment_year):
+    """Yield each shard's rendered statements in input order, serially or via a process pool"""
+    if workers <= 1:
+        for i, payload in enumerate(payloads):
+            yield render_chunk(payload, i * chunk_size, report_format, assessment_year)
+        return
+
+    # Keep a bounded window of shards in flight so memory stays flat
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for i, payload in enumerate(payloads):
+            pending.append(pool.submit(render_chunk, payload, i * chunk_size, report_format, assessment_year))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def write_reports(input_path, output_path, report_format='html', chunk_size=DEFAULT_REPORT_CHUNK_SIZE, workers=1,
+                  progress=None, assessment_year=None):
+    """Render a statement per row of input_path into the zip file output_path
+
+    Statements are named after employee_id. A name already taken in the zip,
+    ignoring case, gets the first free numeric suffix, so a repeated id
+    never overwrites another statement. progress, if given, is called with a stats dict after every
+    chunk. Returns the final stats: statements, chunks, bytes, seconds and
+    statements per second.
+    """
+    if report_format not in REPORT_FORMATS:
+        raise ValueError(f"Report format must be one of {', '.join(REPORT_FORMATS)}, not {report_format!r}")
+    assessment_year = get_rule_set(assessment_year).assessment_year
+    # HTML compresses well; xlsx files are zip archives already
+    compression = zipfile.ZIP_DEFLATED if report_format == 'html' else zipfile.ZIP_STORED
+
+    start = time.perf_counter()
+    stats = {'statements': 0, 'chunks': 0, 'bytes': 0}
+    taken, next_suffix = set(), {}
+    with zipfile.ZipFile(output_path, 'w', compression) as archive:
+        payloads = iter_payloads(input_path, chunk_size, 0)
+        for rendered in _iter_rendered(payloads, chunk_size, report_format, workers, assessment_year):
+            for stem, content in rendered:
+                name = stem
+                while name.casefold() in taken:
+                    next_suffix[stem] = next_suffix.get(stem, 1) + 1
+                    name = f'{stem}-{next_suffix[stem]}'
+                taken.add(name.casefold())
+                archive.writestr(f'{name}.{report_format}', content)
+                stats['bytes'] += len(content)
+            stats['statements'] += len(rendered)
+            stats['chunks'] += 1
+
+            if progress is not None:
+                elapsed = time.perf_counter() - start
+                progress(dict(stats, seconds=elapsed, rows=stats['statements'],
+                              rows_per_sec=stats['statements'] / elapsed if elapsed else 0.0))
+
+    elapsed = time.perf_counter() - start
+    return dict(stats, seconds=elapsed, statements_per_sec=stats['statements'] / elapsed if elapsed else 0.0)
@@ -0,0 +1,104 @@
+# tax_engine/results.py
+"""Immutable result records returned by the scalar calculators.
+
+Each record is a NamedTuple: its fields live in the tuple itself with no
+per-instance __dict__ (NamedTuple declares __slots__ = ()), so a record
+takes a fraction of the memory of the equivalent dict. It also cannot be
+modified by a caller that shares it through a cache. as_dict() gives back
+the dict shape the UI and older callers use.
+
+Batch results remain column bundles: dicts holding one NumPy array per
+field. See tax_engine.batch.as_structured_array and record_at.
+"""
+from typing import NamedTuple
+
+
+class TaxBreakdown(NamedTuple):
+    """One regime's tax on a taxable income"""
+    base_tax: float
+    surcharge: float
+    cess: float
+    total_tax: float
+    taxable_income: float
+
+    def as_dict(self):
+        return self._asdict()
+
+
+class QuarterlyCapitalGainsTax(NamedTuple):
+    ltcg_tax: float
+    stcg_tax: float
+    total: float
+
+    def as_dict(self):
+        return self._asdict()
+
+
+class CapitalGainsTax(NamedTuple):
+    """Annual capital gains tax with its quarter-wise split
+
+    quarterly holds one QuarterlyCapitalGainsTax per entry of quarters.
+    """
+    ltcg_tax: float
+    stcg_tax: float
+    total_cg_tax: float
+    taxable_ltcg: float
+    quarters: tuple
+    quarterly: tuple
+
+    @property
+    def quarterly_tax(self):
+        """Quarter name -> QuarterlyCapitalGainsTax"""
+        return dict(zip(self.quarters, self.quarterly))
+
+    def as_dict(self):
+        return {
+            'ltcg_tax': self.ltcg_tax,
+            'stcg_tax': self.stcg_tax,
+            'total_cg_tax': self.total_cg_tax,
+            'taxable_ltcg': self.taxable_ltcg,
+            'quarterly_tax': {q: tax._asdict() for q, tax in zip(self.quarters, self.quarterly)},
+        }
+
+
+class DeductionPlan(NamedTuple):
+    """Best use of an investment budget: the regime and new investment per section"""
+    regime: str
+    section_80c: float
+    section_80d: float
+    section_80ccd: float
+    invested: float
+    new_regime_tax: float
+    old_regime_tax: float
+    total_tax: float
+    tax_saving: float
+
+    def as_dict(self):
+        return self._asdict()
+
+
+class MonthlyTds(NamedTuple):
+    """One employee's TDS for one month, with the projection it was based on"""
+    employee_id: str
+    month: int
+    regime: str
+    projected_income: float
+    projected_tax: float
+    tds: float
+    tds_to_date: float
+
+    def as_dict(self):
+        return self._asdict()
+
+
+class InstallmentDue(NamedTuple):
+    """One advance tax installment"""
+    due_date: str
+    percentage: int
+    installment_percentage: int
+    regular_tax: float
+    capital_gains_tax: float
+    total_amount: float
+
+    def as_dict(self):
+        return self._asdict()
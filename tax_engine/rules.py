@@ -0,0 +1,441 @@
+# tax_engine/rules.py
+"""Registry of tax rules keyed by assessment year.
+
+Every entry of tax_config.RULE_SETS is validated and compiled into an
+immutable RuleSet of tuples, including each regime's total tax as a single
+piecewise-linear function (see tax_engine.piecewise). Looking up a year is a
+plain dict access, so nothing is re-parsed on a Streamlit rerun or per call.
+
+tax_config.py is hot-reloaded: at most every RELOAD_INTERVAL seconds a
+lookup checks the file's mtime, and when it has changed the file is executed
+afresh, validated and compiled on the side, then swapped in with a single
+assignment. Callers see either the old rules or the new ones, never a mix,
+and a config that fails validation is reported and ignored until the file
+changes again. Tables derived from a RuleSet are memoized by its version
+(see derived_table), so they are rebuilt once per change, not per call.
+"""
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import time
+from collections.abc import Mapping
+from datetime import date, datetime
+from math import inf, isfinite
+from threading import Lock
+from types import MappingProxyType
+from typing import NamedTuple
+
+import tax_config
+from tax_engine.cache import LRUCache
+from tax_engine.piecewise import RegimeFunction, compile_regime
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of tax_config.py's mtime; 0 checks on every lookup
+RELOAD_INTERVAL = 2.0
+
+
+class SlabTable(NamedTuple):
+    """Slab upper limits (without the open-ended top slab) and per-slab rates
+
+    lower[i] is where slab i starts and cumulative[i] the tax payable on all
+    income below it, so the tax in slab i is cumulative[i] + (income - lower[i]) * rates[i].
+    """
+    limits: tuple
+    rates: tuple
+    lower: tuple
+    cumulative: tuple
+
+
+class SurchargeTable(NamedTuple):
+    """Ascending surcharge thresholds; rates[i] applies above thresholds[i - 1]"""
+    thresholds: tuple
+    rates: tuple
+
+
+class AdvanceTaxInstallment(NamedTuple):
+    quarter: str
+    due_date: str
+    percentage: int
+    due: date
+
+
+class DeductionLimits(NamedTuple):
+    section_80c: float
+    section_80d: float
+    section_80d_senior: float
+    section_80ccd: float
+
+
+class InterestRules(NamedTuple):
+    """Section 234B and 234C interest, from tax_config.ADVANCE_TAX_INTEREST"""
+    rate_per_month: float
+    min_liability: float
+    months_234c: tuple
+    relief_percentage_234c: tuple
+    min_paid_percentage_234b: float
+    rounding: float
+
+
+class RuleSet(NamedTuple):
+    assessment_year: str
+    financial_year: str
+    standard_deduction: float
+    new_regime: SlabTable
+    old_regime: SlabTable
+    new_surcharge: SurchargeTable
+    old_surcharge: SurchargeTable
+    cess_rate: float
+    new_tax: RegimeFunction
+    old_tax: RegimeFunction
+    ltcg_exemption: float
+    ltcg_rate: float
+    stcg_rate: float
+    ltcg_holding_months: int
+    advance_tax: tuple
+    filing_deadline: date
+    deduction_limits: DeductionLimits
+    interest: InterestRules
+    version: str
+
+
+def compile_slabs(slabs):
+    """Compile a list of {'limit', 'rate'} slabs into a SlabTable"""
+    limits = tuple(float(slab['limit']) for slab in slabs[:-1])
+    rates = tuple(float(slab['rate']) for slab in slabs)
+    lower = (0.0,) + limits
+
+    cumulative = [0.0]
+    for i in range(1, len(slabs)):
+        cumulative.append(cumulative[-1] + (lower[i] - lower[i - 1]) * rates[i - 1])
+
+    return SlabTable(limits, rates, lower, tuple(cumulative))
+
+
+def compile_surcharge(surcharge_slabs):
+    """Compile surcharge tiers into a SurchargeTable"""
+    tiers = sorted(surcharge_slabs, key=lambda tier: tier['limit'])
+    return SurchargeTable(
+        tuple(float(tier['limit']) for tier in tiers),
+        (0.0,) + tuple(float(tier['rate']) for tier in tiers)
+    )
+
+
+def rule_set_version(assessment_year, config, interest):
+    """Content hash of one RULE_SETS entry and the interest rules it is used with
+
+    Anything cached or stored against a RuleSet is keyed by this, so editing
+    the entry in tax_config.py gives its results new keys.
+    """
+    content = json.dumps([assessment_year, config, interest], sort_keys=True)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+
+
+def _is_rate(value):
+    return isinstance(value, (int, float)) and 0 <= value <= 1
+
+
+def _is_amount(value):
+    return isinstance(value, (int, float)) and isfinite(value) and value >= 0
+
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(value, '%d %b %Y').date()
+    except (TypeError, ValueError):
+        return None
+
+
+def _slab_problems(name, slabs):
+    if not slabs:
+        return [f"{name} is empty"]
+    problems = []
+    limits = [slab.get('limit') for slab in slabs]
+    rates = [slab.get('rate') for slab in slabs]
+    if not all(_is_amount(limit) for limit in limits[:-1]) or limits[-1] != inf:
+        problems.append(f"{name} limits must be non-negative amounts ending in float('inf')")
+    elif any(a >= b for a, b in zip(limits, limits[1:])):
+        problems.append(f"{name} limits must increase: {limits}")
+    if not all(_is_rate(rate) for rate in rates):
+        problems.append(f"{name} rates must be between 0 and 1: {rates}")
+    elif any(a > b for a, b in zip(rates, rates[1:])):
+        problems.append(f"{name} rates must not fall from one slab to the next: {rates}")
+    return problems
+
+
+def _surcharge_problems(name, tiers):
+    tiers = sorted(tiers, key=lambda tier: tier.get('limit') if _is_amount(tier.get('limit')) else -1)
+    limits = [tier.get('limit') for tier in tiers]
+    rates = [tier.get('rate') for tier in tiers]
+    if not all(_is_amount(limit) and limit > 0 for limit in limits) or len(set(limits)) != len(limits):
+        return [f"{name} limits must be distinct positive amounts: {limits}"]
+    if not all(_is_rate(rate) for rate in rates):
+        return [f"{name} rates must be between 0 and 1: {rates}"]
+    if any(a > b for a, b in zip(rates, rates[1:])):
+        return [f"{name} rates must not fall as the limit rises: {rates}"]
+    return []
+
+
+def validate_rule_set(assessment_year, config, interest):
+    """List what is wrong with one RULE_SETS entry; an empty list means it is valid"""
+    required = ('financial_year', 'standard_deduction', 'new_regime_slabs', 'old_regime_slabs', 'surcharge_slabs',
+                'cess_rate', 'ltcg_exemption', 'ltcg_rate', 'stcg_rate', 'ltcg_holding_months', 'advance_tax',
+                'filing_deadline', 'deduction_limits')
+    missing = [key for key in required if key not in config]
+    if missing:
+        return [f"{assessment_year}: missing {', '.join(missing)}"]
+
+    problems = _slab_problems('new_regime_slabs', config['new_regime_slabs'])
+    problems += _slab_problems('old_regime_slabs', config['old_regime_slabs'])
+    for regime in ('new_regime', 'old_regime'):
+        problems += _surcharge_problems(f'surcharge_slabs[{regime!r}]', config['surcharge_slabs'].get(regime, []))
+    for key in ('cess_rate', 'ltcg_rate', 'stcg_rate'):
+        if not _is_rate(config[key]):
+            problems.append(f"{key} must be between 0 and 1, not {config[key]!r}")
+    for key in ('standard_deduction', 'ltcg_exemption'):
+        if not _is_amount(config[key]):
+            problems.append(f"{key} must be a non-negative amount, not {config[key]!r}")
+    if not isinstance(config['ltcg_holding_months'], int) or config['ltcg_holding_months'] <= 0:
+        problems.append(f"ltcg_holding_months must be a positive whole number, not {config['ltcg_holding_months']!r}")
+
+    installments = config['advance_tax']
+    dates = [_parse_date(installment.get('date')) for installment in installments]
+    percentages = [installment.get('percentage') for installment in installments]
+    if len(installments) != len(interest['months_234c']):
+        problems.append(f"advance_tax has {len(installments)} installments but ADVANCE_TAX_INTEREST "
+                        f"charges 234C on {len(interest['months_234c'])}")
+    if None in dates or any(a >= b for a, b in zip(dates, dates[1:])):
+        problems.append("advance_tax dates must be 'DD Mon YYYY' and in order")
+    if not percentages or any(a >= b for a, b in zip(percentages, percentages[1:])) or percentages[-1] != 100:
+        problems.append(f"advance_tax percentages must increase to 100: {percentages}")
+    if _parse_date(config['filing_deadline']) is None:
+        problems.append(f"filing_deadline must be 'DD Mon YYYY', not {config['filing_deadline']!r}")
+
+    limits = config['deduction_limits']
+    section_80d = limits.get('80D', {})
+    amounts = [limits.get('80C'), limits.get('80CCD'), section_80d.get('normal'), section_80d.get('senior_citizen')]
+    if not all(_is_amount(amount) for amount in amounts):
+        problems.append("deduction_limits needs non-negative 80C, 80CCD and 80D normal and senior_citizen amounts")
+    elif section_80d['senior_citizen'] < section_80d['normal']:
+        problems.append("deduction_limits 80D senior_citizen must be at least the normal limit")
+    return [f"{assessment_year}: {problem}" for problem in problems]
+
+
+def validate_interest(interest):
+    """List what is wrong with ADVANCE_TAX_INTEREST"""
+    problems = []
+    for key in ('rate_per_month', 'min_paid_percentage_234b'):
+        if not _is_amount(interest.get(key)):
+            problems.append(f"ADVANCE_TAX_INTEREST {key} must be a non-negative amount")
+    if not _is_amount(interest.get('min_liability')):
+        problems.append("ADVANCE_TAX_INTEREST min_liability must be a non-negative amount")
+    if not _is_amount(interest.get('rounding')) or not interest.get('rounding'):
+        problems.append("ADVANCE_TAX_INTEREST rounding must be a positive amount")
+    months = interest.get('months_234c') or []
+    relief = interest.get('relief_percentage_234c') or []
+    if not months or not all(_is_amount(m) for m in months):
+        problems.append("ADVANCE_TAX_INTEREST months_234c must be non-negative month counts")
+    if len(relief) != len(months):
+        problems.append("ADVANCE_TAX_INTEREST relief_percentage_234c needs one entry per installment")
+    return problems
+
+
+def compile_interest(interest):
+    return InterestRules(
+        rate_per_month=float(interest['rate_per_month']),
+        min_liability=float(interest['min_liability']),
+        months_234c=tuple(float(months) for months in interest['months_234c']),
+        relief_percentage_234c=tuple(interest['relief_percentage_234c']),
+        min_paid_percentage_234b=float(interest['min_paid_percentage_234b']),
+        rounding=float(interest['rounding'])
+    )
+
+
+def compile_rule_set(assessment_year, config, interest):
+    """Compile one RULE_SETS entry, and the ADVANCE_TAX_INTEREST it uses, into a RuleSet"""
+    new_regime = compile_slabs(config['new_regime_slabs'])
+    old_regime = compile_slabs(config['old_regime_slabs'])
+    new_surcharge = compile_surcharge(config['surcharge_slabs']['new_regime'])
+    old_surcharge = compile_surcharge(config['surcharge_slabs']['old_regime'])
+    return RuleSet(
+        assessment_year=assessment_year,
+        financial_year=config['financial_year'],
+        standard_deduction=config['standard_deduction'],
+        new_regime=new_regime,
+        old_regime=old_regime,
+        new_surcharge=new_surcharge,
+        old_surcharge=old_surcharge,
+        cess_rate=config['cess_rate'],
+        new_tax=compile_regime(new_regime, new_surcharge, config['cess_rate']),
+        old_tax=compile_regime(old_regime, old_surcharge, config['cess_rate']),
+        ltcg_exemption=config['ltcg_exemption'],
+        ltcg_rate=config['ltcg_rate'],
+        stcg_rate=config['stcg_rate'],
+        ltcg_holding_months=config['ltcg_holding_months'],
+        advance_tax=tuple(
+            AdvanceTaxInstallment(
+                f"Q{i}",
+                installment['date'],
+                installment['percentage'],
+                datetime.strptime(installment['date'], '%d %b %Y').date()
+            )
+            for i, installment in enumerate(config['advance_tax'], start=1)
+        ),
+        filing_deadline=datetime.strptime(config['filing_deadline'], '%d %b %Y').date(),
+        deduction_limits=DeductionLimits(
+            section_80c=float(config['deduction_limits']['80C']),
+            section_80d=float(config['deduction_limits']['80D']['normal']),
+            section_80d_senior=float(config['deduction_limits']['80D']['senior_citizen']),
+            section_80ccd=float(config['deduction_limits']['80CCD'])
+        ),
+        interest=compile_interest(interest),
+        version=rule_set_version(assessment_year, config, interest)
+    )
+
+
+class CompiledConfig(NamedTuple):
+    """Everything compiled from one load of tax_config.py"""
+    rule_sets: Mapping
+    default_assessment_year: str
+    mtime_ns: int
+
+
+def compile_config(config, mtime_ns=0):
+    """Validate and compile a tax_config module (or any object with the same attributes)
+
+    Raises ValueError listing every problem found, so a bad edit never
+    replaces working rules.
+    """
+    interest = config.ADVANCE_TAX_INTEREST
+    problems = validate_interest(interest)
+    if not problems:
+        for assessment_year, entry in config.RULE_SETS.items():
+            problems += validate_rule_set(assessment_year, entry, interest)
+    if config.ASSESSMENT_YEAR not in config.RULE_SETS:
+        problems.append(f"ASSESSMENT_YEAR {config.ASSESSMENT_YEAR!r} has no entry in RULE_SETS")
+    if problems:
+        raise ValueError("Invalid tax rules in tax_config.py:\n  " + "\n  ".join(problems))
+    return CompiledConfig(
+        MappingProxyType({
+            assessment_year: compile_rule_set(assessment_year, entry, interest)
+            for assessment_year, entry in config.RULE_SETS.items()
+        }),
+        config.ASSESSMENT_YEAR,
+        mtime_ns
+    )
+
+
+def _config_mtime():
+    return os.stat(tax_config.__file__).st_mtime_ns
+
+
+def _load_config():
+    """Execute tax_config.py afresh into a private module, leaving the imported one untouched"""
+    spec = importlib.util.spec_from_file_location('_tax_config_reload', tax_config.__file__)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+_active = compile_config(tax_config, _config_mtime())
+_next_check = time.monotonic() + RELOAD_INTERVAL
+_failed_mtime = None
+_reload_lock = Lock()
+
+
+def reload_rules(force=False):
+    """Recompile tax_config.py if it changed since it was last loaded (or always, with force)
+
+    Returns True when new rules were swapped in. A config that fails to load
+    or validate is logged and the current rules stay in place.
+    """
+    global _active, _failed_mtime
+    with _reload_lock:
+        mtime_ns = _config_mtime()
+        if not force and mtime_ns in (_active.mtime_ns, _failed_mtime):
+            return False
+        try:
+            compiled = compile_config(_load_config(), mtime_ns)
+        except Exception as error:
+            _failed_mtime = mtime_ns
+            logger.error("Keeping the current tax rules; tax_config.py could not be reloaded: %s", error)
+            return False
+        _active = compiled
+        _failed_mtime = None
+    logger.info("Reloaded tax rules: %s", ', '.join(
+        f"{year} ({rules.version})" for year, rules in compiled.rule_sets.items()
+    ))
+    return True
+
+
+def active_config():
+    """The CompiledConfig in use, reloading tax_config.py first if it is due a check and has changed"""
+    global _next_check
+    now = time.monotonic()
+    if now >= _next_check:
+        _next_check = now + RELOAD_INTERVAL
+        try:
+            reload_rules()
+        except OSError:
+            logger.exception("Could not check tax_config.py for changes")
+    return _active
+
+
+class _LiveRuleSets(Mapping):
+    """Read-only view of the rule sets currently in use, by assessment year"""
+
+    def __getitem__(self, assessment_year):
+        return active_config().rule_sets[assessment_year]
+
+    def __iter__(self):
+        return iter(active_config().rule_sets)
+
+    def __len__(self):
+        return len(active_config().rule_sets)
+
+    def __repr__(self):
+        return f"RULE_SETS({list(self)})"
+
+
+RULE_SETS = _LiveRuleSets()
+
+# As loaded at import; default_assessment_year() follows reloads
+DEFAULT_ASSESSMENT_YEAR = _active.default_assessment_year
+
+
+def default_assessment_year():
+    return active_config().default_assessment_year
+
+
+def get_rule_set(assessment_year=None):
+    """Return the compiled rules for an assessment year (default: the current one)"""
+    config = active_config()
+    if assessment_year is None:
+        assessment_year = config.default_assessment_year
+    try:
+        return config.rule_sets[assessment_year]
+    except KeyError:
+        raise ValueError(
+            f"No tax rules for assessment year {assessment_year!r}; "
+            f"available: {', '.join(config.rule_sets)}"
+        ) from None
+
+
+def derived_table(build, maxsize=16):
+    """Memoize build(rules) by rule-set version, for lookup tables compiled from a RuleSet
+
+    Returns a function of a RuleSet. A reloaded config gives changed rule sets
+    new versions, so their tables are rebuilt once on first use.
+    """
+    tables = LRUCache(maxsize)
+
+    def lookup(rules):
+        return tables.get_or_compute(rules.version, lambda: build(rules))
+    return lookup
+
+
+def financial_year_start(rules):
+    """1 April of the financial year a RuleSet covers"""
+    return date(int(rules.financial_year[:4]), 4, 1)
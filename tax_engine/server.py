@@ -0,0 +1,355 @@
+# tax_engine/server.py
+"""Asyncio JSON API over the vectorized calculators.
+
+Endpoints (POST, JSON body):
+
+    /regimes        {"annual_income", "deductions", "ltcg_by_quarter", "stcg_by_quarter"}
+    /capital-gains  {"ltcg_by_quarter", "stcg_by_quarter"}
+    /advance-tax    {"total_tax", "cg_tax_by_quarter", "payments_by_quarter"}
+
+Every body may also carry "assessment_year". GET /stats reports request
+count, throughput and p50/p99 latency; GET /health answers "ok".
+
+Requests arriving within a few milliseconds of each other are collected by
+a MicroBatcher per endpoint and assessment year and evaluated together with
+one call into tax_engine.batch, so concurrent clients share the NumPy work.
+Only the standard library and NumPy are used; the HTTP handling is a
+minimal HTTP/1.1 implementation with keep-alive, meant for a local service
+behind the company's own gateway.
+"""
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from http import HTTPStatus
+
+import numpy as np
+
+from tax_engine.advance_tax import calculate_advance_tax_schedule_batch
+from tax_engine.batch import calculate_capital_gains_tax_batch, compare_regimes_batch
+from tax_engine.rules import get_rule_set
+
+DEFAULT_BATCH_WINDOW = 0.002
+DEFAULT_MAX_BATCH = 4096
+MAX_BODY_BYTES = 1 << 20
+
+AMOUNT_FIELDS = ('annual_income', 'deductions', 'total_tax')
+QUARTER_FIELDS = ('ltcg_by_quarter', 'stcg_by_quarter', 'cg_tax_by_quarter', 'payments_by_quarter')
+
+
+class MicroBatcher:
+    """Collect submitted items for up to window seconds and evaluate them in one call
+
+    evaluate receives a list of items and must return a list of results in
+    the same order. A batch is flushed early once max_batch items are queued.
+    """
+
+    def __init__(self, evaluate, window=DEFAULT_BATCH_WINDOW, max_batch=DEFAULT_MAX_BATCH):
+        self.evaluate = evaluate
+        self.window = window
+        self.max_batch = max_batch
+        self._items = []
+        self._futures = []
+        self._timer = None
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, item):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._items.append(item)
+        self._futures.append(future)
+        if len(self._items) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        items, futures = self._items, self._futures
+        self._items, self._futures = [], []
+        if not items:
+            return
+        self.batches += 1
+        self.items += len(items)
+        try:
+            results = self.evaluate(items)
+        except Exception as e:
+            if len(items) == 1:
+                _set_exception(futures[0], e)
+                return
+            # One malformed request must not fail the rest of its batch, so
+            # fall back to evaluating each request on its own
+            for item, future in zip(items, futures):
+                try:
+                    _set_result(future, self.evaluate([item])[0])
+                except Exception as e:
+                    _set_exception(future, e)
+            return
+        for future, result in zip(futures, results):
+            _set_result(future, result)
+
+
+def _set_result(future, result):
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_exception(future, exception):
+    if not future.done():
+        future.set_exception(exception)
+
+
+def _check_amount(value, name):
+    try:
+        amount = float(value)
+    except (TypeError, ValueError, OverflowError):
+        amount = math.nan
+    if isinstance(value, bool) or not math.isfinite(amount):
+        raise ValueError(f"{name} must be a number, got {value!r}")
+
+
+def check_item(item):
+    """Raise ValueError unless every amount in a request body is a finite number"""
+    for field in AMOUNT_FIELDS:
+        if field in item:
+            _check_amount(item[field], field)
+    for field in QUARTER_FIELDS:
+        if field not in item:
+            continue
+        if not isinstance(item[field], dict):
+            raise ValueError(f"{field} must be an object of amounts by quarter")
+        for quarter, value in item[field].items():
+            _check_amount(value, f"{field}.{quarter}")
+    year = item.get('assessment_year')
+    if year is not None and not isinstance(year, str):
+        raise ValueError(f"assessment_year must be a string such as '2025-26', got {year!r}")
+
+
+def _quarters(assessment_year):
+    return [installment.quarter for installment in get_rule_set(assessment_year).advance_tax]
+
+
+def _quarter_matrix(items, field, quarters):
+    return np.array([[float(item.get(field, {}).get(q, 0)) for q in quarters] for item in items])
+
+
+def _regime_row(result, i):
+    return {key: float(result[key][i]) for key in ('base_tax', 'surcharge', 'cess', 'total_tax', 'taxable_income')}
+
+
+def evaluate_regimes(items, assessment_year):
+    quarters = _quarters(assessment_year)
+    result = compare_regimes_batch(
+        np.array([float(item['annual_income']) for item in items]),
+        np.array([float(item.get('deductions', 0)) for item in items]),
+        _quarter_matrix(items, 'ltcg_by_quarter', quarters),
+        _quarter_matrix(items, 'stcg_by_quarter', quarters),
+        assessment_year
+    )
+    return [{
+        'new_regime': _regime_row(result['new_regime'], i),
+        'old_regime': _regime_row(result['old_regime'], i),
+        'total_cg_tax': float(result['capital_gains']['total_cg_tax'][i]),
+        'recommended_regime': str(result['recommended_regime'][i]),
+        'tax_saving': float(result['tax_saving'][i]),
+        'break_even_deduction': float(result['break_even_deduction'][i]),
+    } for i in range(len(items))]
+
+
+def evaluate_capital_gains(items, assessment_year):
+    quarters = _quarters(assessment_year)
+    result = calculate_capital_gains_tax_batch(
+        _quarter_matrix(items, 'ltcg_by_quarter', quarters),
+        _quarter_matrix(items, 'stcg_by_quarter', quarters),
+        assessment_year
+    )
+    return [{
+        'ltcg_tax': float(result['ltcg_tax'][i]),
+        'stcg_tax': float(result['stcg_tax'][i]),
+        'total_cg_tax': float(result['total_cg_tax'][i]),
+        'taxable_ltcg': float(result['taxable_ltcg'][i]),
+        'quarterly_tax': {q: float(result['quarterly_tax'][i, j]) for j, q in enumerate(quarters)},
+    } for i in range(len(items))]
+
+
+def evaluate_advance_tax(items, assessment_year):
+    rules = get_rule_set(assessment_year)
+    quarters = _quarters(assessment_year)
+    result = calculate_advance_tax_schedule_batch(
+        np.array([float(item['total_tax']) for item in items]),
+        _quarter_matrix(items, 'cg_tax_by_quarter', quarters),
+        _quarter_matrix(items, 'payments_by_quarter', quarters),
+        assessment_year
+    )
+    return [{
+        'schedule': [{
+            'quarter': installment.quarter,
+            'due_date': installment.due_date,
+            'percentage': installment.percentage,
+            'regular_tax': float(result['regular_tax'][i, j]),
+            'capital_gains_tax': float(result['capital_gains_tax'][i, j]),
+            'total_amount': float(result['total_amount'][i, j]),
+            'shortfall': float(result['shortfall'][i, j]),
+            'interest_234c': float(result['interest_234c'][i, j]),
+        } for j, installment in enumerate(rules.advance_tax)],
+        'interest_234c': float(result['interest_234c_total'][i]),
+        'interest_234b': float(result['interest_234b'][i]),
+    } for i in range(len(items))]
+
+
+ENDPOINTS = {
+    '/regimes': (evaluate_regimes, ('annual_income',)),
+    '/capital-gains': (evaluate_capital_gains, ()),
+    '/advance-tax': (evaluate_advance_tax, ('total_tax',)),
+}
+
+
+class LatencyStats:
+    """Request count, throughput and latency percentiles over the most recent requests"""
+
+    def __init__(self, window=100000):
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.started = time.perf_counter()
+
+    def record(self, seconds, ok=True):
+        self.latencies.append(seconds)
+        self.requests += 1
+        if not ok:
+            self.errors += 1
+
+    def snapshot(self):
+        elapsed = time.perf_counter() - self.started
+        latencies = np.array(self.latencies) if self.latencies else np.zeros(1)
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'uptime_seconds': elapsed,
+            'throughput_rps': self.requests / elapsed if elapsed else 0.0,
+            'latency_p50_ms': float(np.percentile(latencies, 50) * 1000),
+            'latency_p99_ms': float(np.percentile(latencies, 99) * 1000),
+        }
+
+
+class TaxAPIServer:
+    def __init__(self, window=DEFAULT_BATCH_WINDOW, max_batch=DEFAULT_MAX_BATCH):
+        self.window = window
+        self.max_batch = max_batch
+        self.batchers = {}
+        self.stats = LatencyStats()
+
+    def batcher(self, path, assessment_year):
+        key = (path, assessment_year)
+        batcher = self.batchers.get(key)
+        if batcher is None:
+            evaluate = ENDPOINTS[path][0]
+            batcher = self.batchers[key] = MicroBatcher(
+                lambda items: evaluate(items, assessment_year), self.window, self.max_batch
+            )
+        return batcher
+
+    def stats_snapshot(self):
+        snapshot = self.stats.snapshot()
+        batches = sum(b.batches for b in self.batchers.values())
+        items = sum(b.items for b in self.batchers.values())
+        snapshot['batches'] = batches
+        snapshot['mean_batch_size'] = items / batches if batches else 0.0
+        return snapshot
+
+    async def handle_request(self, method, path, body):
+        """Return (status, payload) for one request"""
+        if method == 'GET' and path == '/health':
+            return HTTPStatus.OK, {'status': 'ok'}
+        if method == 'GET' and path == '/stats':
+            return HTTPStatus.OK, self.stats_snapshot()
+        if path not in ENDPOINTS:
+            return HTTPStatus.NOT_FOUND, {'error': f"Unknown endpoint {path}"}
+        if method != 'POST':
+            return HTTPStatus.METHOD_NOT_ALLOWED, {'error': "Use POST with a JSON body"}
+
+        try:
+            item = json.loads(body or b'{}')
+            if not isinstance(item, dict):
+                raise ValueError("Body must be a JSON object")
+            missing = [field for field in ENDPOINTS[path][1] if field not in item]
+            if missing:
+                raise ValueError(f"Missing fields: {', '.join(missing)}")
+            check_item(item)
+            assessment_year = get_rule_set(item.get('assessment_year')).assessment_year
+        except ValueError as e:
+            return HTTPStatus.BAD_REQUEST, {'error': str(e)}
+
+        try:
+            result = await self.batcher(path, assessment_year).submit(item)
+        except (ValueError, TypeError, AttributeError) as e:
+            return HTTPStatus.BAD_REQUEST, {'error': f"Invalid request in batch: {e}"}
+        return HTTPStatus.OK, result
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                start = time.perf_counter()
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    # The body can't be skipped without a valid length, so the connection is closed
+                    status, payload = HTTPStatus.BAD_REQUEST, {'error': "Invalid Content-Length header"}
+                    body = None
+                elif length > MAX_BODY_BYTES:
+                    status, payload = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'error': "Body too large"}
+                    body = None
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    status, payload = await self.handle_request(method, target.split('?', 1)[0], body)
+
+                keep_alive = (version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                              and body is not None)
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if target not in ('/stats', '/health'):
+                    self.stats.record(time.perf_counter() - start, status == HTTPStatus.OK)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=8765):
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+
+async def serve(host='127.0.0.1', port=8765, window=DEFAULT_BATCH_WINDOW, max_batch=DEFAULT_MAX_BATCH):
+    server = await TaxAPIServer(window, max_batch).start(host, port)
+    async with server:
+        await server.serve_forever()
@@ -0,0 +1,204 @@
+# tax_engine/store.py
+"""Persistent, content-addressed store of computed results.
+
+Each result is stored under a key hashed from its kind, the version of the
+RuleSet it was computed with (see tax_engine.rules.rule_set_version) and its
+normalized inputs. Editing a rule set in tax_config.py changes its version,
+so results computed under the old rules are never returned again, and
+invalidate() deletes them.
+
+The store is one SQLite table. Lookups and writes cover a whole batch of
+keys in a single transaction. A lookup marks the rows it hits as used, and
+once the payloads add up to more than max_bytes the least recently used
+rows are evicted.
+
+Set TAX_RESULT_STORE to a file path to give cached_tax_summary() and the
+Tax Calculator page's graph a store. The batch command takes --store.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from threading import Lock
+
+from tax_engine.rules import RULE_SETS
+
+STORE_ENV = 'TAX_RESULT_STORE'
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+# Bump when a change to the calculators alters results for unchanged rules
+FORMAT_VERSION = 1
+
+# Payload bytes written between checks of the total against max_bytes
+EVICTION_CHECK_BYTES = 64 * 1024 ** 2
+
+# A hit only rewrites last_used when the stored stamp is older than this
+TOUCH_INTERVAL = 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key BLOB PRIMARY KEY,
+    kind TEXT NOT NULL,
+    rule_version TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used, size);
+CREATE INDEX IF NOT EXISTS results_rule_version ON results (rule_version);
+"""
+
+
+def result_key(kind, rule_version, inputs):
+    """16-byte key for inputs given as bytes, a buffer, or anything json.dumps accepts"""
+    digest = hashlib.blake2b(f'{FORMAT_VERSION}\0{kind}\0{rule_version}\0'.encode('utf-8'), digest_size=16)
+    if isinstance(inputs, (bytes, bytearray, memoryview)):
+        digest.update(inputs)
+    else:
+        digest.update(json.dumps(inputs, sort_keys=True).encode('utf-8'))
+    return digest.digest()
+
+
+class ResultStore:
+    """SQLite-backed map of result key -> payload bytes, safe to share between threads
+
+    Several processes may open the same file; SQLite serializes their writes.
+    """
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._connection = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.executescript(_SCHEMA)
+        self._connection.execute('CREATE TEMP TABLE IF NOT EXISTS lookup (key BLOB PRIMARY KEY)')
+        self._lock = Lock()
+        self._written_since_check = EVICTION_CHECK_BYTES
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    @contextmanager
+    def _transaction(self):
+        self._connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield self._connection
+        except BaseException:
+            self._connection.execute('ROLLBACK')
+            raise
+        self._connection.execute('COMMIT')
+
+    def get_many(self, keys):
+        """Return {key: payload} for those keys that are stored"""
+        keys = list(keys)
+        if not keys:
+            return {}
+        now = int(time.time())
+        with self._lock, self._transaction() as connection:
+            connection.executemany('INSERT OR IGNORE INTO lookup VALUES (?)', ((key,) for key in keys))
+            found = dict(connection.execute('SELECT key, payload FROM results JOIN lookup USING (key)'))
+            if found:
+                connection.execute(
+                    'UPDATE results SET last_used = ? WHERE last_used < ? AND key IN (SELECT key FROM lookup)',
+                    (now, now - TOUCH_INTERVAL)
+                )
+            connection.execute('DELETE FROM lookup')
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, kind, rule_version, items):
+        """Store (key, payload) pairs computed under rule_version"""
+        items = [(key, payload) for key, payload in items]
+        now = int(time.time())
+        with self._lock, self._transaction() as connection:
+            connection.executemany(
+                'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)',
+                ((key, kind, rule_version, payload, len(payload), now) for key, payload in items)
+            )
+            self.writes += len(items)
+            self._written_since_check += sum(len(payload) for _, payload in items)
+            if self._written_since_check >= EVICTION_CHECK_BYTES:
+                self._written_since_check = 0
+                self._evict(connection, self.max_bytes)
+
+    def _evict(self, connection, max_bytes):
+        # Keep the most recently used rows whose running total of sizes fits in max_bytes
+        cursor = connection.execute(
+            'DELETE FROM results WHERE key IN (SELECT key FROM ('
+            'SELECT key, SUM(size) OVER (ORDER BY last_used DESC, key) AS kept FROM results'
+            ') WHERE kept > ?)',
+            (max_bytes,)
+        )
+        self.evictions += cursor.rowcount
+        return cursor.rowcount
+
+    def evict(self, max_bytes=None):
+        """Delete least recently used rows until at most max_bytes of payload remain
+
+        Returns the number of rows deleted.
+        """
+        with self._lock, self._transaction() as connection:
+            return self._evict(connection, self.max_bytes if max_bytes is None else max_bytes)
+
+    def invalidate(self, keep_versions=None):
+        """Delete results computed under any rule version not in keep_versions
+
+        keep_versions defaults to the versions of the rule sets loaded now,
+        which clears out everything made stale by a change to tax_config.py.
+        Returns the number of rows deleted.
+        """
+        if keep_versions is None:
+            keep_versions = [rules.version for rules in RULE_SETS.values()]
+        keep_versions = list(keep_versions)
+        with self._lock, self._transaction() as connection:
+            cursor = connection.execute(
+                f"DELETE FROM results WHERE rule_version NOT IN ({', '.join('?' * len(keep_versions))})",
+                keep_versions
+            )
+            return cursor.rowcount
+
+    def stats(self):
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT kind, rule_version, count(*), total(size) FROM results GROUP BY kind, rule_version'
+            ).fetchall()
+            return {
+                'path': self.path,
+                'entries': sum(count for _, _, count, _ in rows),
+                'bytes': int(sum(size for _, _, _, size in rows)),
+                'by_version': [{'kind': kind, 'rule_version': version, 'entries': count, 'bytes': int(size)}
+                               for kind, version, count, size in rows],
+                'hits': self.hits,
+                'misses': self.misses,
+                'writes': self.writes,
+                'evictions': self.evictions,
+            }
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+_OPEN_STORES = {}
+_OPEN_STORES_LOCK = Lock()
+
+
+def open_store(path):
+    """The ResultStore for path, shared by every caller in this process"""
+    path = os.path.abspath(path)
+    with _OPEN_STORES_LOCK:
+        store = _OPEN_STORES.get(path)
+        if store is None:
+            store = _OPEN_STORES[path] = ResultStore(path)
+        return store
+
+
+def default_store():
+    """The store named by TAX_RESULT_STORE, or None when it is unset"""
+    path = os.environ.get(STORE_ENV)
+    return open_store(path) if path else None
@@ -0,0 +1,568 @@
+# tax_engine/streaming.py
+"""Chunked batch processing of payroll files.
+
+Input rows are read a fixed number at a time, run through the vectorized
+calculators in tax_engine.batch and written out before the next chunk is
+read, so memory use depends on the chunk size and not on the file size.
+After every chunk a small checkpoint file records how far the run got, which
+lets an interrupted run resume from the last chunk that finished.
+
+Given a ResultStore (tax_engine.store), each chunk is looked up there by a
+hash of its input amounts before computing, and stored after. The key
+covers the whole chunk rather than each row: one SQLite lookup per row
+costs several times more than the vectorized calculation it would save,
+while a rerun of an unchanged file with the same chunk size hits on every
+chunk.
+
+With workers > 1 each chunk is a shard handed to a process pool. The main
+process only splits the input into records and writes finished shards back
+in their original order, so the output is byte-for-byte the same for any
+worker count.
+
+plan_file streams a workforce file through optimize_deductions_batch in
+the same chunks, giving each employee's best use of an investment budget.
+replay_tds_file reads a year of payroll events and writes each employee's
+monthly TDS (see tax_engine.tds).
+"""
+import csv
+import io
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from tax_engine.batch import compare_regimes_batch
+from tax_engine.paise import compare_regimes_paise_batch, to_paise_batch
+from tax_engine.planner import optimize_deductions_batch
+from tax_engine.tds import replay_tds_batch
+from tax_engine.rules import get_rule_set
+from tax_engine.store import open_store, result_key
+
+QUARTERS = ['q1', 'q2', 'q3', 'q4']
+
+NUMERIC_COLUMNS = (
+    ['annual_income', 'deductions']
+    + [f'ltcg_{q}' for q in QUARTERS]
+    + [f'stcg_{q}' for q in QUARTERS]
+)
+
+RESULT_COLUMNS = [
+    'new_base_tax', 'new_surcharge', 'new_cess', 'new_total_tax',
+    'old_base_tax', 'old_surcharge', 'old_cess', 'old_total_tax',
+    'ltcg_tax', 'stcg_tax', 'total_cg_tax',
+    'recommended_regime', 'tax_saving', 'break_even_deduction',
+]
+
+# Added by compute_result_columns(details=True) for per-employee statements; the quarterly ones are (n, 4)
+DETAIL_COLUMNS = [
+    'new_taxable_income', 'old_taxable_income', 'taxable_ltcg', 'quarterly_ltcg_tax', 'quarterly_stcg_tax',
+]
+
+# Stored as one float64 matrix per chunk, with recommended_regime as 1.0 for new and 0.0 for old
+STORED_COLUMNS = [name for name in RESULT_COLUMNS if name != 'recommended_regime'] + ['recommended_regime']
+
+# Per-employee inputs to plan_file; budget may come from the command line instead
+PLAN_COLUMNS = ['annual_income', 'age', 'budget', 'current_80c', 'current_80d', 'current_80ccd', 'other_deductions']
+
+# Columns of a payroll event log for replay_tds_file; regime is optional
+EVENT_COLUMNS = ['employee_id', 'month', 'kind', 'amount', 'regime']
+
+TDS_MONTH_COLUMNS = [f'tds_{month}' for month in
+                     ('apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec', 'jan', 'feb', 'mar')]
+
+DEFAULT_CHUNK_SIZE = 100000
+
+
+def is_parquet(path):
+    return os.path.splitext(path)[1].lower() in ('.parquet', '.pq')
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Parquet support needs pyarrow: pip install pyarrow") from None
+    return pyarrow
+
+
+def _csv_records(f):
+    """Yield raw CSV records, joining lines that fall inside a quoted field"""
+    pending = ''
+    for line in f:
+        if pending:
+            line = pending + line
+        # An odd number of quotes means a quoted field continues on the next line
+        if line.count('"') % 2:
+            pending = line
+            continue
+        pending = ''
+        yield line
+    if pending:
+        yield pending
+
+
+def read_csv_record_chunks(path, chunk_size, skip_rows=0):
+    """Yield (header, records) with up to chunk_size unparsed CSV records each
+
+    Only record boundaries are found here; parsing the fields is left to
+    parse_csv_records so it can run in a worker process. A file with a header
+    and no records yields one empty chunk, so the output still gets its
+    header.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        records = _csv_records(f)
+        first = next(records, None)
+        if first is None:
+            raise ValueError(f"{path} is empty; expected a header row")
+        header = next(csv.reader([first]))
+        for _ in range(skip_rows):
+            if next(records, None) is None:
+                return
+
+        chunk = []
+        yielded = False
+        for record in records:
+            chunk.append(record)
+            if len(chunk) == chunk_size:
+                yield header, chunk
+                yielded = True
+                chunk = []
+        if chunk or not (yielded or skip_rows):
+            yield header, chunk
+
+
+def parse_csv_records(header, records):
+    """Parse raw CSV records into a dict of column name -> list of strings"""
+    if not records:
+        return {name: [] for name in header}
+    return dict(zip(header, map(list, zip(*csv.reader(records)))))
+
+
+def read_csv_chunks(path, chunk_size, skip_rows=0):
+    """Yield dicts of column name -> list of strings, chunk_size rows at a time"""
+    for header, records in read_csv_record_chunks(path, chunk_size, skip_rows):
+        yield parse_csv_records(header, records)
+
+
+def read_parquet_chunks(path, chunk_size, skip_rows=0):
+    """Yield dicts of column name -> array, chunk_size rows at a time"""
+    pa = _require_pyarrow()
+    parquet_file = pa.parquet.ParquetFile(path)
+    if not parquet_file.metadata.num_rows and not skip_rows:
+        # As for CSV, a file with no rows gives one empty chunk
+        empty = parquet_file.schema_arrow.empty_table()
+        yield {name: column.to_numpy() for name, column in zip(empty.schema.names, empty.columns)}
+        return
+    for batch in parquet_file.iter_batches(batch_size=chunk_size):
+        if skip_rows >= batch.num_rows:
+            skip_rows -= batch.num_rows
+            continue
+        if skip_rows:
+            batch = batch.slice(skip_rows)
+            skip_rows = 0
+        yield {name: column.to_numpy(zero_copy_only=False)
+               for name, column in zip(batch.schema.names, batch.columns)}
+
+
+def numeric_column(columns, name, size):
+    """Column name of a chunk as float64, with blanks and a missing column read as zero"""
+    values = columns.get(name)
+    if values is None:
+        return np.zeros(size)
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'iuf':
+        return values.astype(np.float64, copy=False)
+    return np.array([v if v != '' else 0 for v in values], dtype=np.float64)
+
+
+def _compute_results(numeric, assessment_year, exact=False):
+    """The RESULT_COLUMNS for a dict of NUMERIC_COLUMNS arrays
+
+    With exact=True amounts are worked out in integer paise with Section
+    288A/288B rounding (see tax_engine.paise) and returned in rupees.
+    """
+    ltcg = np.column_stack([numeric[f'ltcg_{q}'] for q in QUARTERS])
+    stcg = np.column_stack([numeric[f'stcg_{q}'] for q in QUARTERS])
+    return compute_result_columns(numeric['annual_income'], numeric['deductions'], ltcg, stcg, assessment_year, exact)
+
+
+def compute_result_columns(annual_income, deductions, ltcg, stcg, assessment_year, exact=False, details=False):
+    """_compute_results for income and deductions arrays and (n, 4) quarterly gains
+
+    details=True adds the DETAIL_COLUMNS.
+    """
+    if exact:
+        result = compare_regimes_paise_batch(to_paise_batch(annual_income), to_paise_batch(deductions),
+                                             to_paise_batch(ltcg), to_paise_batch(stcg), assessment_year)
+    else:
+        result = compare_regimes_batch(annual_income, deductions, ltcg, stcg, assessment_year)
+
+    output = {}
+    for regime, prefix in (('new_regime', 'new'), ('old_regime', 'old')):
+        for key in ('base_tax', 'surcharge', 'cess', 'total_tax'):
+            output[f'{prefix}_{key}'] = result[regime][key]
+    for key in ('ltcg_tax', 'stcg_tax', 'total_cg_tax'):
+        output[key] = result['capital_gains'][key]
+    output['recommended_regime'] = result['recommended_regime']
+    output['tax_saving'] = result['tax_saving']
+    output['break_even_deduction'] = result['break_even_deduction']
+    if details:
+        output['new_taxable_income'] = result['new_regime']['taxable_income']
+        output['old_taxable_income'] = result['old_regime']['taxable_income']
+        for key in ('taxable_ltcg', 'quarterly_ltcg_tax', 'quarterly_stcg_tax'):
+            output[key] = result['capital_gains'][key]
+    if exact:
+        return {name: values if name == 'recommended_regime' else values / 100 for name, values in output.items()}
+    return output
+
+
+def _stored_results(numeric, assessment_year, store, exact=False):
+    """_compute_results, read from store when it holds this chunk and written back when not"""
+    version = get_rule_set(assessment_year).version
+    kind = 'batch_chunk_paise' if exact else 'batch_chunk'
+    # Adding 0.0 turns -0.0 into 0.0 so both hash the same
+    inputs = np.column_stack([numeric[name] for name in NUMERIC_COLUMNS]) + 0.0
+    key = result_key(kind, version, inputs.tobytes())
+    payload = store.get_many([key]).get(key)
+
+    if payload is not None:
+        values = np.frombuffer(payload, dtype=np.float64).reshape(-1, len(STORED_COLUMNS))
+    else:
+        computed = _compute_results(numeric, assessment_year, exact)
+        computed['recommended_regime'] = computed['recommended_regime'] == 'new'
+        values = np.column_stack([computed[name] for name in STORED_COLUMNS])
+        store.put_many(kind, version, [(key, values.tobytes())])
+
+    output = {name: values[:, i] for i, name in enumerate(STORED_COLUMNS)}
+    output['recommended_regime'] = np.where(output['recommended_regime'] > 0, 'new', 'old')
+    return {name: output[name] for name in RESULT_COLUMNS}
+
+
+def compute_chunk(columns, assessment_year=None, store=None, exact=False):
+    """Run both regimes and capital gains tax over one chunk of input columns
+
+    Returns the input columns followed by the RESULT_COLUMNS. With a
+    ResultStore, a stored result for the same inputs is reused. exact=True
+    computes in integer paise with statutory rounding.
+    """
+    size = len(columns['annual_income'])
+    numeric = {name: numeric_column(columns, name, size) for name in NUMERIC_COLUMNS}
+    if store is None:
+        results = _compute_results(numeric, assessment_year, exact)
+    else:
+        results = _stored_results(numeric, assessment_year, store, exact)
+
+    output = dict(columns)
+    output.update(results)
+    return output
+
+
+def encode_csv_chunk(columns, include_header):
+    """Render a chunk of columns as CSV text, formatting amounts to paise"""
+    names = list(columns)
+    formatted = []
+    for name in names:
+        values = columns[name]
+        if isinstance(values, np.ndarray) and values.dtype.kind == 'f':
+            formatted.append([f'{v:.2f}' for v in values.tolist()])
+        elif isinstance(values, np.ndarray):
+            formatted.append(values.tolist())
+        else:
+            formatted.append(values)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if include_header:
+        writer.writerow(names)
+    writer.writerows(zip(*formatted))
+    return buffer.getvalue()
+
+
+def encode_parquet_chunk(columns):
+    pa = _require_pyarrow()
+    return pa.table({name: np.asarray(values) for name, values in columns.items()})
+
+
+def process_chunk(payload, output_format, include_header, assessment_year=None, store_path=None, exact=False):
+    """Parse, compute and encode one shard; runs in a worker process when parallel
+
+    payload is either a (header, records) pair of raw CSV or a dict of columns.
+    Returns the number of rows and the encoded output for the writer.
+    """
+    columns = parse_csv_records(*payload) if isinstance(payload, tuple) else payload
+    output = compute_chunk(columns, assessment_year, open_store(store_path) if store_path else None, exact)
+    if output_format == 'parquet':
+        encoded = encode_parquet_chunk(output)
+    else:
+        encoded = encode_csv_chunk(output, include_header)
+    return len(columns['annual_income']), encoded
+
+
+class CsvChunkWriter:
+    """Append encoded chunks to a CSV file"""
+
+    def __init__(self, path, resume_offset=None):
+        self.path = path
+        if resume_offset is None:
+            self.file = open(path, 'w', newline='', encoding='utf-8')
+        else:
+            self.file = open(path, 'r+', newline='', encoding='utf-8')
+            self.file.truncate(resume_offset)
+            self.file.seek(resume_offset)
+
+    def write(self, text):
+        self.file.write(text)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetChunkWriter:
+    """Write each encoded chunk as its own part file inside an output directory"""
+
+    def __init__(self, path, resume_offset=None):
+        self.pa = _require_pyarrow()
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.part = resume_offset or 0
+
+    def write(self, table):
+        part_path = os.path.join(self.path, f'part-{self.part:05d}.parquet')
+        self.pa.parquet.write_table(table, part_path + '.tmp')
+        os.replace(part_path + '.tmp', part_path)
+        self.part += 1
+        return self.part
+
+    def close(self):
+        pass
+
+
+def checkpoint_path(output_path):
+    return output_path.rstrip('/\\') + '.checkpoint.json'
+
+
+def load_checkpoint(output_path):
+    try:
+        with open(checkpoint_path(output_path), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_checkpoint(output_path, checkpoint):
+    path = checkpoint_path(output_path)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+    os.replace(path + '.tmp', path)
+
+
+def iter_payloads(input_path, chunk_size, skip_rows):
+    """Chunks of a CSV or Parquet file: raw (header, records) pairs for CSV, dicts of columns for Parquet"""
+    if is_parquet(input_path):
+        return read_parquet_chunks(input_path, chunk_size, skip_rows)
+    return read_csv_record_chunks(input_path, chunk_size, skip_rows)
+
+
+def _iter_results(payloads, output_format, first_needs_header, workers, assessment_year, store_path, exact):
+    """Yield (rows, encoded) per shard in input order, serially or via a process pool"""
+    if workers <= 1:
+        for i, payload in enumerate(payloads):
+            yield process_chunk(payload, output_format, first_needs_header and i == 0, assessment_year, store_path,
+                                exact)
+        return
+
+    # Keep a bounded window of shards in flight so memory stays flat
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for i, payload in enumerate(payloads):
+            pending.append(pool.submit(
+                process_chunk, payload, output_format, first_needs_header and i == 0, assessment_year, store_path,
+                exact
+            ))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def plan_chunk(columns, budget=None, assessment_year=None):
+    """Optimize each row's deductions; returns the input columns followed by the DeductionPlan fields"""
+    size = len(columns['annual_income'])
+    numeric = {name: numeric_column(columns, name, size) for name in PLAN_COLUMNS}
+    if 'budget' not in columns:
+        if budget is None:
+            raise ValueError("Input has no budget column and no budget was given")
+        numeric['budget'] = np.full(size, float(budget))
+    plan = optimize_deductions_batch(
+        numeric['annual_income'],
+        numeric['age'],
+        numeric['budget'],
+        {'80C': numeric['current_80c'], '80D': numeric['current_80d'], '80CCD': numeric['current_80ccd']},
+        numeric['other_deductions'],
+        assessment_year
+    )
+    output = dict(columns)
+    output.update(plan)
+    return output
+
+
+def plan_file(input_path, output_path, budget=None, chunk_size=DEFAULT_CHUNK_SIZE, progress=None,
+              assessment_year=None):
+    """Stream a workforce file through the deduction optimizer into output_path
+
+    Each row needs annual_income; age, budget, current_80c, current_80d,
+    current_80ccd and other_deductions are optional, with budget defaulting
+    to the one given here. Formats and progress work as in process_file.
+    """
+    output_format = 'parquet' if is_parquet(output_path) else 'csv'
+    writer = ParquetChunkWriter(output_path) if output_format == 'parquet' else CsvChunkWriter(output_path)
+    start = time.perf_counter()
+    chunks = rows = 0
+    try:
+        for payload in iter_payloads(input_path, chunk_size, 0):
+            columns = parse_csv_records(*payload) if isinstance(payload, tuple) else payload
+            output = plan_chunk(columns, budget, assessment_year)
+            if output_format == 'parquet':
+                writer.write(encode_parquet_chunk(output))
+            else:
+                writer.write(encode_csv_chunk(output, include_header=not chunks))
+            chunks += 1
+            rows += len(columns['annual_income'])
+            if progress is not None:
+                elapsed = time.perf_counter() - start
+                progress({'chunks': chunks, 'rows': rows, 'seconds': elapsed,
+                          'rows_per_sec': rows / elapsed if elapsed else 0.0})
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    return {'chunks': chunks, 'rows': rows, 'seconds': elapsed, 'rows_per_sec': rows / elapsed if elapsed else 0.0}
+
+
+def replay_tds_file(events_path, output_path, chunk_size=DEFAULT_CHUNK_SIZE, assessment_year=None):
+    """Replay a year of payroll events into each employee's monthly TDS
+
+    events_path holds one event per row with employee_id, month (calendar,
+    4 for April), kind (salary, bonus or declaration), amount and optionally
+    regime. The whole log is read, then replayed month by month with
+    replay_tds_batch. The output has one row per employee, in order of first
+    appearance, with TDS for April to March.
+    """
+    start = time.perf_counter()
+    codes = {}
+    parts = {name: [] for name in EVENT_COLUMNS}
+    for payload in iter_payloads(events_path, chunk_size, 0):
+        columns = parse_csv_records(*payload) if isinstance(payload, tuple) else payload
+        size = len(columns['employee_id'])
+        parts['employee_id'].append(np.fromiter((codes.setdefault(e, len(codes)) for e in columns['employee_id']),
+                                                dtype=np.intp, count=size))
+        parts['month'].append(numeric_column(columns, 'month', size).astype(np.intp))
+        parts['kind'].append(np.asarray(columns['kind'], dtype=str))
+        parts['amount'].append(numeric_column(columns, 'amount', size))
+        parts['regime'].append(np.asarray(columns['regime'], dtype=str) if 'regime' in columns
+                               else np.full(size, ''))
+    events = {name: np.concatenate(values) if values else np.array([]) for name, values in parts.items()}
+
+    result = replay_tds_batch(events['employee_id'], events['month'], events['kind'], events['amount'],
+                              events['regime'], len(codes), assessment_year)
+    output = {
+        'employee_id': list(codes),
+        'regime': result['regime'],
+        'projected_income': result['projected_income'],
+        'projected_tax': result['projected_tax'],
+    }
+    for index, name in enumerate(TDS_MONTH_COLUMNS):
+        output[name] = result['tds'][:, index]
+    output['tds_to_date'] = result['tds_to_date']
+
+    if is_parquet(output_path):
+        writer = ParquetChunkWriter(output_path)
+        writer.write(encode_parquet_chunk(output))
+    else:
+        writer = CsvChunkWriter(output_path)
+        writer.write(encode_csv_chunk(output, include_header=True))
+    writer.close()
+    elapsed = time.perf_counter() - start
+    return {'events': len(events['employee_id']), 'employees': len(codes), 'seconds': elapsed}
+
+
+def process_file(input_path, output_path, chunk_size=DEFAULT_CHUNK_SIZE, resume=False, progress=None, workers=1,
+                 assessment_year=None, store_path=None, exact=False):
+    """Stream input_path through the tax calculators into output_path
+
+    CSV and Parquet are chosen by file extension; Parquet output is written as
+    a directory of part files. With resume=True an existing checkpoint is
+    picked up and the run continues after the last completed chunk. workers
+    sets the size of the process pool shards are spread across. progress, if
+    given, is called with a stats dict after every chunk. Rules default to the
+    current assessment year. store_path names a ResultStore file to reuse
+    and save chunk results in. exact=True computes in integer paise with
+    Section 288A/288B rounding.
+    """
+    rules = get_rule_set(assessment_year)
+    assessment_year = rules.assessment_year
+    checkpoint = load_checkpoint(output_path) if resume else None
+    if checkpoint and (checkpoint['input'] != os.path.abspath(input_path)
+                       or checkpoint['chunk_size'] != chunk_size
+                       or checkpoint['assessment_year'] != assessment_year
+                       or checkpoint.get('exact', False) != exact):
+        raise ValueError("Checkpoint was written for a different input file, chunk size, assessment year or mode")
+    if checkpoint and checkpoint.get('rule_version', rules.version) != rules.version:
+        raise ValueError("The tax rules in tax_config.py changed since this run started; rerun it from the start")
+    if checkpoint is None:
+        checkpoint = {
+            'input': os.path.abspath(input_path),
+            'chunk_size': chunk_size,
+            'assessment_year': assessment_year,
+            'rule_version': rules.version,
+            'exact': exact,
+            'chunks_done': 0,
+            'rows_done': 0,
+            'output_offset': None,
+        }
+
+    output_format = 'parquet' if is_parquet(output_path) else 'csv'
+    writer_class = ParquetChunkWriter if output_format == 'parquet' else CsvChunkWriter
+    writer = writer_class(output_path, checkpoint['output_offset'])
+    payloads = iter_payloads(input_path, chunk_size, checkpoint['rows_done'])
+
+    start = time.perf_counter()
+    rows = 0
+    try:
+        results = _iter_results(payloads, output_format, not checkpoint['output_offset'], workers, assessment_year,
+                                store_path, exact)
+        for chunk_rows, encoded in results:
+            checkpoint['output_offset'] = writer.write(encoded)
+            checkpoint['chunks_done'] += 1
+            checkpoint['rows_done'] += chunk_rows
+            rows += chunk_rows
+            save_checkpoint(output_path, checkpoint)
+
+            if progress is not None:
+                elapsed = time.perf_counter() - start
+                progress({
+                    'chunks': checkpoint['chunks_done'],
+                    'rows': checkpoint['rows_done'],
+                    'seconds': elapsed,
+                    'rows_per_sec': rows / elapsed if elapsed else 0.0,
+                })
+    finally:
+        writer.close()
+
+    # The run finished, so there is nothing left to resume
+    if os.path.exists(checkpoint_path(output_path)):
+        os.remove(checkpoint_path(output_path))
+
+    elapsed = time.perf_counter() - start
+    return {
+        'chunks': checkpoint['chunks_done'],
+        'rows': checkpoint['rows_done'],
+        'seconds': elapsed,
+        'rows_per_sec': rows / elapsed if elapsed else 0.0,
+    }
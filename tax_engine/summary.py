@@ -0,0 +1,152 @@
+# tax_engine/summary.py
+import json
+
+from tax_engine.advance_tax import calculate_advance_tax_schedule
+from tax_engine.cache import LRUCache
+from tax_engine.capital_gains import calculate_capital_gains_tax
+from tax_engine.reactive import Node
+from tax_engine.regimes import calculate_tax_new_regime, calculate_tax_old_regime
+from tax_engine.results import CapitalGainsTax, QuarterlyCapitalGainsTax, TaxBreakdown
+from tax_engine.rules import get_rule_set
+from tax_engine.store import default_store, result_key
+
+RESULT_CACHE = LRUCache(maxsize=512)
+
+# Inputs of calculator_nodes(); ltcg and stcg are tuples in advance tax quarter order
+CALCULATOR_INPUTS = ('annual_income', 'deductions', 'ltcg', 'stcg', 'assessment_year', 'rule_version')
+
+
+def tax_summary_key(annual_income, deductions, ltcg_by_quarter, stcg_by_quarter, assessment_year=None):
+    """Normalize the Tax Calculator inputs into a hashable cache key"""
+    rules = get_rule_set(assessment_year)
+    quarters = [installment.quarter for installment in rules.advance_tax]
+    return (
+        rules.assessment_year,
+        rules.version,
+        annual_income,
+        deductions,
+        tuple(ltcg_by_quarter.get(q, 0) for q in quarters),
+        tuple(stcg_by_quarter.get(q, 0) for q in quarters),
+    )
+
+
+def calculate_tax_summary(annual_income, deductions, ltcg_by_quarter, stcg_by_quarter, assessment_year=None):
+    """Calculate everything the Tax Calculator page shows for one taxpayer
+
+    Capital gains tax is included in both regime totals and the advance tax
+    schedule follows the new regime, as on the page. Results are returned
+    in the dict shape the page reads.
+    """
+    new_regime_tax = calculate_tax_new_regime(annual_income, assessment_year)
+    old_regime_tax = calculate_tax_old_regime(annual_income, deductions, assessment_year)
+    cg_tax = calculate_capital_gains_tax(ltcg_by_quarter, stcg_by_quarter, assessment_year)
+    totals = regime_totals(new_regime_tax, old_regime_tax, cg_tax)
+    schedule = advance_tax_schedule(totals, cg_tax, assessment_year)
+
+    return {
+        'new_regime': new_regime_tax._replace(total_tax=totals['new_regime']).as_dict(),
+        'old_regime': old_regime_tax._replace(total_tax=totals['old_regime']).as_dict(),
+        'capital_gains': cg_tax.as_dict(),
+        'advance_tax': [installment.as_dict() for installment in schedule],
+        'recommended_regime': totals['recommended_regime'],
+        'tax_saving': totals['tax_saving']
+    }
+
+
+def regime_totals(new_regime_tax, old_regime_tax, cg_tax):
+    """Each regime's total tax with capital gains tax included, and the regime to recommend"""
+    new_total = new_regime_tax.total_tax + cg_tax.total_cg_tax
+    old_total = old_regime_tax.total_tax + cg_tax.total_cg_tax
+    return {
+        'new_regime': new_total,
+        'old_regime': old_total,
+        'recommended_regime': 'new' if new_total < old_total else 'old',
+        'tax_saving': abs(new_total - old_total)
+    }
+
+
+def advance_tax_schedule(totals, cg_tax, assessment_year=None):
+    """The advance tax schedule, which follows the new regime as on the page"""
+    cg_tax_by_quarter = {q: tax.total for q, tax in zip(cg_tax.quarters, cg_tax.quarterly)}
+    return calculate_advance_tax_schedule(totals['new_regime'], cg_tax_by_quarter, assessment_year)
+
+
+def _quarterly(amounts, assessment_year):
+    quarters = [installment.quarter for installment in get_rule_set(assessment_year).advance_tax]
+    return dict(zip(quarters, amounts))
+
+
+def _stored(kind, rule_version, inputs, compute, decode=None):
+    """compute(), read from and written back to the default ResultStore when one is set
+
+    Values go through the store as JSON; decode rebuilds a stored value.
+    """
+    store = default_store()
+    if store is None:
+        return compute()
+
+    store_key = result_key(kind, rule_version, inputs)
+    payload = store.get_many([store_key]).get(store_key)
+    if payload is not None:
+        value = json.loads(payload)
+        return value if decode is None else decode(value)
+    value = compute()
+    store.put_many(kind, rule_version, [(store_key, json.dumps(value).encode('utf-8'))])
+    return value
+
+
+def _shared_node(name, inputs, compute, decode):
+    """A Node whose values are shared between sessions through RESULT_CACHE and the default store
+
+    rule_version must be the last of inputs, so results under edited rules
+    are never reused.
+    """
+    def shared(*values):
+        return RESULT_CACHE.get_or_compute(
+            (name,) + values,
+            lambda: _stored(name, values[-1], values, lambda: compute(*values[:-1]), decode)
+        )
+    return Node(name, inputs, shared)
+
+
+def _capital_gains_from_json(values):
+    *amounts, quarters, quarterly = values
+    return CapitalGainsTax(*amounts, tuple(quarters), tuple(QuarterlyCapitalGainsTax._make(q) for q in quarterly))
+
+
+def calculator_nodes():
+    """The Tax Calculator's calculations as tax_engine.reactive Nodes over CALCULATOR_INPUTS
+
+    Each regime's tax is on income alone; capital gains tax joins it in
+    totals. An edit to capital gains therefore leaves both regime nodes, and
+    anything drawn from them, as they were. The regime and capital gains
+    results are shared between sessions like cached_tax_summary's.
+    """
+    return [
+        _shared_node('new_regime', ('annual_income', 'assessment_year', 'rule_version'),
+                     calculate_tax_new_regime, TaxBreakdown._make),
+        _shared_node('old_regime', ('annual_income', 'deductions', 'assessment_year', 'rule_version'),
+                     calculate_tax_old_regime, TaxBreakdown._make),
+        _shared_node('capital_gains', ('ltcg', 'stcg', 'assessment_year', 'rule_version'),
+                     lambda ltcg, stcg, assessment_year: calculate_capital_gains_tax(
+                         _quarterly(ltcg, assessment_year), _quarterly(stcg, assessment_year), assessment_year),
+                     _capital_gains_from_json),
+        Node('totals', ('new_regime', 'old_regime', 'capital_gains'), regime_totals),
+        Node('advance_tax', ('totals', 'capital_gains', 'assessment_year', 'rule_version'),
+             lambda totals, cg_tax, assessment_year, _: advance_tax_schedule(totals, cg_tax, assessment_year)),
+    ]
+
+
+def cached_tax_summary(annual_income, deductions, ltcg_by_quarter, stcg_by_quarter, assessment_year=None):
+    """calculate_tax_summary memoized in RESULT_CACHE, backed by the store in TAX_RESULT_STORE
+
+    Returns (key, summary). The summary is shared between callers and must be
+    treated as read-only; key can be reused to cache anything derived from it.
+    """
+    key = tax_summary_key(annual_income, deductions, ltcg_by_quarter, stcg_by_quarter, assessment_year)
+    summary = RESULT_CACHE.get_or_compute(
+        key,
+        lambda: _stored('tax_summary', key[1], key, lambda: calculate_tax_summary(
+            annual_income, deductions, ltcg_by_quarter, stcg_by_quarter, assessment_year))
+    )
+    return key, summary
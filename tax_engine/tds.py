@@ -0,0 +1,248 @@
+# tax_engine/tds.py
+"""Month-by-month salary TDS under Section 192.
+
+Each employee's state is a handful of year-to-date figures: the current
+monthly salary, income paid so far, TDS deducted so far, declared old-regime
+deductions and the regime opted for. A payroll event changes one of them,
+and closing a month projects the annual income as what has been paid plus
+the current salary for the months still to come:
+
+    projected income = income to date + salary x months after this one
+    TDS this month   = (tax on projected income - TDS to date) / months left, this one included
+
+so a salary revision, bonus or new declaration is spread over the rest of
+the year without replaying the months before it. Both steps are O(1) per
+employee; the tax is one lookup in the compiled regime function.
+
+TDS is rounded to the nearest rupee and never negative: an over-deduction is
+left for the return to refund. Months are calendar months (4 is April);
+index 0 of a year's schedule is April. replay_tds_batch replays a whole
+year of events for every employee at once; it imports NumPy when called.
+"""
+import math
+from typing import NamedTuple
+
+from tax_engine.regimes import calculate_tax_new_regime, calculate_tax_old_regime
+from tax_engine.results import MonthlyTds
+from tax_engine.rules import get_rule_set
+
+EVENT_KINDS = ('salary', 'bonus', 'declaration')
+
+MONTHS_IN_YEAR = 12
+
+
+class PayrollEvent(NamedTuple):
+    """One change to an employee's pay, applied before that month's TDS is worked out
+
+    salary sets the monthly salary from this month on, bonus adds a one-off
+    payment this month, and declaration replaces the declared old-regime
+    deductions with amount and, when regime is 'old' or 'new', switches
+    regime.
+    """
+    employee_id: str
+    month: int
+    kind: str
+    amount: float
+    regime: str = None
+
+
+def month_index(month):
+    """Position of a calendar month in the financial year, April being 0"""
+    if not 1 <= month <= MONTHS_IN_YEAR:
+        raise ValueError(f"Month must be 1 to 12, not {month!r}")
+    return (month - 4) % MONTHS_IN_YEAR
+
+
+def calendar_month(index):
+    """Inverse of month_index"""
+    return (index + 3) % MONTHS_IN_YEAR + 1
+
+
+def round_tds(amount):
+    """TDS to the nearest rupee, fifty paise rounding up, and never negative"""
+    return float(math.floor(amount + 0.5)) if amount > 0 else 0.0
+
+
+class _EmployeeState:
+    __slots__ = ('salary', 'income_to_date', 'tds_to_date', 'deductions', 'regime', 'months_closed')
+
+    def __init__(self):
+        self.salary = 0.0
+        self.income_to_date = 0.0
+        self.tds_to_date = 0.0
+        self.deductions = 0.0
+        self.regime = 'new'
+        self.months_closed = 0
+
+
+class TdsEngine:
+    """Per-employee year-to-date TDS state for one financial year
+
+    apply() takes payroll events and close_month() works out an employee's
+    TDS for a month; both touch only that employee's state. Months must be
+    closed in order, and events can only be applied to months not yet
+    closed.
+    """
+
+    def __init__(self, assessment_year=None):
+        self.rules = get_rule_set(assessment_year)
+        self._employees = {}
+
+    def __len__(self):
+        return len(self._employees)
+
+    def _state(self, employee_id):
+        state = self._employees.get(employee_id)
+        if state is None:
+            state = self._employees[employee_id] = _EmployeeState()
+        return state
+
+    def apply(self, event):
+        """Apply a PayrollEvent to its employee's state"""
+        if event.kind not in EVENT_KINDS:
+            raise ValueError(f"Unknown payroll event {event.kind!r}; expected one of {', '.join(EVENT_KINDS)}")
+        if event.regime not in (None, 'old', 'new'):
+            raise ValueError(f"Regime must be 'old' or 'new', not {event.regime!r}")
+        state = self._state(event.employee_id)
+        if month_index(event.month) < state.months_closed:
+            raise ValueError(f"{event.employee_id}: month {event.month} is already closed")
+
+        if event.kind == 'salary':
+            state.salary = event.amount
+        elif event.kind == 'bonus':
+            state.income_to_date += event.amount
+        else:
+            state.deductions = event.amount
+            if event.regime is not None:
+                state.regime = event.regime
+
+    def projected_tax(self, projected_income, deductions, regime):
+        if regime == 'old':
+            return calculate_tax_old_regime(projected_income, deductions, self.rules.assessment_year).total_tax
+        return calculate_tax_new_regime(projected_income, self.rules.assessment_year).total_tax
+
+    def close_month(self, employee_id, month):
+        """Pay this month's salary and deduct its TDS; returns a MonthlyTds"""
+        state = self._state(employee_id)
+        index = month_index(month)
+        if index != state.months_closed:
+            raise ValueError(f"{employee_id}: month {month} closed out of order")
+
+        state.income_to_date += state.salary
+        months_left = MONTHS_IN_YEAR - index
+        projected_income = state.income_to_date + state.salary * (months_left - 1)
+        projected_tax = self.projected_tax(projected_income, state.deductions, state.regime)
+        tds = round_tds((projected_tax - state.tds_to_date) / months_left)
+        state.tds_to_date += tds
+        state.months_closed += 1
+        return MonthlyTds(employee_id, month, state.regime, projected_income, projected_tax, tds, state.tds_to_date)
+
+    def close_all(self, month):
+        """close_month for every employee seen so far"""
+        return [self.close_month(employee_id, month) for employee_id in self._employees]
+
+
+def replay_events(events, assessment_year=None):
+    """Run a year of PayrollEvents through a TdsEngine
+
+    Returns {employee_id: [MonthlyTds for April .. March]}. Events are applied
+    in the order given within each month.
+    """
+    by_month = [[] for _ in range(MONTHS_IN_YEAR)]
+    for event in events:
+        by_month[month_index(event.month)].append(event)
+
+    engine = TdsEngine(assessment_year)
+    schedules = {}
+    for index, month_events in enumerate(by_month):
+        for event in month_events:
+            if event.employee_id not in schedules:
+                # Employees joining mid-year are paid nothing in the months before
+                schedules[event.employee_id] = [engine.close_month(event.employee_id, calendar_month(i))
+                                                for i in range(index)]
+            engine.apply(event)
+        for result in engine.close_all(calendar_month(index)):
+            schedules[result.employee_id].append(result)
+    return schedules
+
+
+def _last_per_employee(employee, values):
+    """(employees, value) keeping each employee's last value, as applying them in order would"""
+    import numpy as np
+
+    employees, first = np.unique(employee[::-1], return_index=True)
+    return employees, values[::-1][first]
+
+
+def replay_tds_batch(employee, month, kind, amount, regime=None, employees=None, assessment_year=None):
+    """Vectorized equivalent of replay_events
+
+    Events are given as arrays: employee as codes 0 .. employees - 1, month as
+    calendar months, kind as 'salary', 'bonus' or 'declaration', and regime
+    as 'old', 'new' or '' to leave it unchanged. Events within a month apply
+    in the order given. Each month is one vectorized step over every
+    employee. Returns a column bundle per employee with the final regime,
+    projection and tds_to_date, and tds as an (employees, 12) array, April
+    first.
+    """
+    import numpy as np
+
+    from tax_engine.batch import calculate_tax_batch, get_batch_rule_set
+
+    rules = get_batch_rule_set(assessment_year)
+    employee = np.asarray(employee, dtype=np.intp)
+    index = (np.asarray(month, dtype=np.intp) - 4) % MONTHS_IN_YEAR
+    if np.any((np.asarray(month) < 1) | (np.asarray(month) > MONTHS_IN_YEAR)):
+        raise ValueError("Months must be 1 to 12")
+    kind = np.asarray(kind)
+    unknown = ~np.isin(kind, EVENT_KINDS)
+    if unknown.any():
+        raise ValueError(f"Unknown payroll event {kind[unknown][0]!r}; expected one of {', '.join(EVENT_KINDS)}")
+    amount = np.asarray(amount, dtype=np.float64)
+    regime = np.full(len(employee), '') if regime is None else np.asarray(regime)
+    if not np.isin(regime, ('', 'old', 'new')).all():
+        raise ValueError("Regime must be 'old', 'new' or empty")
+    if employees is None:
+        employees = int(employee.max()) + 1 if len(employee) else 0
+
+    order = np.argsort(index, kind='stable')
+    employee, index, kind, amount, regime = employee[order], index[order], kind[order], amount[order], regime[order]
+    month_starts = np.searchsorted(index, np.arange(MONTHS_IN_YEAR + 1), side='left')
+
+    salary = np.zeros(employees)
+    income_to_date = np.zeros(employees)
+    tds_to_date = np.zeros(employees)
+    deductions = np.zeros(employees)
+    old = np.zeros(employees, dtype=bool)
+    tds = np.empty((employees, MONTHS_IN_YEAR))
+    for m in range(MONTHS_IN_YEAR):
+        events = slice(month_starts[m], month_starts[m + 1])
+        e, k, a, r = employee[events], kind[events], amount[events], regime[events]
+        revised, revised_salary = _last_per_employee(e[k == 'salary'], a[k == 'salary'])
+        salary[revised] = revised_salary
+        income_to_date += np.bincount(e[k == 'bonus'], weights=a[k == 'bonus'], minlength=employees)
+        declared, declared_amount = _last_per_employee(e[k == 'declaration'], a[k == 'declaration'])
+        deductions[declared] = declared_amount
+        chose = (k == 'declaration') & (r != '')
+        chosen, choice = _last_per_employee(e[chose], r[chose])
+        old[chosen] = choice == 'old'
+
+        income_to_date += salary
+        months_left = MONTHS_IN_YEAR - m
+        projected_income = income_to_date + salary * (months_left - 1)
+        projected_tax = np.where(
+            old,
+            calculate_tax_batch(projected_income - deductions, rules.old_tax)['total_tax'],
+            calculate_tax_batch(projected_income - rules.standard_deduction, rules.new_tax)['total_tax']
+        )
+        due = (projected_tax - tds_to_date) / months_left
+        tds[:, m] = np.where(due > 0, np.floor(due + 0.5), 0.0)
+        tds_to_date += tds[:, m]
+
+    return {
+        'regime': np.where(old, 'old', 'new'),
+        'projected_income': projected_income,
+        'projected_tax': projected_tax,
+        'tds': tds,
+        'tds_to_date': tds_to_date
+    }
@@ -0,0 +1,193 @@
+# tax_engine/tradebook.py
+"""Capital gains from broker tradebooks by FIFO lot matching.
+
+A tradebook CSV is streamed row by row in trade-date order. Buys open lots
+on a per-security FIFO queue and sells consume the oldest lots first, so
+memory only grows with the number of open lots. Each matched slice is long
+term when held for more than the assessment year's holding period and is
+bucketed into the advance tax installment whose due date first falls on or
+after the sale (sales after the last due date go into the last one).
+
+Losses are set off over the whole year, whichever quarter they fall in:
+short term losses against short term gains and then long term gains, long
+term losses against long term gains only. The net gains are then spread
+over the quarters in proportion to the gains realized in each, so the
+quarterly totals that come out can be passed straight to
+calculate_capital_gains_tax.
+"""
+import csv
+from bisect import bisect_left
+from calendar import monthrange
+from collections import deque
+from datetime import date
+from operator import itemgetter
+
+from tax_engine.capital_gains import calculate_capital_gains_tax
+from tax_engine.rules import financial_year_start, get_rule_set
+
+REQUIRED_COLUMNS = ('symbol', 'trade_date', 'trade_type', 'quantity', 'price')
+
+BUY_TYPES = frozenset(('buy', 'b'))
+SELL_TYPES = frozenset(('sell', 's'))
+
+
+def _add_months(day, months):
+    month = day.month - 1 + months
+    year = day.year + month // 12
+    month = month % 12 + 1
+    # Clamp to the last day of shorter months (e.g. 29 Feb)
+    return date(year, month, min(day.day, monthrange(year, month)[1]))
+
+
+def read_tradebook(source):
+    """Yield (symbol, trade_date, trade_type, quantity, price) string tuples from a tradebook CSV
+
+    source is a path or an open text file. Column names are matched
+    case-insensitively; other columns are ignored.
+    """
+    if not hasattr(source, 'read'):
+        with open(source, newline='', encoding='utf-8-sig') as f:
+            yield from read_tradebook(f)
+        return
+
+    reader = csv.reader(source)
+    header = [name.strip().lower().lstrip('\ufeff') for name in next(reader)]
+    missing = [name for name in REQUIRED_COLUMNS if name not in header]
+    if missing:
+        raise ValueError(f"Tradebook is missing columns: {', '.join(missing)}")
+    columns = itemgetter(*(header.index(name) for name in REQUIRED_COLUMNS))
+    yield from map(columns, filter(None, reader))
+
+
+def _apportion(net_gain, gains_by_quarter):
+    # Split the year's net gain over the quarters that realized gains, pro rata
+    realized = sum(gain for gain in gains_by_quarter.values() if gain > 0)
+    if net_gain <= 0 or realized <= 0:
+        return {quarter: 0.0 for quarter in gains_by_quarter}
+    return {quarter: net_gain * gain / realized if gain > 0 else 0.0
+            for quarter, gain in gains_by_quarter.items()}
+
+
+def set_off_losses(ltcg_by_quarter, stcg_by_quarter):
+    """Set off the year's losses and split the net gains back over the quarters
+
+    Short term losses are set off against short term gains and then long
+    term gains; long term losses against long term gains only. Returns
+    (ltcg_by_quarter, stcg_by_quarter, ltcl_unabsorbed, stcl_unabsorbed)
+    with non-negative quarterly gains and the losses left to carry forward.
+    """
+    ltcg = sum(ltcg_by_quarter.values())
+    stcg = sum(stcg_by_quarter.values())
+    stcl = max(0.0, -stcg)
+    absorbed = min(stcl, max(0.0, ltcg))
+    ltcg -= absorbed
+    stcl -= absorbed
+    return (
+        _apportion(ltcg, ltcg_by_quarter),
+        _apportion(stcg, stcg_by_quarter),
+        max(0.0, -ltcg),
+        stcl
+    )
+
+
+def match_trades(rows, assessment_year=None):
+    """FIFO-match buy and sell rows and bucket realized gains by advance tax quarter
+
+    rows are (symbol, trade_date, trade_type, quantity, price) tuples in
+    trade-date order, as yielded by read_tradebook(). Returns a dict
+    with net 'ltcg_by_quarter' and 'stcg_by_quarter' after loss set-off, the
+    raw per-quarter 'ltcg_gross'/'stcg_gross' and 'ltcl_unabsorbed'/
+    'stcl_unabsorbed' amounts, trade counts, the number of lots still open and
+    any sell quantity that had no open lot to match ('unmatched_sells').
+    """
+    rules = get_rule_set(assessment_year)
+    quarters = [installment.quarter for installment in rules.advance_tax]
+    due_ordinals = [installment.due.toordinal() for installment in rules.advance_tax]
+    year_start = financial_year_start(rules).toordinal()
+    year_end = date(financial_year_start(rules).year + 1, 3, 31).toordinal()
+    holding_months = rules.ltcg_holding_months
+
+    ltcg = [0.0] * len(quarters)
+    stcg = [0.0] * len(quarters)
+    lots = {}
+    unmatched = {}
+    # Dates repeat heavily in tradebooks, so parse each one once
+    ordinals = {}
+    long_term_after = {}
+    last_ordinal = 0
+    trades = 0
+    matched_slices = 0
+
+    for symbol, trade_day, side, quantity, price in rows:
+        trade_day = trade_day[:10]
+        ordinal = ordinals.get(trade_day)
+        if ordinal is None:
+            day = date.fromisoformat(trade_day)
+            ordinal = ordinals[trade_day] = day.toordinal()
+            long_term_after[ordinal] = _add_months(day, holding_months).toordinal()
+        if ordinal < last_ordinal:
+            raise ValueError(f"Tradebook is not sorted by trade date at {trade_day}")
+        last_ordinal = ordinal
+
+        side = side.strip().lower()
+        quantity = float(quantity)
+        price = float(price)
+        trades += 1
+
+        if side in BUY_TYPES:
+            queue = lots.get(symbol)
+            if queue is None:
+                queue = lots[symbol] = deque()
+            queue.append([quantity, price, ordinal])
+            continue
+        if side not in SELL_TYPES:
+            raise ValueError(f"Unknown trade_type {side!r} for {symbol}")
+
+        queue = lots.get(symbol)
+        in_year = year_start <= ordinal <= year_end
+        bucket = min(bisect_left(due_ordinals, ordinal), len(quarters) - 1)
+        while quantity > 0 and queue:
+            lot = queue[0]
+            matched = lot[0] if lot[0] <= quantity else quantity
+            if in_year:
+                gain = (price - lot[1]) * matched
+                if ordinal > long_term_after[lot[2]]:
+                    ltcg[bucket] += gain
+                else:
+                    stcg[bucket] += gain
+            matched_slices += 1
+            quantity -= matched
+            lot[0] -= matched
+            if lot[0] <= 0:
+                queue.popleft()
+        if quantity > 0:
+            unmatched[symbol] = unmatched.get(symbol, 0.0) + quantity
+        if queue is not None and not queue:
+            del lots[symbol]
+
+    ltcg_gross = dict(zip(quarters, ltcg))
+    stcg_gross = dict(zip(quarters, stcg))
+    ltcg_by_quarter, stcg_by_quarter, ltcl_unabsorbed, stcl_unabsorbed = set_off_losses(ltcg_gross, stcg_gross)
+    return {
+        'ltcg_by_quarter': ltcg_by_quarter,
+        'stcg_by_quarter': stcg_by_quarter,
+        'ltcg_gross': ltcg_gross,
+        'stcg_gross': stcg_gross,
+        'ltcl_unabsorbed': ltcl_unabsorbed,
+        'stcl_unabsorbed': stcl_unabsorbed,
+        'trades': trades,
+        'matched_slices': matched_slices,
+        'open_lots': sum(len(queue) for queue in lots.values()),
+        'unmatched_sells': unmatched
+    }
+
+
+def calculate_tradebook_tax(source, assessment_year=None):
+    """Match a tradebook CSV and run the result through calculate_capital_gains_tax
+
+    source is a path or open text file. Returns (gains, cg_tax) where gains
+    is the match_trades() result.
+    """
+    gains = match_trades(read_tradebook(source), assessment_year)
+    cg_tax = calculate_capital_gains_tax(gains['ltcg_by_quarter'], gains['stcg_by_quarter'], assessment_year)
+    return gains, cg_tax
@@ -0,0 +1,47 @@
+# tests/test_advance_tax.py
+import numpy as np
+import pytest
+
+from tax_engine.advance_tax import (
+    calculate_advance_tax_schedule,
+    calculate_advance_tax_schedule_batch,
+    installment_windows,
+)
+
+QUARTERS = ['Q1', 'Q2', 'Q3', 'Q4']
+
+
+@pytest.mark.parametrize('assessment_year', ['2024-25', '2025-26', '2026-27'])
+def test_batch_schedule_matches_scalar(assessment_year):
+    total_tax = np.array([0.0, 8000.0, 250000.0, 1800000.0])
+    cg_tax = np.array([[0, 0, 0, 0], [0, 0, 0, 0], [12000, 0, 3000, 0], [0, 50000, 0, 25000]], dtype=float)
+    result = calculate_advance_tax_schedule_batch(total_tax, cg_tax, assessment_year=assessment_year)
+    for i in range(len(total_tax)):
+        schedule = calculate_advance_tax_schedule(total_tax[i], dict(zip(QUARTERS, cg_tax[i])), assessment_year)
+        np.testing.assert_allclose(result['regular_tax'][i], [entry.regular_tax for entry in schedule])
+        np.testing.assert_allclose(result['total_amount'][i], [entry.total_amount for entry in schedule])
+
+
+def test_interest_on_unpaid_advance_tax():
+    result = calculate_advance_tax_schedule_batch([100000.0], [[0, 0, 0, 0]], assessment_year='2025-26')
+    # 234C: 1% a month on each installment's rounded shortfall for 3, 3, 3 and 1 months
+    np.testing.assert_allclose(result['interest_234c'][0], [450, 1350, 2250, 1000])
+    # 234B: nothing paid, so 1% a month from April to the July filing deadline
+    assert result['interest_234b'][0] == pytest.approx(4000)
+
+
+def test_no_interest_when_paid_on_time_or_below_the_threshold():
+    paid = calculate_advance_tax_schedule_batch(
+        [100000.0, 9000.0], [[0, 0, 0, 0], [0, 0, 0, 0]],
+        payments=[[15000, 30000, 30000, 25000], [0, 0, 0, 0]], assessment_year='2025-26'
+    )
+    np.testing.assert_array_equal(paid['total_interest'], [0, 0])
+
+
+def test_installment_windows_follow_the_due_dates():
+    assert installment_windows('2025-26') == {
+        'Q1': 'Q1 (up to 15 Jun)',
+        'Q2': 'Q2 (16 Jun - 15 Sep)',
+        'Q3': 'Q3 (16 Sep - 15 Dec)',
+        'Q4': 'Q4 (16 Dec - 31 Mar)',
+    }
@@ -0,0 +1,59 @@
+# tests/test_batch.py
+import numpy as np
+import pytest
+
+from tax_engine import calculate_capital_gains_tax, calculate_tax_new_regime, calculate_tax_old_regime
+from tax_engine.batch import (
+    calculate_capital_gains_tax_batch,
+    calculate_tax_new_regime_batch,
+    calculate_tax_old_regime_batch,
+    compare_regimes_batch,
+)
+from tax_engine.rules import RULE_SETS
+
+QUARTERS = ['Q1', 'Q2', 'Q3', 'Q4']
+
+
+@pytest.fixture
+def population():
+    rng = np.random.default_rng(0)
+    income = np.round(rng.lognormal(np.log(1500000), 1.2, 2000), 2)
+    # Slab limits, surcharge thresholds and the amounts either side of them
+    edges = np.array([0, 75000, 300000, 375000, 1275000, 5000000, 5075000, 10000000, 20000000, 50000000])
+    income = np.concatenate([income, edges, edges + 1, edges - 1])
+    return {
+        'income': income,
+        'deductions': np.round(rng.uniform(0, 400000, len(income)), 2),
+        'ltcg': np.round(rng.uniform(0, 100000, (len(income), 4)), 2),
+        'stcg': np.round(rng.uniform(0, 100000, (len(income), 4)), 2),
+    }
+
+
+@pytest.mark.parametrize('assessment_year', list(RULE_SETS))
+def test_regimes_match_scalar(population, assessment_year):
+    new = calculate_tax_new_regime_batch(population['income'], assessment_year)
+    old = calculate_tax_old_regime_batch(population['income'], population['deductions'], assessment_year)
+    for i, (income, deductions) in enumerate(zip(population['income'].tolist(), population['deductions'].tolist())):
+        for batch, scalar in ((new, calculate_tax_new_regime(income, assessment_year)),
+                              (old, calculate_tax_old_regime(income, deductions, assessment_year))):
+            for field, value in scalar.as_dict().items():
+                assert batch[field][i] == pytest.approx(value, abs=1e-6), (income, field)
+
+
+def test_capital_gains_match_scalar(population):
+    batch = calculate_capital_gains_tax_batch(population['ltcg'], population['stcg'])
+    for i in range(0, len(population['income']), 37):
+        scalar = calculate_capital_gains_tax(dict(zip(QUARTERS, population['ltcg'][i].tolist())),
+                                             dict(zip(QUARTERS, population['stcg'][i].tolist())))
+        assert batch['total_cg_tax'][i] == pytest.approx(scalar.total_cg_tax)
+        assert batch['quarterly_tax'][i].tolist() == pytest.approx([q.total for q in scalar.quarterly])
+
+
+def test_compare_regimes_adds_capital_gains_and_recommends_strictly_cheaper(population):
+    result = compare_regimes_batch(population['income'], population['deductions'],
+                                   population['ltcg'], population['stcg'])
+    new = calculate_tax_new_regime_batch(population['income'])['total_tax']
+    cg = calculate_capital_gains_tax_batch(population['ltcg'], population['stcg'])['total_cg_tax']
+    np.testing.assert_allclose(result['new_regime']['total_tax'], new + cg)
+    cheaper = result['new_regime']['total_tax'] < result['old_regime']['total_tax']
+    assert (result['recommended_regime'] == np.where(cheaper, 'new', 'old')).all()
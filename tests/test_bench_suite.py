@@ -0,0 +1,27 @@
+# tests/test_bench_suite.py
+from benchmarks.bench_suite import Case, compare, measure, run_suite
+
+
+def result(seconds):
+    return {'seconds_per_call': seconds, 'best_seconds_per_call': seconds}
+
+
+def test_compare_flags_regressions_beyond_the_threshold():
+    baseline = {'same': result(1.0), 'slower': result(1.0), 'faster': result(1.0), 'edge': result(1.0)}
+    results = {'same': result(1.1), 'slower': result(1.3), 'faster': result(0.7), 'edge': result(1.25),
+               'added': result(1.0)}
+    comparison = compare(results, baseline, threshold=0.25)
+    assert comparison['same'] == (1.1, 'ok')
+    assert comparison['slower'][1] == 'REGRESSION'
+    assert comparison['faster'][1] == 'faster'
+    assert comparison['edge'][1] == 'ok'
+    assert comparison['added'] == (None, 'new')
+
+
+def test_measure_reports_seconds_per_call():
+    calls = []
+    case = Case('noop', lambda: lambda: calls.append(1), calls=10, min_round=0.001)
+    median, best = measure(case, repeat=3)
+    assert 0 < best <= median
+    results = run_suite([case], repeat=2)
+    assert set(results['noop']) == {'seconds_per_call', 'best_seconds_per_call'}
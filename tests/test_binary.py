@@ -0,0 +1,66 @@
+# tests/test_binary.py
+import csv
+
+import numpy as np
+import pytest
+
+from tax_engine.binary import convert_to_binary, create_records, open_records, process_binary, read_records
+from tax_engine.streaming import QUARTERS, RESULT_COLUMNS, encode_csv_chunk, process_file
+
+COLUMNS = ['annual_income', 'deductions', 'age'] + [f'ltcg_{q}' for q in QUARTERS] + \
+    [f'stcg_{q}' for q in QUARTERS]
+
+
+def write_payroll(path, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for _ in range(rows):
+            writer.writerow([f'{rng.uniform(0, 6000000):.2f}', f'{rng.uniform(0, 300000):.2f}',
+                             int(rng.integers(20, 90))]
+                            + [f'{rng.uniform(-20000, 50000):.2f}' for _ in range(8)])
+
+
+def read_text(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('exact', [False, True])
+def test_csv_to_taxbin_and_back_matches_the_csv_batch_run(tmp_path, exact):
+    write_payroll(tmp_path / 'in.csv', 250)
+    assert convert_to_binary(str(tmp_path / 'in.csv'), str(tmp_path / 'in.taxbin'), chunk_size=100)['rows'] == 250
+
+    inputs = read_records(str(tmp_path / 'in.taxbin'))
+    assert list(inputs) == COLUMNS
+    assert encode_csv_chunk(inputs, True) == read_text(tmp_path / 'in.csv')
+
+    stats = process_binary(str(tmp_path / 'in.taxbin'), str(tmp_path / 'out.taxbin'), chunk_size=100, exact=exact)
+    assert stats['rows'] == 250 and stats['chunks'] == 3
+    results = read_records(str(tmp_path / 'out.taxbin'))
+    round_trip = encode_csv_chunk(dict(inputs, **{name: results[name] for name in RESULT_COLUMNS}), True)
+
+    process_file(str(tmp_path / 'in.csv'), str(tmp_path / 'out.csv'), chunk_size=100, exact=exact)
+    assert round_trip == read_text(tmp_path / 'out.csv')
+
+
+def test_empty_files_round_trip(tmp_path):
+    (tmp_path / 'in.csv').write_text(','.join(COLUMNS) + '\n', encoding='utf-8')
+    assert convert_to_binary(str(tmp_path / 'in.csv'), str(tmp_path / 'in.taxbin'))['rows'] == 0
+    assert process_binary(str(tmp_path / 'in.taxbin'), str(tmp_path / 'out.taxbin'))['rows'] == 0
+    assert all(len(values) == 0 for values in read_records(str(tmp_path / 'out.taxbin')).values())
+
+
+def test_open_records_rejects_mismatched_files(tmp_path):
+    path = str(tmp_path / 'out.taxbin')
+    create_records(path, 'output', 3).flush()
+    with pytest.raises(ValueError, match='holds output records'):
+        open_records(path, 'input')
+    with open(path, 'ab') as f:
+        f.write(b'\0')
+    with pytest.raises(ValueError, match='header implies'):
+        open_records(path, 'output')
+    (tmp_path / 'in.csv').write_text('annual_income\n1\n', encoding='utf-8')
+    with pytest.raises(ValueError, match='not a .taxbin file'):
+        open_records(str(tmp_path / 'in.csv'), 'input')
@@ -0,0 +1,29 @@
+# tests/test_breakeven.py
+import numpy as np
+import pytest
+
+from tax_engine.batch import break_even_deduction_batch
+from tax_engine.breakeven import break_even_deduction
+from tax_engine.regimes import calculate_tax_new_regime, calculate_tax_old_regime
+from tax_engine.rules import RULE_SETS
+
+INCOMES = [300000, 700000, 1000000, 1275000, 1800000, 3000000, 5200000, 12000000, 60000000]
+
+
+@pytest.mark.parametrize('assessment_year', sorted(RULE_SETS))
+@pytest.mark.parametrize('income', INCOMES)
+def test_break_even_deduction_equalises_the_regimes(income, assessment_year):
+    deduction = break_even_deduction(income, assessment_year)
+    new_tax = calculate_tax_new_regime(income, assessment_year).total_tax
+    old_tax = calculate_tax_old_regime(income, deduction, assessment_year).total_tax
+    assert old_tax <= new_tax + 1e-6
+    if deduction > 1:
+        # A rupee less in deductions and the old regime costs more
+        assert calculate_tax_old_regime(income, deduction - 1, assessment_year).total_tax > new_tax
+
+
+@pytest.mark.parametrize('assessment_year', sorted(RULE_SETS))
+def test_batch_break_even_matches_scalar(assessment_year):
+    incomes = np.array(INCOMES, dtype=float)
+    expected = [break_even_deduction(income, assessment_year) for income in INCOMES]
+    np.testing.assert_allclose(break_even_deduction_batch(incomes, assessment_year), expected, atol=1e-6)
@@ -0,0 +1,42 @@
+# tests/test_cache.py
+import utils
+from tax_engine.cache import LRUCache
+from tax_engine.summary import RESULT_CACHE, cached_tax_summary, calculate_tax_summary
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.stats() == {'hits': 3, 'misses': 1, 'evictions': 1, 'size': 2, 'maxsize': 2}
+
+
+def test_get_or_compute_only_computes_on_a_miss():
+    cache = LRUCache()
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_compute('key', lambda: calls.append(1) or 'value') == 'value'
+    assert len(calls) == 1
+
+
+def test_cached_tax_summary_is_shared_across_reruns(monkeypatch):
+    monkeypatch.delenv('TAX_RESULT_STORE', raising=False)
+    RESULT_CACHE.clear()
+    ltcg, stcg = {'Q1': 150000, 'Q2': 0, 'Q3': 0, 'Q4': 0}, {'Q1': 0, 'Q2': 20000, 'Q3': 0, 'Q4': 0}
+    key, first = cached_tax_summary(2500000, 200000, ltcg, stcg)
+    again_key, again = cached_tax_summary(2500000, 200000, dict(ltcg), dict(stcg))
+    assert again is first and again_key == key
+    assert RESULT_CACHE.stats()['hits'] == 1
+    assert first == calculate_tax_summary(2500000, 200000, ltcg, stcg)
+
+
+def test_cached_figure_builds_once_per_key():
+    utils.FIGURE_CACHE.clear()
+    builds = []
+    first = utils.cached_figure(('test', 1), lambda: builds.append(1) or object())
+    assert utils.cached_figure(('test', 1), lambda: builds.append(1) or object()) is first
+    assert len(builds) == 1
@@ -0,0 +1,51 @@
+# tests/test_curves.py
+import numpy as np
+import pytest
+
+from tax_engine.curves import (
+    MAX_SWEEP_POINTS,
+    cached_tax_rate_curves,
+    downsample_curves,
+    income_sweep,
+    sweep_step,
+    tax_rate_curves,
+)
+from tax_engine.regimes import calculate_tax_new_regime, calculate_tax_old_regime
+
+
+def test_sweep_is_capped_however_fine_the_resolution():
+    incomes = income_sweep(10 ** 12, 1)
+    assert len(incomes) <= MAX_SWEEP_POINTS
+    assert incomes[-1] == pytest.approx(10 ** 12)
+    # The default sweep is well within the cap and keeps its step
+    assert sweep_step(100000000, 100) == 100
+    with pytest.raises(ValueError):
+        sweep_step(100000000, 0)
+
+
+def test_cached_curves_share_an_entry_for_capped_resolutions():
+    first_key, _, evaluated = cached_tax_rate_curves(10 ** 11, 1)
+    second_key, _, _ = cached_tax_rate_curves(10 ** 11, 2)
+    assert evaluated <= MAX_SWEEP_POINTS
+    assert first_key == second_key
+
+
+def test_curves_match_the_scalar_calculators():
+    incomes = np.array([0, 500000, 1275000, 5000001, 25000000], dtype=float)
+    curves = tax_rate_curves(incomes, deductions=200000, assessment_year='2025-26')
+    for i, income in enumerate(incomes):
+        new_tax = calculate_tax_new_regime(income, '2025-26').total_tax
+        old_tax = calculate_tax_old_regime(income, 200000, '2025-26').total_tax
+        assert curves['new_regime']['total_tax'][i] == pytest.approx(new_tax)
+        assert curves['old_regime']['total_tax'][i] == pytest.approx(old_tax)
+
+
+def test_downsampling_keeps_both_sides_of_every_breakpoint():
+    curves = tax_rate_curves(income_sweep(10000000, 10))
+    thinned = downsample_curves(curves, max_points=200)
+    assert len(thinned['income']) < len(curves['income'])
+    for breakpoint in curves['new_regime']['breakpoints']:
+        if breakpoint < thinned['income'][-1]:
+            below = curves['income'][curves['income'] <= breakpoint][-1]
+            above = curves['income'][curves['income'] > breakpoint][0]
+            assert below in thinned['income'] and above in thinned['income']
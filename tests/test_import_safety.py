@@ -0,0 +1,21 @@
+# tests/test_import_safety.py
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_after(statement, *modules):
+    code = f"import sys; {statement}; print(','.join(m for m in {modules!r} if m in sys.modules))"
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return [name for name in output.stdout.strip().split(',') if name]
+
+
+def test_tax_engine_imports_only_the_standard_library():
+    assert loaded_after('import tax_engine', 'numpy', 'pandas', 'plotly', 'streamlit') == []
+
+
+def test_scalar_calculators_run_headless():
+    code = "from tax_engine import calculate_tax_summary; calculate_tax_summary(2500000, 150000, {}, {})"
+    assert loaded_after(code, 'numpy', 'streamlit') == []
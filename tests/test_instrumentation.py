@@ -0,0 +1,33 @@
+# tests/test_instrumentation.py
+import json
+
+from tax_engine import instrumentation
+
+
+def test_disabled_instrumentation_is_a_no_op(monkeypatch):
+    monkeypatch.setattr(instrumentation, 'ENABLED', False)
+    assert instrumentation.begin_run('Tax Calculator') is None
+    assert instrumentation.phase('compute') is instrumentation.phase('render')
+    instrumentation.count('figures_built')
+    assert instrumentation.end_run() is None
+
+
+def test_run_records_phases_and_counters(monkeypatch, tmp_path):
+    log = tmp_path / 'profile.jsonl'
+    monkeypatch.setattr(instrumentation, 'ENABLED', True)
+    monkeypatch.setenv(instrumentation.LOG_ENV_VAR, str(log))
+
+    instrumentation.begin_run('Tax Calculator')
+    for _ in range(2):
+        with instrumentation.phase('compute'):
+            pass
+    instrumentation.count('figures_built', 3)
+    record = instrumentation.end_run(cache={'hits': 1})
+
+    assert record['page'] == 'Tax Calculator'
+    assert record['phases']['compute']['calls'] == 2
+    assert record['counters'] == {'figures_built': 3}
+    assert record['cache'] == {'hits': 1}
+    assert json.loads(log.read_text(encoding='utf-8')) == record
+    # The run is closed, so nothing more is collected
+    assert instrumentation.end_run() is None
@@ -0,0 +1,50 @@
+# tests/test_montecarlo.py
+import numpy as np
+import pytest
+
+from tax_engine.advance_tax import calculate_advance_tax_schedule
+from tax_engine.montecarlo import mean, plan_from_means, sample, simulate_advance_tax
+from tax_engine.summary import calculate_tax_summary
+
+SALARY = {'kind': 'normal', 'mean': 3000000, 'sd': 200000}
+BONUS = {'kind': 'lognormal', 'median': 300000, 'sigma': 0.5}
+LTCG = [{'kind': 'uniform', 'low': 0, 'high': 200000}, 0, 0, {'kind': 'triangular', 'low': 0, 'mode': 0, 'high': 1e5}]
+STCG = [0, 50000, 0, 0]
+
+
+def test_same_seed_gives_the_same_result():
+    first = simulate_advance_tax(SALARY, BONUS, LTCG, STCG, scenarios=20000, seed=7)
+    again = simulate_advance_tax(SALARY, BONUS, LTCG, STCG, scenarios=20000, seed=7)
+    other = simulate_advance_tax(SALARY, BONUS, LTCG, STCG, scenarios=20000, seed=8)
+    first.pop('seconds'), again.pop('seconds'), other.pop('seconds')
+    assert first == again
+    assert first != other
+
+
+def test_sample_means_match_the_distribution_means():
+    rng = np.random.default_rng(0)
+    for distribution in (SALARY, BONUS, *LTCG):
+        assert sample(distribution, rng, 200000).mean() == pytest.approx(mean(distribution), rel=0.02, abs=1)
+
+
+def test_fixed_inputs_reproduce_the_scalar_schedule():
+    ltcg, stcg = [100000, 0, 50000, 0], [0, 40000, 0, 0]
+    plan = plan_from_means(2000000, 0, ltcg, stcg, regime='new', assessment_year='2025-26')
+    quarters = ['Q1', 'Q2', 'Q3', 'Q4']
+    summary = calculate_tax_summary(2000000, 0, dict(zip(quarters, ltcg)), dict(zip(quarters, stcg)), '2025-26')
+    schedule = calculate_advance_tax_schedule(
+        summary['new_regime']['total_tax'],
+        {q: tax['total'] for q, tax in summary['capital_gains']['quarterly_tax'].items()}, '2025-26'
+    )
+    np.testing.assert_allclose(plan, [entry.total_amount for entry in schedule])
+
+    # Paying that plan with no uncertainty never attracts interest
+    result = simulate_advance_tax(2000000, 0, ltcg, stcg, regime='new', scenarios=100, assessment_year='2025-26')
+    assert result['probability_234c'] == 0 and result['probability_234b'] == 0
+
+
+def test_unknown_regime_or_distribution_is_rejected():
+    with pytest.raises(ValueError):
+        simulate_advance_tax(SALARY, BONUS, LTCG, STCG, regime='cheapest', scenarios=10)
+    with pytest.raises(ValueError):
+        sample({'kind': 'pareto'}, np.random.default_rng(0), 10)
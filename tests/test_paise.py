@@ -0,0 +1,88 @@
+# tests/test_paise.py
+import numpy as np
+import pytest
+
+from tax_engine import calculate_capital_gains_tax, calculate_tax_new_regime, calculate_tax_old_regime
+from tax_engine.batch import compare_regimes_batch
+from tax_engine.rules import get_rule_set
+from tax_engine.paise import (
+    calculate_capital_gains_tax_paise,
+    calculate_capital_gains_tax_paise_batch,
+    calculate_tax_new_regime_paise,
+    calculate_tax_new_regime_paise_batch,
+    calculate_tax_old_regime_paise,
+    calculate_tax_old_regime_paise_batch,
+    compare_regimes_paise_batch,
+    round_to_ten_rupees,
+    to_paise,
+    to_paise_batch,
+)
+
+QUARTERS = ['Q1', 'Q2', 'Q3', 'Q4']
+
+
+@pytest.fixture(scope='module')
+def population():
+    rng = np.random.default_rng(3)
+    income = np.round(rng.lognormal(14, 1.2, 2000), 2)
+    income[:6] = [300000, 775000, 5075000, 5075001.5, 10075000, 500075000]
+    deductions = np.round(rng.uniform(0, 300000, 2000), 2)
+    ltcg = np.round(rng.uniform(-20000, 150000, (2000, 4)), 2)
+    stcg = np.round(rng.uniform(0, 80000, (2000, 4)), 2)
+    return to_paise_batch(income), to_paise_batch(deductions), to_paise_batch(ltcg), to_paise_batch(stcg)
+
+
+def test_rounding_to_ten_rupees_counts_five_as_ten():
+    assert round_to_ten_rupees(to_paise(1234.99)) == to_paise(1230)
+    assert round_to_ten_rupees(to_paise(1235)) == to_paise(1240)
+    assert list(to_paise_batch([0.005, 1.234, 99.995])) == [to_paise(0.005), to_paise(1.234), to_paise(99.995)]
+
+
+@pytest.mark.parametrize('assessment_year', ['2024-25', '2025-26', '2026-27'])
+def test_batch_matches_scalar_exactly(population, assessment_year):
+    income, deductions, ltcg, stcg = population
+    new_tax = calculate_tax_new_regime_paise_batch(income, assessment_year)
+    old_tax = calculate_tax_old_regime_paise_batch(income, deductions, assessment_year)
+    cg_tax = calculate_capital_gains_tax_paise_batch(ltcg, stcg, assessment_year)
+    for i in range(0, len(income), 7):
+        assert tuple(int(new_tax[f][i]) for f in new_tax) == \
+            tuple(calculate_tax_new_regime_paise(int(income[i]), assessment_year))
+        assert tuple(int(old_tax[f][i]) for f in old_tax) == \
+            tuple(calculate_tax_old_regime_paise(int(income[i]), int(deductions[i]), assessment_year))
+        scalar = calculate_capital_gains_tax_paise(
+            dict(zip(QUARTERS, map(int, ltcg[i]))), dict(zip(QUARTERS, map(int, stcg[i]))), assessment_year)
+        assert int(cg_tax['total_cg_tax'][i]) == scalar.total_cg_tax
+        assert [int(t) for t in cg_tax['quarterly_tax'][i]] == [q.total for q in scalar.quarterly]
+
+
+def test_paise_components_stay_within_a_paisa_of_the_float_path(population):
+    income, deductions, _, _ = population
+    standard_deduction = get_rule_set().standard_deduction
+    for i in range(0, len(income), 11):
+        # Same rounded taxable income on both paths, so only the per-component rounding differs
+        exact = calculate_tax_new_regime_paise(int(income[i]))
+        approximate = calculate_tax_new_regime(exact.taxable_income / 100 + standard_deduction)
+        assert abs((exact.base_tax + exact.surcharge + exact.cess) / 100 - approximate.total_tax) <= 0.03
+        exact = calculate_tax_old_regime_paise(int(income[i]), int(deductions[i]))
+        approximate = calculate_tax_old_regime(exact.taxable_income / 100, 0)
+        assert abs((exact.base_tax + exact.surcharge + exact.cess) / 100 - approximate.total_tax) <= 0.03
+
+
+def test_capital_gains_quarters_add_up_to_the_annual_tax(population):
+    _, _, ltcg, stcg = population
+    cg_tax = calculate_capital_gains_tax_paise_batch(ltcg, stcg)
+    np.testing.assert_array_equal(cg_tax['quarterly_tax'].sum(axis=1), cg_tax['total_cg_tax'])
+    scalar = calculate_capital_gains_tax(dict(zip(QUARTERS, ltcg[0] / 100)), dict(zip(QUARTERS, stcg[0] / 100)))
+    assert cg_tax['total_cg_tax'][0] / 100 == pytest.approx(scalar.total_cg_tax, abs=0.01)
+
+
+def test_paise_comparison_agrees_with_the_float_comparison(population):
+    income, deductions, ltcg, stcg = population
+    exact = compare_regimes_paise_batch(income, deductions, ltcg, stcg)
+    approximate = compare_regimes_batch(income / 100, deductions / 100, ltcg / 100, stcg / 100)
+    assert np.all(exact['tax_saving'] % 1000 == 0)
+    # Totals differ only by the ten-rupee rounding of tax payable (up to ₹5) and of
+    # income (₹5 of income, taxed at up to 104% inside a marginal relief band)
+    for regime in ('new_regime', 'old_regime'):
+        difference = exact[regime]['total_tax'] / 100 - approximate[regime]['total_tax']
+        assert np.abs(difference).max() <= 5 + 5 * 1.04 + 0.05
@@ -0,0 +1,60 @@
+# tests/test_piecewise.py
+import pytest
+
+from tax_config import RULE_SETS as CONFIG
+from tax_engine.piecewise import evaluate, inverse
+from tax_engine.rules import get_rule_set
+
+
+def slab_tax(income, slabs):
+    tax, lower = 0.0, 0
+    for slab in slabs:
+        if income > lower:
+            tax += (min(income, slab['limit']) - lower) * slab['rate']
+        lower = slab['limit']
+    return tax
+
+
+def surcharged(income, slabs, tiers):
+    """Slab tax plus surcharge, with marginal relief above the threshold that applies"""
+    for tier in sorted(tiers, key=lambda tier: tier['limit'], reverse=True):
+        if income > tier['limit']:
+            threshold = tier['limit']
+            relief_cap = surcharged(threshold, slabs, tiers) + income - threshold
+            return min(slab_tax(income, slabs) * (1 + tier['rate']), relief_cap)
+    return slab_tax(income, slabs)
+
+
+def reference_tax(income, config, regime):
+    charged = surcharged(income, config[f'{regime}_slabs'], config['surcharge_slabs'][regime])
+    return charged * (1 + config['cess_rate'])
+
+
+INCOMES = [0, 250000, 400001, 999999, 1500000, 4999999, 5000000, 5000001, 5050000, 5200000,
+           10000000, 10100000, 20000000, 20500000, 50000000, 50300000, 80000000]
+
+
+@pytest.mark.parametrize('assessment_year', sorted(CONFIG))
+@pytest.mark.parametrize('regime', ['new_regime', 'old_regime'])
+def test_compiled_regime_matches_reference(assessment_year, regime):
+    rules = get_rule_set(assessment_year)
+    function = rules.new_tax if regime == 'new_regime' else rules.old_tax
+    for income in INCOMES:
+        assert evaluate(function.total, income) == pytest.approx(
+            reference_tax(income, CONFIG[assessment_year], regime), abs=1e-4)
+
+
+@pytest.mark.parametrize('regime', ['new_regime', 'old_regime'])
+def test_no_jump_in_tax_at_surcharge_thresholds(regime):
+    rules = get_rule_set('2025-26')
+    function = (rules.new_tax if regime == 'new_regime' else rules.old_tax).total
+    for tier in CONFIG['2025-26']['surcharge_slabs'][regime]:
+        threshold = tier['limit']
+        # Marginal relief: one more rupee of income adds at most one rupee plus cess
+        assert evaluate(function, threshold + 1) - evaluate(function, threshold) <= 1.04 + 1e-9
+
+
+def test_inverse_finds_the_largest_income_at_a_tax():
+    function = get_rule_set('2025-26').old_tax.total
+    for income in [600000, 1200000, 5100000]:
+        assert inverse(function, evaluate(function, income)) == pytest.approx(income)
@@ -0,0 +1,54 @@
+# tests/test_planner.py
+import numpy as np
+import pytest
+
+from tax_engine import calculate_tax_new_regime, calculate_tax_old_regime
+from tax_engine.batch import record_at
+from tax_engine.planner import optimize_deductions, optimize_deductions_batch
+from tax_engine.results import DeductionPlan
+
+
+def brute_force_tax(annual_income, budget, claimed, headroom, step=500):
+    old_taxes = [calculate_tax_old_regime(annual_income, claimed + d).total_tax
+                 for d in np.arange(0, min(budget, headroom) + step, step)]
+    return min(min(old_taxes), calculate_tax_new_regime(annual_income).total_tax)
+
+
+@pytest.mark.parametrize('annual_income,budget', [
+    (600000, 100000), (900000, 250000), (1275000, 50000), (1800000, 225000), (5200000, 225000), (3000000, 0),
+])
+def test_corner_points_find_the_lowest_tax(annual_income, budget):
+    plan = optimize_deductions(annual_income, 35, budget, assessment_year='2025-26')
+    # 80C + 80D + 80CCD headroom for a 35 year old is 2,25,000
+    assert plan.total_tax == pytest.approx(brute_force_tax(annual_income, budget, 0, 225000), abs=0.01)
+    assert plan.invested <= budget
+    assert plan.section_80c + plan.section_80d + plan.section_80ccd == pytest.approx(plan.invested)
+
+
+def test_seniors_get_the_higher_80d_limit():
+    senior = optimize_deductions(3000000, 65, 500000, other_deductions=400000, assessment_year='2025-26')
+    younger = optimize_deductions(3000000, 35, 500000, other_deductions=400000, assessment_year='2025-26')
+    assert senior.regime == younger.regime == 'old'
+    assert (senior.section_80d, younger.section_80d) == (50000, 25000)
+    assert senior.total_tax < younger.total_tax
+
+
+def test_batch_matches_scalar():
+    rng = np.random.default_rng(5)
+    income = rng.uniform(300000, 6000000, 300)
+    age = rng.integers(25, 80, 300)
+    budget = rng.uniform(0, 300000, 300)
+    claimed_80c = rng.uniform(0, 200000, 300)
+    plan = optimize_deductions_batch(income, age, budget, {'80C': claimed_80c}, other_deductions=50000)
+    for i in range(len(income)):
+        expected = optimize_deductions(income[i], age[i], budget[i], {'80C': claimed_80c[i]}, other_deductions=50000)
+        row = record_at(plan, i, DeductionPlan)
+        assert row.regime == expected.regime
+        assert row[1:] == pytest.approx(tuple(expected)[1:], abs=1e-6)
+
+
+def test_negative_budget_is_rejected():
+    with pytest.raises(ValueError):
+        optimize_deductions(1000000, 35, -1)
+    with pytest.raises(ValueError):
+        optimize_deductions_batch(np.array([1000000.0]), 35, -1)
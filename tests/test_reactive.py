@@ -0,0 +1,95 @@
+# tests/test_reactive.py
+import os
+import re
+
+import pytest
+
+from tax_engine.reactive import DependencyGraph, GraphState, Node
+from tax_engine.rules import get_rule_set
+from tax_engine.summary import CALCULATOR_INPUTS, RESULT_CACHE, calculate_tax_summary, calculator_nodes
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def inputs(**changes):
+    values = {
+        'annual_income': 2500000,
+        'deductions': 200000,
+        'ltcg': (150000, 0, 0, 0),
+        'stcg': (0, 0, 20000, 0),
+        'assessment_year': '2025-26',
+        'rule_version': get_rule_set('2025-26').version,
+    }
+    values.update(changes)
+    return values
+
+
+@pytest.fixture
+def graph(monkeypatch):
+    monkeypatch.delenv('TAX_RESULT_STORE', raising=False)
+    RESULT_CACHE.clear()
+    return DependencyGraph(CALCULATOR_INPUTS, calculator_nodes())
+
+
+def test_capital_gains_edit_leaves_the_regimes_alone(graph):
+    state = GraphState()
+    graph.update(state, inputs())
+    assert len(state.recomputed) == len(graph.nodes)
+    graph.update(state, inputs(stcg=(0, 0, 30000, 0)))
+    assert state.recomputed == ('capital_gains', 'totals', 'advance_tax')
+    graph.update(state, inputs(stcg=(0, 0, 30000, 0)))
+    assert state.recomputed == ()
+
+
+def test_graph_agrees_with_the_full_calculation(graph):
+    values = graph.update(GraphState(), inputs())
+    summary = calculate_tax_summary(2500000, 200000, {'Q1': 150000, 'Q2': 0, 'Q3': 0, 'Q4': 0},
+                                    {'Q1': 0, 'Q2': 0, 'Q3': 20000, 'Q4': 0}, '2025-26')
+    assert values['totals']['new_regime'] == summary['new_regime']['total_tax']
+    assert values['totals']['old_regime'] == summary['old_regime']['total_tax']
+    assert [entry.as_dict() for entry in values['advance_tax']] == summary['advance_tax']
+
+
+def test_sessions_share_results_through_the_result_cache(graph):
+    first = graph.update(GraphState(), inputs())
+    hits = RESULT_CACHE.stats()['hits']
+    second = graph.update(GraphState(), inputs())
+    assert RESULT_CACHE.stats()['hits'] == hits + 3
+    assert second['new_regime'] is first['new_regime']
+    assert second['capital_gains'] is first['capital_gains']
+
+
+def test_node_results_round_trip_through_the_store(graph, monkeypatch, tmp_path):
+    monkeypatch.setenv('TAX_RESULT_STORE', str(tmp_path / 'results.sqlite'))
+    computed = dict(graph.update(GraphState(), inputs()))
+    RESULT_CACHE.clear()
+    stored = graph.update(GraphState(), inputs())
+    for name in ('new_regime', 'old_regime', 'capital_gains'):
+        assert stored[name] == computed[name]
+        assert type(stored[name]) is type(computed[name])
+    assert stored['capital_gains'].quarterly_tax['Q1'] == computed['capital_gains'].quarterly_tax['Q1']
+
+
+def test_nodes_must_depend_on_known_names():
+    with pytest.raises(ValueError):
+        DependencyGraph(('a',), [Node('b', ('a', 'c'), lambda a, c: a + c)])
+
+
+def test_calculator_page_totals_match_the_charts():
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(ROOT, 'app.py'), default_timeout=60).run()
+    app.number_input[0].set_value(2500000)
+    next(n for n in app.number_input if n.key == 'stcg_Q3').set_value(50000)
+    app.run()
+    next(b for b in app.button if 'Calculate' in b.label).click().run()
+    assert not app.exception
+
+    def amount(text, label):
+        return float(re.search(rf'{label}: ₹([\d,.]+)', text).group(1).replace(',', ''))
+
+    regimes = [m.value for m in app.markdown if 'Total Tax' in m.value]
+    assert len(regimes) == 2
+    for text in regimes:
+        assert amount(text, 'Total Tax') == pytest.approx(
+            amount(text, 'Tax on Income') + amount(text, 'Capital Gains Tax'), abs=0.01)
@@ -0,0 +1,129 @@
+# tests/test_reports.py
+import csv
+import subprocess
+import sys
+import zipfile
+
+import numpy as np
+import pytest
+
+import utils
+from tax_engine.chart_styles import BREAKDOWN_PIES, COMPARISON_CHART
+from tax_engine.reports import chunk_statements, render_chunk, render_html, write_reports
+from tax_engine.rules import get_rule_set
+from tax_engine.streaming import QUARTERS
+from tax_engine.summary import calculate_tax_summary
+
+COLUMNS = ['employee_id', 'annual_income', 'deductions'] + [f'ltcg_{q}' for q in QUARTERS] + \
+    [f'stcg_{q}' for q in QUARTERS]
+
+INCOMES = [0, 700000, 1275000, 2500000, 6000000, 12000000, 60000000]
+
+
+def write_payroll(path, ids, seed=0):
+    rng = np.random.default_rng(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for employee_id in ids:
+            writer.writerow([employee_id, round(rng.uniform(0, 6000000), 2), round(rng.uniform(0, 300000), 2)]
+                            + [round(rng.uniform(-20000, 80000), 2) for _ in range(8)])
+
+
+def test_chunk_statements_match_the_scalar_calculators():
+    rng = np.random.default_rng(1)
+    size = len(INCOMES)
+    deductions = rng.uniform(0, 400000, size)
+    ltcg = rng.uniform(-50000, 200000, (size, 4))
+    stcg = rng.uniform(-50000, 200000, (size, 4))
+    quarters = [installment.quarter for installment in get_rule_set().advance_tax]
+
+    statements = chunk_statements(np.array(INCOMES, dtype=float), deductions, ltcg, stcg)
+    assert len(statements) == size
+    for i, data in enumerate(statements):
+        summary = calculate_tax_summary(INCOMES[i], deductions[i], dict(zip(quarters, ltcg[i])),
+                                        dict(zip(quarters, stcg[i])))
+        cg_total = summary['capital_gains']['total_cg_tax']
+        assert data['capital_gains'].total_cg_tax == pytest.approx(cg_total, abs=1e-6)
+        for regime in ('new_regime', 'old_regime'):
+            # The summary's regime totals include capital gains tax; a statement's records don't
+            expected = dict(summary[regime], total_tax=summary[regime]['total_tax'] - cg_total)
+            assert data[regime].as_dict() == pytest.approx(expected, abs=1e-6)
+            assert data['totals'][regime] == pytest.approx(summary[regime]['total_tax'], abs=1e-6)
+        for q, tax in data['capital_gains'].quarterly_tax.items():
+            assert tax.total == pytest.approx(summary['capital_gains']['quarterly_tax'][q]['total'], abs=1e-6)
+        assert data['totals']['recommended_regime'] == summary['recommended_regime']
+        assert data['totals']['tax_saving'] == pytest.approx(summary['tax_saving'], abs=1e-6)
+        for entry, expected in zip(data['advance_tax'], summary['advance_tax']):
+            for key, value in entry.as_dict().items():
+                assert value == pytest.approx(expected[key], abs=1e-6)
+
+
+def test_statement_text_agrees_with_its_charts():
+    data = chunk_statements(np.array([2500000.0]), np.array([150000.0]), np.full((1, 4), 50000.0),
+                            np.full((1, 4), 20000.0))[0]
+    page = render_html('E1', data).decode('utf-8')
+    assert COMPARISON_CHART['title'] in page and BREAKDOWN_PIES['New']['title'] in page
+    for regime in ('new_regime', 'old_regime'):
+        assert f"Tax on Income: ₹{data[regime].total_tax:,.2f}" in page
+        assert f"Total Tax: ₹{data['totals'][regime]:,.2f}" in page
+    assert f"Capital Gains Tax: ₹{data['capital_gains'].total_cg_tax:,.2f}" in page
+    assert 'Q2 (16 Jun - 15 Sep)' in page
+
+
+def test_statement_charts_share_the_page_styles():
+    sample = {'base_tax': 1.0, 'surcharge': 1.0, 'cess': 1.0, 'total_tax': 3.0}
+    comparison = utils.create_tax_comparison_chart(sample, sample)
+    assert comparison.layout.title.text == COMPARISON_CHART['title']
+    assert list(comparison.data[0].x) == COMPARISON_CHART['categories']
+    assert [(trace.name, trace.marker.color) for trace in comparison.data] == COMPARISON_CHART['series']
+    for regime, style in BREAKDOWN_PIES.items():
+        pie = utils.create_tax_breakdown_pie(sample, regime)
+        assert pie.layout.title.text == style['title']
+        assert list(pie.data[0].marker.colors) == style['colors']
+
+
+def test_reports_do_not_load_the_app_modules():
+    code = ("import sys; from tax_engine.reports import render_chunk; "
+            "render_chunk({'annual_income': ['1500000']}, 0); "
+            "print(','.join(m for m in ('utils', 'plotly', 'streamlit') if m in sys.modules))")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == ''
+
+
+def test_render_chunk_names_rows_without_an_id():
+    rendered = render_chunk({'employee_id': ['E1', ''], 'annual_income': ['1500000', '900000']}, 10)
+    assert [stem for stem, _ in rendered] == ['E1', 'row-12']
+
+
+def test_repeated_ids_never_overwrite_a_statement(tmp_path):
+    ids = ['a', 'a', 'a-2', 'A', 'x/y', 'x_y', 'a']
+    write_payroll(tmp_path / 'in.csv', ids)
+    stats = write_reports(str(tmp_path / 'in.csv'), str(tmp_path / 'out.zip'), chunk_size=3)
+    assert stats['statements'] == len(ids) and stats['chunks'] == 3
+    with zipfile.ZipFile(tmp_path / 'out.zip') as archive:
+        names = archive.namelist()
+    assert names == ['a.html', 'a-2.html', 'a-2-2.html', 'A-3.html', 'x_y.html', 'x_y-2.html', 'a-4.html']
+
+
+def test_parallel_run_matches_serial(tmp_path):
+    write_payroll(tmp_path / 'in.csv', [f'E{i}' for i in range(25)])
+    write_reports(str(tmp_path / 'in.csv'), str(tmp_path / 'serial.zip'), chunk_size=4)
+    write_reports(str(tmp_path / 'in.csv'), str(tmp_path / 'parallel.zip'), chunk_size=4, workers=2)
+    with zipfile.ZipFile(tmp_path / 'serial.zip') as serial, zipfile.ZipFile(tmp_path / 'parallel.zip') as parallel:
+        assert serial.namelist() == parallel.namelist()
+        assert all(serial.read(name) == parallel.read(name) for name in serial.namelist())
+
+
+def test_xlsx_statements(tmp_path):
+    pytest.importorskip('xlsxwriter')
+    write_payroll(tmp_path / 'in.csv', ['E1', 'E2'])
+    write_reports(str(tmp_path / 'in.csv'), str(tmp_path / 'out.zip'), report_format='xlsx')
+    with zipfile.ZipFile(tmp_path / 'out.zip') as archive:
+        assert archive.namelist() == ['E1.xlsx', 'E2.xlsx']
+        assert all(zipfile.is_zipfile(archive.open(name)) for name in archive.namelist())
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match='Report format'):
+        write_reports(str(tmp_path / 'in.csv'), str(tmp_path / 'out.zip'), report_format='pdf')
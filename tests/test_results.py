@@ -0,0 +1,36 @@
+# tests/test_results.py
+import numpy as np
+import pytest
+
+from tax_engine import calculate_capital_gains_tax, calculate_tax_new_regime
+from tax_engine.batch import as_structured_array, calculate_tax_new_regime_batch, record_at
+from tax_engine.results import TaxBreakdown
+
+
+def test_records_are_immutable_and_slotted():
+    result = calculate_tax_new_regime(2500000)
+    with pytest.raises(AttributeError):
+        result.total_tax = 0
+    with pytest.raises(AttributeError):
+        result.note = 'cached'
+    assert not hasattr(result, '__dict__')
+
+
+def test_as_dict_keeps_the_ui_shape():
+    assert list(calculate_tax_new_regime(2500000).as_dict()) == [
+        'base_tax', 'surcharge', 'cess', 'total_tax', 'taxable_income']
+    cg_tax = calculate_capital_gains_tax({'Q1': 200000, 'Q2': 0, 'Q3': 0, 'Q4': 0},
+                                         {'Q1': 0, 'Q2': 0, 'Q3': 10000, 'Q4': 0})
+    as_dict = cg_tax.as_dict()
+    assert as_dict['quarterly_tax']['Q1'] == cg_tax.quarterly_tax['Q1'].as_dict()
+    assert set(as_dict['quarterly_tax']) == {'Q1', 'Q2', 'Q3', 'Q4'}
+
+
+def test_structured_array_rows_round_trip_to_records():
+    incomes = np.array([600000.0, 2500000.0, 60000000.0])
+    packed = as_structured_array(calculate_tax_new_regime_batch(incomes), TaxBreakdown._fields)
+    assert packed.itemsize == 8 * len(TaxBreakdown._fields)
+    for i, income in enumerate(incomes):
+        record = record_at(packed, i)
+        assert isinstance(record, TaxBreakdown)
+        assert record == pytest.approx(calculate_tax_new_regime(income))
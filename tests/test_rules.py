@@ -0,0 +1,101 @@
+# tests/test_rules.py
+import copy
+import shutil
+from types import SimpleNamespace
+
+import pytest
+
+import tax_config
+from tax_engine import calculate_capital_gains_tax, calculate_tax_new_regime
+from tax_engine import rules as rules_module
+from tax_engine.rules import (
+    RULE_SETS,
+    compile_config,
+    compile_slabs,
+    default_assessment_year,
+    get_rule_set,
+    reload_rules,
+)
+
+
+def test_every_configured_year_is_compiled():
+    assert set(RULE_SETS) == {'2024-25', '2025-26', '2026-27'}
+    for assessment_year, rules in RULE_SETS.items():
+        assert rules.assessment_year == assessment_year
+        assert [installment.quarter for installment in rules.advance_tax] == ['Q1', 'Q2', 'Q3', 'Q4']
+
+
+def test_default_year_is_the_configured_one():
+    assert get_rule_set() is get_rule_set(default_assessment_year())
+
+
+def test_unknown_year_is_a_value_error():
+    with pytest.raises(ValueError, match='2030-31'):
+        get_rule_set('2030-31')
+
+
+def test_years_apply_their_own_rules():
+    # 2026-27 widens the new regime slabs and 2024-25 has the older standard deduction
+    assert calculate_tax_new_regime(1200000, '2026-27').total_tax < calculate_tax_new_regime(1200000, '2025-26').total_tax
+    assert calculate_tax_new_regime(1000000, '2024-25').taxable_income == 950000
+    assert calculate_capital_gains_tax({'Q1': 200000}, {'Q1': 0}, '2024-25').ltcg_tax == pytest.approx(10000)
+    assert calculate_capital_gains_tax({'Q1': 200000}, {'Q1': 0}, '2025-26').ltcg_tax == pytest.approx(9375)
+
+
+def test_compile_slabs_accumulates_tax_below_each_slab():
+    table = compile_slabs([{'limit': 100, 'rate': 0}, {'limit': 300, 'rate': 0.1}, {'limit': float('inf'), 'rate': 0.2}])
+    assert table.limits == (100.0, 300.0)
+    assert table.lower == (0.0, 100.0, 300.0)
+    assert table.cumulative == (0.0, 0.0, 20.0)
+
+
+def config_copy(**overrides):
+    config = SimpleNamespace(**{name: copy.deepcopy(getattr(tax_config, name))
+                                for name in ('ADVANCE_TAX_INTEREST', 'RULE_SETS', 'ASSESSMENT_YEAR')})
+    for name, value in overrides.items():
+        setattr(config, name, value)
+    return config
+
+
+def test_compile_config_lists_every_problem():
+    config = config_copy(ASSESSMENT_YEAR='2099-00')
+    config.RULE_SETS['2025-26']['cess_rate'] = 1.5
+    config.RULE_SETS['2024-25']['filing_deadline'] = '31 Jux 2024'
+    with pytest.raises(ValueError) as error:
+        compile_config(config)
+    message = str(error.value)
+    assert 'cess_rate' in message and 'filing_deadline' in message and '2099-00' in message
+
+
+def test_compiled_config_matches_the_live_rules():
+    compiled = compile_config(config_copy())
+    assert {year: rules.version for year, rules in compiled.rule_sets.items()} == \
+        {year: rules.version for year, rules in RULE_SETS.items()}
+
+
+@pytest.fixture
+def scratch_config(tmp_path, monkeypatch):
+    """Point the reloader at a copy of tax_config.py; the loaded rules are restored afterwards"""
+    path = tmp_path / 'tax_config.py'
+    shutil.copy(tax_config.__file__, path)
+    monkeypatch.setattr(tax_config, '__file__', str(path))
+    monkeypatch.setattr(rules_module, '_active', rules_module._active)
+    monkeypatch.setattr(rules_module, '_failed_mtime', None)
+    return path
+
+
+def test_reload_swaps_in_edited_rules(scratch_config):
+    before = get_rule_set('2025-26')
+    scratch_config.write_text(scratch_config.read_text(encoding='utf-8').replace(
+        'CESS_RATE = 0.04', 'CESS_RATE = 0.05'), encoding='utf-8')
+    assert reload_rules(force=True)
+    after = get_rule_set('2025-26')
+    assert after.cess_rate == 0.05 and after.version != before.version
+
+
+def test_reload_keeps_the_current_rules_when_the_edit_is_invalid(scratch_config):
+    before = get_rule_set('2025-26')
+    scratch_config.write_text(scratch_config.read_text(encoding='utf-8').replace(
+        'STCG_RATE = 0.20', 'STCG_RATE = 20'), encoding='utf-8')
+    assert not reload_rules(force=True)
+    assert get_rule_set('2025-26') is before
@@ -0,0 +1,66 @@
+# tests/test_server.py
+import asyncio
+import json
+from http import HTTPStatus
+
+import pytest
+
+from tax_engine.batch import compare_regimes_batch
+from tax_engine.server import TaxAPIServer
+
+BAD_ITEMS = [
+    b'not json',
+    b'[1, 2]',
+    b'{"deductions": 0}',
+    b'{"annual_income": "lots"}',
+    b'{"annual_income": 1000000, "assessment_year": ["2025-26"]}',
+    b'{"annual_income": 1000000, "assessment_year": "1999-00"}',
+    b'{"annual_income": 1000000, "ltcg_by_quarter": [1, 2]}',
+    b'{"annual_income": 1000000, "stcg_by_quarter": {"Q1": {"a": 1}}}',
+    b'{"annual_income": NaN}',
+    b'{"annual_income": 1' + b'0' * 400 + b'}',
+]
+
+
+def post(server, path, body):
+    return asyncio.run(server.handle_request('POST', path, body))
+
+
+@pytest.mark.parametrize('body', BAD_ITEMS)
+def test_malformed_items_get_400(body):
+    status, payload = post(TaxAPIServer(), '/regimes', body)
+    assert status == HTTPStatus.BAD_REQUEST
+    assert 'error' in payload
+
+
+def test_regimes_endpoint_matches_the_batch_calculator():
+    status, payload = post(TaxAPIServer(), '/regimes', json.dumps({
+        'annual_income': 2400000, 'deductions': 300000, 'stcg_by_quarter': {'Q2': 50000}
+    }).encode())
+    expected = compare_regimes_batch([2400000.0], [300000.0], [[0, 0, 0, 0]], [[0, 50000, 0, 0]])
+    assert status == HTTPStatus.OK
+    assert payload['new_regime']['total_tax'] == pytest.approx(expected['new_regime']['total_tax'][0])
+    assert payload['total_cg_tax'] == pytest.approx(expected['capital_gains']['total_cg_tax'][0])
+
+
+async def raw_request(header_lines):
+    server = await TaxAPIServer().start(port=0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(('\r\n'.join(header_lines) + '\r\n\r\n').encode())
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return response
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.parametrize('length', ['abc', '-5', '1.5'])
+def test_bad_content_length_gets_400(length):
+    response = asyncio.run(raw_request(['POST /regimes HTTP/1.1', f'Content-Length: {length}']))
+    head, _, body = response.partition(b'\r\n\r\n')
+    assert head.startswith(b'HTTP/1.1 400')
+    assert json.loads(body) == {'error': "Invalid Content-Length header"}
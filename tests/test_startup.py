@@ -0,0 +1,18 @@
+# tests/test_startup.py
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.bench_startup import NO_HEAVY_IMPORTS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_chart_free_pages_never_load_pandas_or_plotly():
+    # One cold start in a fresh interpreter; budgets are left to the benchmark itself
+    output = subprocess.run([sys.executable, os.path.join(ROOT, 'benchmarks', 'bench_startup.py'), '--child'],
+                            capture_output=True, text=True, check=True).stdout
+    steps = json.loads(output.strip().splitlines()[-1])
+    for step in NO_HEAVY_IMPORTS:
+        assert not set(steps[step][1]) & {'pandas', 'plotly.express', 'plotly.graph_objects'}, step
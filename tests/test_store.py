@@ -0,0 +1,45 @@
+# tests/test_store.py
+import pytest
+
+from tax_engine.rules import get_rule_set
+from tax_engine.store import ResultStore, result_key
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultStore(str(tmp_path / 'results.sqlite'))
+    yield store
+    store.close()
+
+
+def test_result_key_depends_on_kind_version_and_inputs():
+    key = result_key('summary', 'v1', {'income': 100, 'deductions': 0})
+    assert key == result_key('summary', 'v1', {'deductions': 0, 'income': 100})
+    assert len(key) == 16
+    assert key != result_key('summary', 'v2', {'income': 100, 'deductions': 0})
+    assert key != result_key('plan', 'v1', {'income': 100, 'deductions': 0})
+    assert result_key('row', 'v1', b'\x00\x01') != result_key('row', 'v1', b'\x00\x02')
+
+
+def test_put_and_get_many(store):
+    items = [(result_key('row', 'v1', i), f'payload {i}'.encode()) for i in range(5)]
+    store.put_many('row', 'v1', items)
+    missing = result_key('row', 'v1', 99)
+    found = store.get_many([key for key, _ in items[:3]] + [missing])
+    assert found == dict(items[:3])
+    assert (store.hits, store.misses, store.writes) == (3, 1, 5)
+
+
+def test_invalidate_drops_results_from_other_rule_versions(store):
+    current = get_rule_set().version
+    store.put_many('row', current, [(b'k' * 16, b'current')])
+    store.put_many('row', 'stale', [(b's' * 16, b'stale')])
+    assert store.invalidate() == 1
+    assert store.get_many([b'k' * 16, b's' * 16]) == {b'k' * 16: b'current'}
+
+
+def test_evict_keeps_the_most_recently_used_rows_within_the_budget(store):
+    store.put_many('row', 'v1', [(bytes([i]) * 16, b'x' * 100) for i in range(10)])
+    assert store.evict(max_bytes=450) == 6
+    stats = store.stats()
+    assert stats['entries'] == 4 and stats['bytes'] == 400
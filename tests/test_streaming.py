@@ -0,0 +1,105 @@
+# tests/test_streaming.py
+import csv
+import os
+
+import numpy as np
+import pytest
+
+from tax_engine.batch import compare_regimes_batch
+from tax_engine.streaming import QUARTERS, checkpoint_path, process_file, read_csv_record_chunks
+
+COLUMNS = ['employee_id', 'annual_income', 'deductions'] + [f'ltcg_{q}' for q in QUARTERS] + \
+    [f'stcg_{q}' for q in QUARTERS]
+
+
+def write_payroll(path, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for i in range(rows):
+            writer.writerow([f'E{i}', round(rng.uniform(0, 6000000), 2), round(rng.uniform(0, 300000), 2)]
+                            + [round(rng.uniform(0, 50000), 2) for _ in range(8)])
+
+
+def read_rows(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+
+class Interrupted(Exception):
+    pass
+
+
+def stop_after_first_chunk(stats):
+    raise Interrupted
+
+
+def test_output_matches_batch_calculation(tmp_path):
+    write_payroll(tmp_path / 'in.csv', 250)
+    stats = process_file(str(tmp_path / 'in.csv'), str(tmp_path / 'out.csv'), chunk_size=100)
+    assert stats['rows'] == 250 and stats['chunks'] == 3
+
+    rows = read_rows(tmp_path / 'out.csv')
+    header, data = rows[0], rows[1:]
+    column = {name: np.array([row[header.index(name)] for row in data]) for name in header}
+    amounts = {name: column[name].astype(float) for name in COLUMNS[1:]}
+    expected = compare_regimes_batch(
+        amounts['annual_income'], amounts['deductions'],
+        np.column_stack([amounts[f'ltcg_{q}'] for q in QUARTERS]),
+        np.column_stack([amounts[f'stcg_{q}'] for q in QUARTERS]),
+    )
+    np.testing.assert_allclose(column['new_total_tax'].astype(float), expected['new_regime']['total_tax'], atol=0.005)
+    assert (column['recommended_regime'] == expected['recommended_regime']).all()
+    assert not os.path.exists(checkpoint_path(str(tmp_path / 'out.csv')))
+
+
+def test_resume_continues_after_the_last_completed_chunk(tmp_path):
+    write_payroll(tmp_path / 'in.csv', 250)
+    process_file(str(tmp_path / 'in.csv'), str(tmp_path / 'expected.csv'), chunk_size=100)
+
+    output = str(tmp_path / 'out.csv')
+    with pytest.raises(Interrupted):
+        process_file(str(tmp_path / 'in.csv'), output, chunk_size=100, progress=stop_after_first_chunk)
+    assert os.path.exists(checkpoint_path(output))
+
+    stats = process_file(str(tmp_path / 'in.csv'), output, chunk_size=100, resume=True)
+    assert stats['rows'] == 250
+    assert read_rows(output) == read_rows(tmp_path / 'expected.csv')
+
+
+def test_resume_rejects_a_different_chunk_size(tmp_path):
+    write_payroll(tmp_path / 'in.csv', 150)
+    output = str(tmp_path / 'out.csv')
+    with pytest.raises(Interrupted):
+        process_file(str(tmp_path / 'in.csv'), output, chunk_size=100, progress=stop_after_first_chunk)
+    with pytest.raises(ValueError):
+        process_file(str(tmp_path / 'in.csv'), output, chunk_size=50, resume=True)
+
+
+def test_empty_file_is_a_clear_error(tmp_path):
+    (tmp_path / 'in.csv').write_text('')
+    with pytest.raises(ValueError, match='empty'):
+        process_file(str(tmp_path / 'in.csv'), str(tmp_path / 'out.csv'))
+
+
+def test_header_only_file_still_writes_the_output_header(tmp_path):
+    (tmp_path / 'in.csv').write_text(','.join(COLUMNS) + '\n')
+    stats = process_file(str(tmp_path / 'in.csv'), str(tmp_path / 'out.csv'))
+    assert stats['rows'] == 0
+    rows = read_rows(tmp_path / 'out.csv')
+    assert len(rows) == 1
+    assert rows[0][:len(COLUMNS)] == COLUMNS and 'recommended_regime' in rows[0]
+
+
+def test_quoted_fields_may_span_lines(tmp_path):
+    (tmp_path / 'in.csv').write_text('employee_id,annual_income\n"A\nB",1000000\nC,2000000\n', newline='')
+    chunks = list(read_csv_record_chunks(str(tmp_path / 'in.csv'), 1))
+    assert [len(records) for _, records in chunks] == [1, 1]
+
+
+def test_output_is_the_same_for_any_worker_count(tmp_path):
+    write_payroll(tmp_path / 'in.csv', 500)
+    process_file(str(tmp_path / 'in.csv'), str(tmp_path / 'serial.csv'), chunk_size=60)
+    process_file(str(tmp_path / 'in.csv'), str(tmp_path / 'parallel.csv'), chunk_size=60, workers=3)
+    assert (tmp_path / 'serial.csv').read_bytes() == (tmp_path / 'parallel.csv').read_bytes()
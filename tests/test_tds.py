@@ -0,0 +1,92 @@
+# tests/test_tds.py
+import random
+
+import numpy as np
+import pytest
+
+from tax_engine import calculate_tax_new_regime
+from tax_engine.tds import PayrollEvent, TdsEngine, calendar_month, replay_events, replay_tds_batch
+
+FINANCIAL_YEAR = [calendar_month(i) for i in range(12)]
+
+
+def generate_events(employees, seed=0):
+    """A list of PayrollEvents in month order, a few per employee"""
+    rng = random.Random(seed)
+    by_month = [[] for _ in FINANCIAL_YEAR]
+    for i in range(employees):
+        employee_id = f'E{i:07d}'
+        joined = 0 if rng.random() < 0.9 else rng.randrange(1, 12)
+        salary = round(rng.lognormvariate(11.3, 0.7), -2)
+        by_month[joined].append(PayrollEvent(employee_id, FINANCIAL_YEAR[joined], 'salary', salary))
+        if rng.random() < 0.4:
+            by_month[joined].append(PayrollEvent(employee_id, FINANCIAL_YEAR[joined], 'declaration',
+                                                 rng.randrange(0, 400000, 1000), 'old'))
+        if rng.random() < 0.5:
+            month = rng.randrange(joined, 12)
+            by_month[month].append(PayrollEvent(employee_id, FINANCIAL_YEAR[month], 'salary',
+                                                round(salary * rng.uniform(1.05, 1.3), -2)))
+        for _ in range(rng.choice((0, 0, 1, 2))):
+            month = rng.randrange(joined, 12)
+            by_month[month].append(PayrollEvent(employee_id, FINANCIAL_YEAR[month], 'bonus',
+                                                round(salary * rng.uniform(0.5, 3), -2)))
+        if rng.random() < 0.2:
+            month = rng.randrange(joined, 12)
+            by_month[month].append(PayrollEvent(employee_id, FINANCIAL_YEAR[month], 'declaration',
+                                                rng.randrange(0, 400000, 1000), rng.choice(('old', 'new', None))))
+    return [event for month_events in by_month for event in month_events]
+
+
+def as_arrays(events):
+    codes = {}
+    employee = np.array([codes.setdefault(event.employee_id, len(codes)) for event in events])
+    return codes, {
+        'employee': employee,
+        'month': np.array([event.month for event in events]),
+        'kind': np.array([event.kind for event in events]),
+        'amount': np.array([event.amount for event in events]),
+        'regime': np.array([event.regime or '' for event in events]),
+        'employees': len(codes),
+    }
+
+
+
+def test_flat_salary_spreads_the_tax_evenly():
+    schedule = replay_events([PayrollEvent('E1', 4, 'salary', 150000)], '2025-26')['E1']
+    annual_tax = calculate_tax_new_regime(1800000, '2025-26').total_tax
+    assert len(schedule) == 12
+    assert schedule[-1].tds_to_date == pytest.approx(annual_tax, abs=6)
+    assert max(month.tds for month in schedule) - min(month.tds for month in schedule) <= 1
+
+
+def test_bonus_is_spread_over_the_remaining_months():
+    events = [PayrollEvent('E1', 4, 'salary', 100000), PayrollEvent('E1', 10, 'bonus', 600000)]
+    schedule = replay_events(events, '2025-26')['E1']
+    assert schedule[6].tds > schedule[5].tds
+    assert schedule[6].tds == pytest.approx(schedule[11].tds, abs=1)
+    assert schedule[-1].tds_to_date == pytest.approx(calculate_tax_new_regime(1800000, '2025-26').total_tax, abs=6)
+
+
+def test_closed_months_cannot_change():
+    engine = TdsEngine('2025-26')
+    engine.apply(PayrollEvent('E1', 4, 'salary', 100000))
+    engine.close_month('E1', 4)
+    with pytest.raises(ValueError):
+        engine.apply(PayrollEvent('E1', 4, 'bonus', 1000))
+    with pytest.raises(ValueError):
+        engine.close_month('E1', 6)
+    with pytest.raises(ValueError):
+        engine.apply(PayrollEvent('E1', 5, 'gift', 1000))
+
+
+def test_batch_replay_matches_the_engine():
+    events = generate_events(2000, seed=4)
+    codes, arrays = as_arrays(events)
+    result = replay_tds_batch(arrays['employee'], arrays['month'], arrays['kind'], arrays['amount'],
+                              arrays['regime'], arrays['employees'], assessment_year='2025-26')
+    schedules = replay_events(events, '2025-26')
+    for employee_id, code in codes.items():
+        schedule = schedules[employee_id]
+        np.testing.assert_array_equal(result['tds'][code], [month.tds for month in schedule])
+        assert result['regime'][code] == schedule[-1].regime
+        assert result['projected_tax'][code] == pytest.approx(schedule[-1].projected_tax)
@@ -0,0 +1,68 @@
+# tests/test_tradebook.py
+import io
+
+import pytest
+
+from tax_engine.tradebook import calculate_tradebook_tax, match_trades, read_tradebook, set_off_losses
+
+HEADER = 'symbol,trade_date,trade_type,quantity,price\n'
+
+
+def tradebook(*rows):
+    return io.StringIO(HEADER + ''.join(f'{row}\n' for row in rows))
+
+
+def test_fifo_matching_splits_long_and_short_term():
+    gains = match_trades(read_tradebook(tradebook(
+        'INFY,2023-01-02,buy,10,1000',
+        'INFY,2024-03-01,buy,10,1500',
+        'INFY,2024-05-10,sell,15,2000',
+    )), '2025-26')
+    # The 2023 lot is long term, five shares of the 2024 lot short term
+    assert gains['ltcg_gross']['Q1'] == pytest.approx(10000)
+    assert gains['stcg_gross']['Q1'] == pytest.approx(2500)
+    assert gains['open_lots'] == 1
+    assert gains['unmatched_sells'] == {}
+
+
+def test_a_later_loss_cancels_an_earlier_gain():
+    gains, cg_tax = calculate_tradebook_tax(tradebook(
+        'TCS,2024-04-02,buy,100,1000',
+        'TCS,2024-05-02,sell,100,2000',
+        'HDFC,2024-07-01,buy,100,3000',
+        'HDFC,2024-08-01,sell,100,2000',
+    ), '2025-26')
+    assert gains['stcg_gross'] == {'Q1': 100000, 'Q2': -100000, 'Q3': 0, 'Q4': 0}
+    assert sum(gains['stcg_by_quarter'].values()) == 0
+    assert gains['stcl_unabsorbed'] == 0
+    assert cg_tax.total_cg_tax == 0
+
+
+def test_short_term_loss_is_set_off_against_long_term_gain():
+    ltcg, stcg, ltcl, stcl = set_off_losses(
+        {'Q1': 0, 'Q2': 300000, 'Q3': 0, 'Q4': 100000},
+        {'Q1': -100000, 'Q2': 0, 'Q3': 0, 'Q4': 0}
+    )
+    assert stcg == {'Q1': 0, 'Q2': 0, 'Q3': 0, 'Q4': 0}
+    assert ltcg == {'Q1': 0, 'Q2': pytest.approx(225000), 'Q3': 0, 'Q4': pytest.approx(75000)}
+    assert (ltcl, stcl) == (0, 0)
+
+
+def test_long_term_loss_is_not_set_off_against_short_term_gain():
+    ltcg, stcg, ltcl, stcl = set_off_losses(
+        {'Q1': -50000, 'Q2': 0, 'Q3': 0, 'Q4': 0},
+        {'Q1': 0, 'Q2': 80000, 'Q3': 0, 'Q4': 0}
+    )
+    assert stcg['Q2'] == 80000
+    assert sum(ltcg.values()) == 0
+    assert (ltcl, stcl) == (50000, 0)
+
+
+def test_sales_are_bucketed_by_installment_due_date():
+    gains = match_trades(read_tradebook(tradebook(
+        'INFY,2024-04-02,buy,30,1000',
+        'INFY,2024-06-15,sell,10,1100',
+        'INFY,2024-06-16,sell,10,1200',
+        'INFY,2025-03-20,sell,10,1300',
+    )), '2025-26')
+    assert gains['stcg_gross'] == {'Q1': 1000, 'Q2': 2000, 'Q3': 0, 'Q4': 3000}
@@ -1,44 +1,94 @@
 # utils.py
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
+# plotly is imported inside the chart builders, so pages that never draw a
+# chart don't pay for loading it
+from tax_engine.cache import LRUCache
+from tax_engine.chart_styles import BREAKDOWN_PIES, COMPARISON_CHART, COMPONENTS
+from tax_engine.instrumentation import count
+from tax_engine.planner import SENIOR_CITIZEN_AGE
+from tax_engine.reactive import DependencyGraph, Node
+from tax_engine.rules import get_rule_set
+from tax_engine.summary import CALCULATOR_INPUTS, calculator_nodes
+
+# Built figures keyed by chart name and normalized inputs. st.plotly_chart only
+# reads the figure, so the same object can be handed out on every rerun.
+FIGURE_CACHE = LRUCache(maxsize=256)
+
+def cached_figure(key, build):
+    """Return the figure cached under key, calling build() on a miss"""
+    def counted_build():
+        count('figures_built')
+        return build()
+    return FIGURE_CACHE.get_or_compute(key, counted_build)
+
+def create_advance_tax_table(schedule):
+    """Create the advance tax schedule as a DataFrame of formatted amounts"""
+    import pandas as pd
+
+    return pd.DataFrame([
+        {
+            'Due Date': entry.due_date,
+            'Regular Tax (₹)': f"{entry.regular_tax:,.2f}",
+            'Capital Gains Tax (₹)': f"{entry.capital_gains_tax:,.2f}",
+            'Total Amount (₹)': f"{entry.total_amount:,.2f}",
+            'Cumulative %': f"{entry.percentage}%"
+        }
+        for entry in schedule
+    ])
+
+def calculator_graph():
+    """The Tax Calculator page's dependency graph: the calculations plus the charts and table drawn from them
+
+    Charts are built through cached_figure, so sessions with the same
+    regime results share them.
+    """
+    return DependencyGraph(CALCULATOR_INPUTS, calculator_nodes() + [
+        Node('comparison_chart', ('new_regime', 'old_regime'),
+             lambda new, old: cached_figure(('comparison', new, old),
+                                            lambda: create_tax_comparison_chart(new.as_dict(), old.as_dict()))),
+        Node('new_pie', ('new_regime',),
+             lambda new: cached_figure(('pie', 'New', new), lambda: create_tax_breakdown_pie(new.as_dict(), 'New'))),
+        Node('old_pie', ('old_regime',),
+             lambda old: cached_figure(('pie', 'Old', old), lambda: create_tax_breakdown_pie(old.as_dict(), 'Old'))),
+        Node('advance_tax_table', ('advance_tax',), create_advance_tax_table),
+    ])
 
 def create_tax_comparison_chart(new_regime_tax, old_regime_tax):
     """Create a bar chart comparing tax components between regimes"""
-    categories = ['Base Tax', 'Surcharge', 'Cess', 'Total Tax']
-    new_values = [new_regime_tax['base_tax'], new_regime_tax['surcharge'], 
-                 new_regime_tax['cess'], new_regime_tax['total_tax']]
-    old_values = [old_regime_tax['base_tax'], old_regime_tax['surcharge'], 
-                 old_regime_tax['cess'], old_regime_tax['total_tax']]
-    
+    import plotly.graph_objects as go
+
+    style = COMPARISON_CHART
     fig = go.Figure(data=[
-        go.Bar(name='New Regime', x=categories, y=new_values, marker_color='#0066cc'),
-        go.Bar(name='Old Regime', x=categories, y=old_values, marker_color='#006600')
+        go.Bar(name=name, x=style['categories'], marker_color=color,
+               y=[tax[key] for _, key in COMPONENTS] + [tax['total_tax']])
+        for (name, color), tax in zip(style['series'], (new_regime_tax, old_regime_tax))
     ])
     
     fig.update_layout(
-        title='Tax Comparison Between Regimes',
+        title=style['title'],
         barmode='group',
-        height=400
+        height=style['height']
     )
     return fig
 
 def create_tax_breakdown_pie(tax_details, regime_type):
     """Create a pie chart showing tax component breakdown"""
-    labels = ['Base Tax', 'Surcharge', 'Cess']
-    values = [tax_details['base_tax'], tax_details['surcharge'], tax_details['cess']]
-    
-    colors = ['#0066cc', '#4d94ff', '#99c2ff'] if regime_type == 'New' else ['#006600', '#00b300', '#00ff00']
+    import plotly.graph_objects as go
+
+    style = BREAKDOWN_PIES[regime_type]
+    values = [tax_details[key] for _, key in COMPONENTS]
     
-    fig = go.Figure(data=[go.Pie(labels=labels, values=values, hole=.3, marker_colors=colors)])
+    fig = go.Figure(data=[go.Pie(labels=style['labels'], values=values, hole=style['hole'],
+                                 marker_colors=style['colors'])])
     fig.update_layout(
-        title=f'{regime_type} Regime Tax Breakdown',
-        height=300
+        title=style['title'],
+        height=style['height']
     )
     return fig
 
 def create_monthly_savings_chart(annual_savings):
     """Create a line chart showing monthly savings"""
+    import plotly.graph_objects as go
+
     months = list(range(1, 13))
     monthly_savings = [annual_savings/12 * i for i in months]
     
@@ -54,13 +104,68 @@ def create_monthly_savings_chart(annual_savings):
     )
     return fig
 
-def get_tax_saving_tips(income, age, current_deductions):
+def create_tax_curve_chart(curves, user_point=None):
+    """Create a WebGL line chart of total tax across incomes for both regimes"""
+    import plotly.graph_objects as go
+
+    income = curves['income']
+    fig = go.Figure(data=[
+        go.Scattergl(name='New Regime', x=income, y=curves['new_regime']['total_tax'], mode='lines',
+                     line=dict(color='#0066cc', width=2)),
+        go.Scattergl(name='Old Regime', x=income, y=curves['old_regime']['total_tax'], mode='lines',
+                     line=dict(color='#006600', width=2))
+    ])
+    if user_point is not None:
+        fig.add_trace(go.Scattergl(
+            name='Your Income', mode='markers', marker=dict(color='#cc0000', size=10),
+            x=[user_point['income']] * 2,
+            y=[user_point['new_regime']['total_tax'][0], user_point['old_regime']['total_tax'][0]]
+        ))
+
+    fig.update_layout(
+        title='Total Tax by Income',
+        xaxis_title='Gross Income (₹)',
+        yaxis_title='Total Tax (₹)',
+        hovermode='x unified',
+        height=400
+    )
+    return fig
+
+def create_tax_rate_chart(curves, user_point=None):
+    """Create a WebGL line chart of effective and marginal rates across incomes"""
+    import plotly.graph_objects as go
+
+    income = curves['income']
+    fig = go.Figure()
+    for regime, name, color in (('new_regime', 'New', '#0066cc'), ('old_regime', 'Old', '#006600')):
+        fig.add_trace(go.Scattergl(name=f'{name} Regime Effective', x=income, y=curves[regime]['effective_rate'] * 100,
+                                   mode='lines', line=dict(color=color, width=2)))
+        fig.add_trace(go.Scattergl(name=f'{name} Regime Marginal', x=income, y=curves[regime]['marginal_rate'] * 100,
+                                   mode='lines', line=dict(color=color, width=1, dash='dot')))
+    if user_point is not None:
+        fig.add_trace(go.Scattergl(
+            name='Your Effective Rate', mode='markers', marker=dict(color='#cc0000', size=10),
+            x=[user_point['income']] * 2,
+            y=[user_point['new_regime']['effective_rate'][0] * 100, user_point['old_regime']['effective_rate'][0] * 100]
+        ))
+
+    fig.update_layout(
+        title='Effective and Marginal Tax Rates',
+        xaxis_title='Gross Income (₹)',
+        yaxis_title='Rate (%)',
+        hovermode='x unified',
+        height=400
+    )
+    return fig
+
+def get_tax_saving_tips(income, age, current_deductions, assessment_year=None):
     """Generate personalized tax saving tips"""
     tips = []
     
-    max_80c = 150000
-    max_80d = 50000 if age >= 60 else 25000
-    max_nps = 50000
+    limits = get_rule_set(assessment_year).deduction_limits
+    max_80c = int(limits.section_80c)
+    max_80d = int(limits.section_80d_senior if age >= SENIOR_CITIZEN_AGE else limits.section_80d)
+    max_nps = int(limits.section_80ccd)
     
     if current_deductions.get('80C', 0) < max_80c:
         remaining_80c = max_80c - current_deductions.get('80C', 0)
@@ -76,16 +181,6 @@ def get_tax_saving_tips(income, age, current_deductions):
     
     return tips
 
-def calculate_advance_tax_schedule(total_tax):
-    """Calculate advance tax payment schedule"""
-    schedule = [
-        {'Due Date': 'June 15, 2024', 'Percentage': '15%', 'Amount': total_tax * 0.15},
-        {'Due Date': 'September 15, 2024', 'Percentage': '45%', 'Amount': total_tax * 0.45},
-        {'Due Date': 'December 15, 2024', 'Percentage': '75%', 'Amount': total_tax * 0.75},
-        {'Due Date': 'March 15, 2025', 'Percentage': '100%', 'Amount': total_tax}
-    ]
-    return schedule
-
 def create_educational_content():
     """Generate educational content about taxation"""
     return {